@@ -2,11 +2,21 @@ import streamlit as st
 import pandas as pd
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
-from datetime import date, datetime, timedelta
+from datetime import date
 import time
-import json
-import numpy as np
-import io
+
+from armazenamento import CAMPOS_DATA, COLUNAS_RESCISOES_MIN, FiltroRescisoes, criar_armazenamento
+from arquivo_rescisoes import DIAS_ARQUIVAMENTO
+from cadastro_rescisoes import TIPOS_DEMISSAO, preparar_lote, registro_avulso
+from cliente_sheets import Agendador, embrulhar
+from exportacao import FORMATOS, CacheExportacao
+from instrumentacao import Medidor
+from merge_base import ler_upload_em_blocos
+from normalizacao import (
+    TIPOS_BOOLEANOS, formatar_data_para_salvar, formatar_para_texto, limpar_matricula,
+)
+from prazos import PRAZOS, alteracoes_pagamento
+from usuarios import autenticar, gerar_hash
 
 # ==============================================================================
 # CONFIG VISUAL
@@ -25,52 +35,77 @@ st.markdown("""
 # CONSTANTES
 # ==============================================================================
 SESSION_FILE = "user_session.json"  # no cloud pode não persistir sempre; ok
-
-COLUNAS_RESCISOES_MIN = [
-    'ID', 'FLUIG', 'MATRICULA', 'NOME', 'CPF', 'PCD', 'LOCACAO',
-    'DIAS_RECESSO', 'PERIODO_RECESSO', 'TIPO_DEMISSAO', 'DATA_DEMISSAO',
-    'TEM_CONSIGNADO', 'VALOR_CONSIGNADO', 'CALCULO_REALIZADO', 'DOC_ENVIADO',
-    'DATA_PAGAMENTO', 'FATURAMENTO', 'BAIXA_PAGAMENTO', 'OBSERVACOES',
-    'SOLICITANTE', 'EXCLUIR'
-]
+SOLICITANTES_PADRAO = ["DP", "Gestor", "Financeiro", "Jurídico"]
+TAMANHOS_PAGINA = [50, 100, 250, 500]
 
 # ==============================================================================
 # HELPERS
 # ==============================================================================
-def norm_cols_upper(df):
-    df.columns = [str(c).upper().strip() for c in df.columns]
-    return df
-
-def limpar_matricula(valor):
-    if pd.isna(valor) or str(valor).strip() == "":
+def valor_para_sheet(col, valor):
+    if col in TIPOS_BOOLEANOS:
+        return formatar_para_texto(bool(valor), TIPOS_BOOLEANOS[col])
+    if col in ('DATA_DEMISSAO', 'DATA_PAGAMENTO'):
+        return formatar_data_para_salvar(valor)
+    if col == 'MATRICULA':
+        return limpar_matricula(valor)
+    if pd.isna(valor):
         return ""
-    return str(valor).strip().replace(".0", "")
-
-def interpretar_booleano(valor):
-    v = str(valor).upper().strip()
-    positivos = ['TRUE', '1', 'SIM', 'OK', 'CALCULADO', 'ENVIADO', 'PAGO', 'POSSUI FATURAMENTO', 'MARCADO', 'ABERTO']
-    return True if any(x in v for x in positivos) else False
-
-def formatar_para_texto(valor, tipo):
-    if tipo == 'CALCULO': return "CALCULADO" if valor else "PENDENTE"
-    if tipo == 'DOC': return "ENVIADO" if valor else "PENDENTE"
-    if tipo == 'PAGTO': return "PAGO" if valor else "ABERTO"
-    if tipo == 'FAT': return "POSSUI FATURAMENTO" if valor else "NÃO"
-    if tipo == 'EXCLUIR': return "MARCADO" if valor else ""
+    if col == 'FLUIG':
+        return f"'{valor}" if str(valor).strip() else ""
     return str(valor)
 
-def formatar_data_para_salvar(valor):
-    if pd.isna(valor) or valor == "" or valor is None:
-        return ""
-    if isinstance(valor, (date, datetime)):
-        return valor.strftime('%d/%m/%Y')
-    return str(valor)
+def paginar(df, pagina, tamanho, ordenar_por="ID", crescente=True):
+    """Fatia `tamanho` linhas da página `pagina` (1-based) depois de ordenar."""
+    if ordenar_por in df.columns:
+        df = df.sort_values(ordenar_por, ascending=crescente, kind="stable", na_position="last")
+    inicio = (pagina - 1) * tamanho
+    return df.iloc[inicio:inicio + tamanho]
+
+def diff_edicoes(original, editado):
+    """Compara o que o data_editor devolveu com o que foi exibido, casando por ID.
+
+    Retorna ({ID: {COLUNA: texto para o sheet}}, [IDs marcados para excluir]).
+    """
+    if original.empty or 'ID' not in original.columns:
+        return {}, []
+    a = original[original['ID'].notna()].set_index('ID')
+    b = editado[editado['ID'].notna()].set_index('ID').reindex(index=a.index, columns=a.columns)
+
+    excluir = []
+    if 'EXCLUIR' in b.columns:
+        excluir = [int(i) for i in b.index[b['EXCLUIR'].fillna(False).astype(bool)]]
+
+    alteracoes = {}
+    for col in a.columns:
+        va, vb = a[col], b[col]
+        mudou = ~((va == vb).fillna(False).astype(bool) | (va.isna() & vb.isna()))
+        for id_, valor in vb[mudou].items():
+            if int(id_) in excluir:
+                continue
+            alteracoes.setdefault(int(id_), {})[col] = valor_para_sheet(col, valor)
+    return alteracoes, excluir
 
-def to_excel_bytes(df: pd.DataFrame, sheet="Dados"):
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name=sheet)
-    return output.getvalue()
+# ==============================================================================
+# INSTRUMENTAÇÃO (chamadas ao Sheets e etapas por rerun; painel só do adm)
+# ==============================================================================
+@st.cache_resource
+def obter_medidor():
+    return Medidor()
+
+@st.cache_resource
+def obter_agendador():
+    # um por processo: a cota do Sheets é da conta de serviço, não da sessão
+    return Agendador()
+
+medidor = obter_medidor()
+medidor.iniciar_rerun()
+
+def medir(nome, func):
+    """Função sem argumentos que roda `func` medindo como etapa (p/ download_button)."""
+    def medida():
+        with medidor.etapa(nome):
+            return func()
+    return medida
 
 # ==============================================================================
 # CONEXÃO GOOGLE SHEETS (SOMENTE CLOUD)
@@ -91,16 +126,17 @@ def conectar_gsheets():
     client = gspread.authorize(creds)
 
     # Nome do arquivo no Google Drive
-    return client.open("SistemaDP_DB")
+    # toda chamada passa pelo agendador (cota, novas tentativas, leituras juntadas) e é medida
+    return embrulhar(client.open("SistemaDP_DB"), [obter_agendador(), obter_medidor()])
 
-def garantir_colunas_no_sheet(ws, colunas_necessarias):
-    headers = [str(h).upper().strip() for h in ws.row_values(1)]
-    faltantes = [c for c in colunas_necessarias if c not in headers]
-    if not faltantes:
-        return headers
-    novo = headers + faltantes
-    ws.update('1:1', [novo])
-    return novo
+@st.cache_resource
+def obter_armazenamento():
+    # gsheets (padrão) ou sqlite local: DP_ARMAZENAMENTO (ver armazenamento.py)
+    return criar_armazenamento(conectar_gsheets)
+
+@st.cache_resource
+def obter_exportacoes():
+    return CacheExportacao()
 
 # ==============================================================================
 # LOGIN
@@ -109,17 +145,10 @@ def verificar_login(user, pwd):
     if user == "adm" and pwd == "123":
         return True
     try:
-        sh = conectar_gsheets()
-        ws = sh.worksheet("usuarios")
-        df = pd.DataFrame(ws.get_all_records())
-        df = df.astype(str)
-        df = norm_cols_upper(df)
-        achou = df[df['USUARIO'] == str(user)]
-        if not achou.empty:
-            return str(pwd) == str(achou.iloc[0].get('SENHA', ''))
-    except:
-        pass
-    return False
+        return autenticar(obter_armazenamento(), user, pwd)
+    except Exception as e:
+        st.error(f"Não foi possível consultar os usuários: {e}")
+        return False
 
 if "logado" not in st.session_state:
     st.session_state["logado"] = False
@@ -139,111 +168,41 @@ if not st.session_state["logado"]:
     st.stop()
 
 # ==============================================================================
-# CARREGAMENTO BASES
+# CARREGAMENTO
 # ==============================================================================
-@st.cache_data(ttl=60, show_spinner="Lendo bases...")
-def carregar_bases():
-    sh = conectar_gsheets()
-
-    def ler(nome):
-        try:
-            return pd.DataFrame(sh.worksheet(nome).get_all_records())
-        except:
-            return pd.DataFrame()
-
-    df_f = ler("base_funcionarios")
-    if not df_f.empty:
-        df_f = norm_cols_upper(df_f)
-        if 'MATRICULA' in df_f.columns:
-            df_f['MATRICULA'] = df_f['MATRICULA'].apply(limpar_matricula)
-        if 'CPF' not in df_f.columns: df_f['CPF'] = ""
-        if 'PCD' not in df_f.columns: df_f['PCD'] = "NÃO"
-        # opcional: coluna para controle de atualização
-        if 'ATUALIZADO_EM' not in df_f.columns: df_f['ATUALIZADO_EM'] = ""
-
-    df_c = ler("base_consignados")
-    if not df_c.empty:
-        df_c = norm_cols_upper(df_c)
-        if 'MATRICULA' in df_c.columns:
-            df_c['MATRICULA'] = df_c['MATRICULA'].apply(limpar_matricula)
-        if 'VALOR' in df_c.columns:
-            df_c['VALOR'] = pd.to_numeric(df_c['VALOR'], errors='coerce').fillna(0)
-        df_c = df_c.groupby('MATRICULA')['VALOR'].sum().reset_index()
-
-    df_r = ler("base_recesso")
-    if not df_r.empty:
-        df_r = norm_cols_upper(df_r)
-        if 'MATRICULA' in df_r.columns:
-            df_r['MATRICULA'] = df_r['MATRICULA'].apply(limpar_matricula)
-        if 'DIAS' in df_r.columns:
-            df_r['DIAS'] = df_r['DIAS'].astype(str).apply(lambda x: x.split(',')[0].split('.')[0])
-            df_r['DIAS'] = pd.to_numeric(df_r['DIAS'], errors='coerce').fillna(0).astype(int)
-        for col in ['PER_INI', 'PER_FIM']:
-            if col in df_r.columns:
-                df_r[col] = pd.to_datetime(df_r[col], errors='coerce')
-        df_r = df_r.drop_duplicates(subset=['MATRICULA'])
-
-    return df_f, df_c, df_r
-
-def buscar_dados(mat):
-    df_f, df_c, df_r = carregar_bases()
-    m = limpar_matricula(mat)
-
-    nm, lc, cpf, pcd = "NOME MANUAL", "-", "", "NÃO"
-    if not df_f.empty and 'MATRICULA' in df_f.columns:
-        bf = df_f[df_f['MATRICULA'] == m]
-        if not bf.empty:
-            row = bf.iloc[0]
-            nm = row.get('NOME', "Sem Nome")
-            # seu campo atual é CENTRO_CUSTO, mas tela chama LOCACAO
-            lc = row.get('CENTRO_CUSTO', row.get('LOCACAO', "-"))
-            cpf = row.get('CPF', "")
-            pcd = row.get('PCD', "NÃO")
-
-    vc = 0.0
-    if not df_c.empty and 'MATRICULA' in df_c.columns:
-        bc = df_c[df_c['MATRICULA'] == m]
-        if not bc.empty:
-            vc = float(bc.iloc[0].get('VALOR', 0))
-
-    dr, pr = 0, "-"
-    if not df_r.empty and 'MATRICULA' in df_r.columns:
-        br = df_r[df_r['MATRICULA'] == m]
-        if not br.empty:
-            dr = int(br.iloc[0].get('DIAS', 0))
-            di = br.iloc[0].get('PER_INI')
-            df_ = br.iloc[0].get('PER_FIM')
-            if pd.notnull(di) and pd.notnull(df_):
-                pr = f"{di.strftime('%d/%m/%Y')} a {df_.strftime('%d/%m/%Y')}"
-
-    return nm, lc, cpf, pcd, vc, dr, pr
-
-def listar_solicitantes_existentes():
-    try:
-        sh = conectar_gsheets()
-        ws = sh.worksheet("rescisões")
-        headers = [str(h).upper().strip() for h in ws.row_values(1)]
-        if "SOLICITANTE" not in headers:
-            return ["DP", "Gestor", "Financeiro", "Jurídico"]
-        idx = headers.index("SOLICITANTE") + 1
-        col = ws.col_values(idx)[1:]
-        itens = sorted({str(x).strip() for x in col if str(x).strip()})
-        base = ["DP", "Gestor", "Financeiro", "Jurídico"]
-        return sorted(list(set(base + itens)))
-    except:
-        return ["DP", "Gestor", "Financeiro", "Jurídico"]
+arm = obter_armazenamento()
 
 # ==============================================================================
 # SIDEBAR
 # ==============================================================================
 with st.sidebar:
     st.write(f"👤 **{st.session_state['usuario_atual']}**")
-    pagina = st.radio("Menu", ["Rescisões", "Atualizar Base"] + (["Gestão Usuários"] if st.session_state['usuario_atual'] == 'adm' else []))
+    pagina = st.radio("Menu", ["Rescisões", "Cadastro em Lote", "Atualizar Base"] + (["Gestão Usuários"] if st.session_state['usuario_atual'] == 'adm' else []))
     st.markdown("---")
     if st.button("🔄 FORÇAR RECARGA"):
-        carregar_bases.clear()
-        st.cache_data.clear()
+        arm.invalidar()
+        obter_exportacoes().invalidar()
         st.rerun()
+    bases = getattr(arm, "bases", None)  # só no backend gsheets
+    if st.session_state['usuario_atual'] == 'adm' and bases is not None and bases.tempos:
+        st.caption("⏱️ Bases: " + " · ".join(f"{k.replace('base_', '')} {v:.2f}s" for k, v in bases.tempos.items()))
+        for aba, erro in bases.erros_abas.items():
+            st.caption(f"⚠️ {aba}: {erro} " + ("(usando a versão anterior)" if aba in bases.abas_anteriores else "(sem dados nesta carga)"))
+    if st.session_state['usuario_atual'] == 'adm':
+        with st.expander("🗄️ Arquivo de encerradas"):
+            try:
+                resumo_arq = arm.resumo_arquivo()
+                st.caption("Arquivadas: " + (" · ".join(f"{ano}: {n}" for ano, n in resumo_arq.items()) or "nenhuma"))
+            except Exception as e:
+                st.caption(f"⚠️ Catálogo do arquivo indisponível: {e}")
+            dias_arq = st.number_input("Encerradas há mais de (dias)", min_value=30, value=DIAS_ARQUIVAMENTO, step=30)
+            if st.button("Arquivar encerradas"):
+                try:
+                    with medidor.etapa("arquivar_rescisoes"):
+                        movidas = arm.arquivar_rescisoes(dias=int(dias_arq))
+                    st.success("✅ Arquivadas: " + (", ".join(f"{n} de {ano}" for ano, n in movidas.items()) or "nada a arquivar"))
+                except Exception as e:
+                    st.error(f"Erro ao arquivar: {e}")
     if st.button("Sair"):
         st.session_state["logado"] = False
         st.session_state["usuario_atual"] = ""
@@ -253,6 +212,18 @@ with st.sidebar:
 # PÁGINA: RESCISÕES
 # ==============================================================================
 if pagina == "Rescisões":
+    # sincroniza antes de tudo: a lista de solicitantes e a listagem leem a mesma cópia
+    with medidor.etapa("sincronizar_rescisoes"):
+        aviso = arm.sincronizar_rescisoes()
+    if aviso:
+        st.caption(f"⚠️ {aviso}")
+
+    try:
+        solicitantes_existentes = arm.listar_solicitantes()
+    except Exception as e:
+        st.sidebar.caption(f"⚠️ Solicitantes indisponíveis ({e}).")
+        solicitantes_existentes = []
+
     # ---------- CADASTRO ----------
     with st.sidebar:
         st.header("➕ Novo Registro")
@@ -262,7 +233,13 @@ if pagina == "Rescisões":
 
         nm, lc, cpf, pcd, vc, dr, pr = "", "", "", "NÃO", 0.0, 0, ""
         if mat:
-            nm, lc, cpf, pcd, vc, dr, pr = buscar_dados(mat)
+            with medidor.etapa("buscar_dados"):
+                try:
+                    nm, lc, cpf, pcd, vc, dr, pr = arm.buscar_dados(mat)
+                except Exception as e:
+                    # primeira carga sem snapshot e sem Sheets: preenchimento manual
+                    st.error(f"Bases indisponíveis: {e}")
+                    nm = "NOME MANUAL"
             if nm != "NOME MANUAL":
                 st.success(f"✅ {nm}")
                 st.caption(f"📍 {lc}")
@@ -274,12 +251,12 @@ if pagina == "Rescisões":
             if dr > 0: st.warning(f"🏖️ Recesso: {dr} dias")
             if vc > 0: st.error(f"⚠️ Consignado: R$ {vc:.2f}")
 
-        tipo = st.selectbox("Tipo", ["Aviso Trabalhado", "Aviso Indenizado", "Pedido de Demissão", "Término Contrato", "Acordo", "Rescisão Indireta"])
+        tipo = st.selectbox("Tipo", TIPOS_DEMISSAO)
         dt_dem = st.date_input("Demissão", date.today(), format="DD/MM/YYYY")
 
         # SOLICITANTE DINÂMICO (lista + digitar)
         st.markdown("**Solicitante**")
-        solicitantes = ["(Selecionar)"] + listar_solicitantes_existentes()
+        solicitantes = ["(Selecionar)"] + sorted(set(SOLICITANTES_PADRAO + solicitantes_existentes))
         sol_sel = st.selectbox("Lista", solicitantes, key="sol_sel")
         sol_txt = st.text_input("Ou digite aqui", key="sol_txt")
         solicitante_final = sol_txt.strip() if sol_txt.strip() else ("" if sol_sel == "(Selecionar)" else sol_sel)
@@ -289,48 +266,13 @@ if pagina == "Rescisões":
         if st.button("✅ SALVAR", type="primary"):
             if fluig and mat:
                 try:
-                    sh = conectar_gsheets()
-                    ws = sh.worksheet("rescisões")
-                    headers = garantir_colunas_no_sheet(ws, COLUNAS_RESCISOES_MIN)
-
-                    # ID incremental
-                    try:
-                        col_id_idx = headers.index("ID") + 1
-                        ids = ws.col_values(col_id_idx)[1:]
-                        valid_ids = [int(x) for x in ids if str(x).isdigit()]
-                        nid = max(valid_ids) + 1 if valid_ids else 1
-                    except:
-                        nid = 1
-
-                    dados = {
-                        'ID': nid,
-                        'FLUIG': f"'{fluig}",
-                        'MATRICULA': limpar_matricula(mat),
-                        'NOME': nm,
-                        'CPF': cpf,
-                        'PCD': pcd,
-                        'LOCACAO': lc,
-                        'DIAS_RECESSO': dr,
-                        'PERIODO_RECESSO': pr,
-                        'TIPO_DEMISSAO': tipo,
-                        'DATA_DEMISSAO': formatar_data_para_salvar(dt_dem),
-                        'TEM_CONSIGNADO': "Sim" if vc > 0 else "Não",
-                        'VALOR_CONSIGNADO': str(vc).replace('.', ','),
-                        'CALCULO_REALIZADO': "PENDENTE",
-                        'DOC_ENVIADO': "PENDENTE",
-                        'DATA_PAGAMENTO': formatar_data_para_salvar(dt_dem + timedelta(days=10)),
-                        'FATURAMENTO': "NÃO",
-                        'BAIXA_PAGAMENTO': "ABERTO",
-                        'OBSERVACOES': str(obs),
-                        'SOLICITANTE': solicitante_final,
-                        'EXCLUIR': ""
-                    }
-
-                    linha = [dados.get(col, "") for col in headers]
-                    ws.append_row(linha)
-
-                    st.cache_data.clear()
-                    st.success("✅ Registro salvo!")
+                    dados = registro_avulso(fluig, mat, (nm, lc, cpf, pcd, vc, dr, pr), tipo, dt_dem,
+                                            solicitante_final, obs)
+
+                    with medidor.etapa("anexar_rescisoes"):
+                        nid = arm.anexar_rescisoes([dados])[0]
+
+                    st.success(f"✅ Registro {nid} salvo!")
                     time.sleep(1)
                     st.rerun()
 
@@ -342,35 +284,6 @@ if pagina == "Rescisões":
     # ---------- LISTAGEM ----------
     st.title("Gerenciamento de Rescisões")
 
-    try:
-        sh = conectar_gsheets()
-        ws_res = sh.worksheet("rescisões")
-        df = pd.DataFrame(ws_res.get_all_records())
-    except:
-        df = pd.DataFrame(columns=COLUNAS_RESCISOES_MIN)
-
-    if df.empty:
-        df = pd.DataFrame(columns=COLUNAS_RESCISOES_MIN)
-
-    df = norm_cols_upper(df)
-
-    # Datas
-    for col in ['DATA_DEMISSAO', 'DATA_PAGAMENTO']:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors='coerce', dayfirst=True).dt.date
-
-    # Limpezas
-    if 'FLUIG' in df.columns:
-        df['FLUIG'] = df['FLUIG'].astype(str).str.replace("'", "")
-    if 'MATRICULA' in df.columns:
-        df['MATRICULA'] = df['MATRICULA'].astype(str)
-
-    # Booleanos
-    bools = ['CALCULO_REALIZADO', 'DOC_ENVIADO', 'BAIXA_PAGAMENTO', 'FATURAMENTO', 'EXCLUIR']
-    for b in bools:
-        if b in df.columns:
-            df[b] = df[b].apply(interpretar_booleano)
-
     # ---------- FILTROS ----------
     st.markdown("#### 🔍 Filtros")
     c1, c2, c3, c4, c5 = st.columns([1.3, 1.2, 1.6, 2.2, 1.7])
@@ -385,76 +298,207 @@ if pagina == "Rescisões":
         dfim = st.date_input("Até", h, format="DD/MM/YYYY")
     with c4:
         busca = st.text_input("Buscar...")
+        # sem filtro de data a listagem só lê as ativas; com data, só os anos arquivados do período
+        f_arq = st.checkbox("Incluir arquivadas", help="Lê todo o arquivo de rescisões encerradas (mais lento).")
     with c5:
-        opts_sol = []
-        if "SOLICITANTE" in df.columns:
-            opts_sol = sorted({str(x).strip() for x in df["SOLICITANTE"].dropna().astype(str) if str(x).strip()})
-        f_sol = st.multiselect("Solicitante", options=opts_sol)
+        f_sol = st.multiselect("Solicitante", options=solicitantes_existentes)
 
-    dfv = df.copy()
+    filtro = FiltroRescisoes(f_st, CAMPOS_DATA.get(f_dt), di, dfim, busca, f_sol, arquivo=f_arq)
+    try:
+        with medidor.etapa("listar_rescisoes"):
+            dfv = arm.listar_rescisoes(filtro)
+    except Exception as e:
+        st.caption(f"⚠️ Erro ao ler rescisões: {e}")
+        dfv = pd.DataFrame(columns=COLUNAS_RESCISOES_MIN)
+    revisao = arm.revisao_rescisoes()
+
+    # ---------- PAGINAÇÃO ----------
+    # só a página visível vai para o navegador; contagem e exportação usam o filtrado inteiro
+    p1, p2, p3, p4 = st.columns([1.2, 2, 1.2, 1.2])
+    with p1:
+        tam_pag = st.selectbox("Por página", TAMANHOS_PAGINA, key="tam_pag")
+    with p2:
+        cols_ordem = list(dfv.columns) or ['ID']
+        ordem = st.selectbox("Ordenar por", cols_ordem, index=cols_ordem.index('ID') if 'ID' in cols_ordem else 0, key="ordem")
+    with p3:
+        crescente = st.selectbox("Sentido", ["Crescente", "Decrescente"], key="sentido") == "Crescente"
+    n_paginas = max(1, -(-len(dfv) // tam_pag))
+    if st.session_state.get("pag", 1) > n_paginas:
+        st.session_state["pag"] = n_paginas
+    with p4:
+        pag = st.number_input(f"Página (de {n_paginas})", min_value=1, max_value=n_paginas, step=1, key="pag")
+
+    with medidor.etapa("paginar"):
+        dpag = paginar(dfv, int(pag), tam_pag, ordem, crescente)
+    st.caption(f"👁️ Visualizando: **{len(dfv)} registros filtrados** · página {int(pag)}/{n_paginas} ({len(dpag)} linhas)")
 
-    if f_st == "Pendentes Cálculo" and 'CALCULO_REALIZADO' in dfv.columns:
-        dfv = dfv[dfv['CALCULO_REALIZADO'] == False]
-    elif f_st == "Pendentes Doc" and 'DOC_ENVIADO' in dfv.columns:
-        dfv = dfv[dfv['DOC_ENVIADO'] == False]
-    elif f_st == "Pendentes Pagto" and 'BAIXA_PAGAMENTO' in dfv.columns:
-        dfv = dfv[dfv['BAIXA_PAGAMENTO'] == False]
+    # ---------- EDITOR ----------
+    # chave por página/ordem/filtro: as edições pendentes do editor são por posição de linha
+    chave_ed = f"ed_{abs(hash((filtro.chave(), revisao, int(pag), tam_pag, ordem, crescente)))}"
+    with medidor.etapa("data_editor"):
+        df_editado = st.data_editor(
+            dpag,
+            key=chave_ed,
+            num_rows="fixed",
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "ID": st.column_config.NumberColumn(disabled=True, width="small"),
+                "FLUIG": st.column_config.TextColumn("Fluig", width="small"),
+                "MATRICULA": st.column_config.TextColumn("Matrícula", width="small"),
+                "NOME": st.column_config.TextColumn(disabled=True),
+                "CPF": st.column_config.TextColumn(disabled=True),
+                "PCD": st.column_config.TextColumn(disabled=True, width="small"),
+                "LOCACAO": st.column_config.TextColumn(disabled=True),
+                "DIAS_RECESSO": st.column_config.NumberColumn(disabled=True, width="small"),
+                "PERIODO_RECESSO": st.column_config.TextColumn(disabled=True),
+                "DATA_DEMISSAO": st.column_config.DateColumn(format="DD/MM/YYYY"),
+                "DATA_PAGAMENTO": st.column_config.DateColumn(format="DD/MM/YYYY"),
+                "CALCULO_REALIZADO": st.column_config.CheckboxColumn("Cálc?"),
+                "DOC_ENVIADO": st.column_config.CheckboxColumn("Doc?"),
+                "BAIXA_PAGAMENTO": st.column_config.CheckboxColumn("Pago?"),
+                "FATURAMENTO": st.column_config.CheckboxColumn("Fat?"),
+                "SOLICITANTE": st.column_config.TextColumn("Solicitante"),
+                "EXCLUIR": st.column_config.CheckboxColumn("Excluir?")
+            }
+        )
+
+    # ---------- GRAVAR EDIÇÕES ----------
+    alteracoes, excluir = diff_edicoes(dpag, df_editado)
+    if alteracoes or excluir:
+        n_cel = sum(len(c) for c in alteracoes.values())
+        st.info(f"✏️ {n_cel} célula(s) alterada(s) em {len(alteracoes)} registro(s) · 🗑️ {len(excluir)} para excluir")
+        if st.button("💾 SALVAR ALTERAÇÕES", type="primary"):
+            try:
+                with medidor.etapa("gravar_edicoes"):
+                    faltando = arm.gravar_edicoes(alteracoes, excluir)
+                if faltando:
+                    st.warning(f"IDs não encontrados na planilha (já removidos?): {', '.join(map(str, faltando))}")
+                st.session_state.pop(chave_ed, None)
+                st.success("✅ Alterações gravadas!")
+                time.sleep(1)
+                st.rerun()
+            except Exception as e:
+                st.error(f"Erro ao gravar alterações: {e}")
 
-    if f_dt != "Ignorar":
-        col = 'DATA_DEMISSAO' if f_dt == "Demissão" else 'DATA_PAGAMENTO'
-        if col in dfv.columns:
-            dfv = dfv[dfv[col].notna()]
-            dfv = dfv[(dfv[col] >= di) & (dfv[col] <= dfim)]
+    # ---------- AÇÕES ----------
+    # EXPORTA APENAS FILTRADO (dfv); o arquivo só é gerado no clique
+    chave_exp = (arm.nome, revisao, filtro.chave())
+    for c_exp, (fmt, (rotulo, mime)) in zip(st.columns(len(FORMATOS)), FORMATOS.items()):
+        with c_exp:
+            st.download_button(
+                f"{rotulo} (Somente filtrado)", medir(f"exportar_{fmt}", obter_exportacoes().preparador(dfv, fmt, chave_exp)),
+                f"rescissoes_filtrado.{fmt}", mime=mime, key=f"exp_{fmt}",
+            )
+
+    # ---------- CONFERÊNCIA DE PRAZOS ----------
+    # só no clique: recalcula DATA_PAGAMENTO das rescisões com pagamento em aberto; o
+    # resultado fica na sessão até a próxima escrita (revisão) e é exibido paginado
+    with st.expander("📅 Conferir datas de pagamento"):
+        chave_prz = (arm.nome, revisao)
+        if st.button("Conferir pagamentos em aberto"):
+            try:
+                with medidor.etapa("conferir_prazos"):
+                    abertas = arm.listar_rescisoes(FiltroRescisoes("Pendentes Pagto"))
+                    st.session_state["prazos"] = (chave_prz, PRAZOS.conferir(abertas))
+            except Exception as e:
+                st.caption(f"⚠️ Erro ao ler rescisões: {e}")
+        conferencia = st.session_state.get("prazos")
+        if conferencia is not None and conferencia[0] != chave_prz:
+            st.session_state.pop("prazos")
+            st.caption("Os dados mudaram desde a última conferência: confira de novo.")
+        elif conferencia is not None and conferencia[1].empty:
+            st.success("✅ Todas as datas de pagamento em aberto batem com o prazo calculado.")
+        elif conferencia is not None:
+            divergentes = conferencia[1]
+            n_pag_prz = max(1, -(-len(divergentes) // TAMANHOS_PAGINA[0]))
+            if st.session_state.get("pag_prz", 1) > n_pag_prz:
+                st.session_state["pag_prz"] = n_pag_prz
+            q1, q2 = st.columns([3, 1])
+            with q2:
+                pag_prz = st.number_input(f"Página (de {n_pag_prz})", min_value=1, max_value=n_pag_prz, step=1, key="pag_prz")
+            with q1:
+                st.caption(f"{len(divergentes)} rescisão(ões) em aberto com DATA_PAGAMENTO diferente do prazo calculado. "
+                           "Marque as que devem ser corrigidas.")
+            dprz = paginar(divergentes, int(pag_prz), TAMANHOS_PAGINA[0], "ID")
+            conf = st.data_editor(
+                dprz.assign(CORRIGIR=False)[['CORRIGIR'] + list(dprz.columns)],
+                key=f"prazos_{revisao}_{int(pag_prz)}",
+                hide_index=True,
+                use_container_width=True,
+                disabled=list(dprz.columns),
+                column_config={
+                    "CORRIGIR": st.column_config.CheckboxColumn("Corrigir?"),
+                    "DATA_DEMISSAO": st.column_config.DateColumn("Demissão", format="DD/MM/YYYY"),
+                    "DATA_PAGAMENTO": st.column_config.DateColumn("Pagamento atual", format="DD/MM/YYYY"),
+                    "PAGAMENTO_CALCULADO": st.column_config.DateColumn("Calculado", format="DD/MM/YYYY"),
+                },
+            )
+            corrigir = alteracoes_pagamento(conf[conf['CORRIGIR'].fillna(False).astype(bool)])
+            if st.button(f"Corrigir {len(corrigir)} data(s) de pagamento", disabled=not corrigir):
+                try:
+                    with medidor.etapa("gravar_prazos"):
+                        faltando = arm.gravar_edicoes(corrigir)
+                    if faltando:
+                        st.warning(f"IDs não encontrados na planilha (já removidos?): {', '.join(map(str, faltando))}")
+                    st.session_state.pop("prazos", None)
+                    st.success(f"✅ {len(corrigir) - len(faltando)} data(s) corrigida(s)!")
+                    time.sleep(1)
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Erro ao gravar datas: {e}")
 
-    if busca:
-        dfv = dfv[dfv.astype(str).apply(lambda x: x.str.contains(busca, case=False, na=False)).any(axis=1)]
+# ==============================================================================
+# PÁGINA: CADASTRO EM LOTE
+# ==============================================================================
+elif pagina == "Cadastro em Lote":
+    st.title("Cadastro de Rescisões em Lote")
 
-    if f_sol and "SOLICITANTE" in dfv.columns:
-        dfv = dfv[dfv["SOLICITANTE"].astype(str).isin(f_sol)]
+    st.info("📌 Envie um Excel/CSV com as colunas FLUIG, MATRICULA, TIPO, DATA e SOLICITANTE (OBSERVACOES opcional). "
+            "Todas as linhas são conferidas com as bases e gravadas de uma vez.")
 
-    st.caption(f"👁️ Visualizando: **{len(dfv)} registros filtrados**")
+    up = st.file_uploader("Upload rescisões (xlsx/csv)", type=["xlsx", "csv"], key="up_lote")
+    colA, colB = st.columns(2)
+    with colA:
+        sol_padrao = st.text_input("Solicitante (quando a linha vier sem)")
+    with colB:
+        incluir_manuais = st.checkbox("Gravar também matrículas não encontradas (nome manual)", value=True)
 
-    # ---------- EDITOR ----------
-    df_editado = st.data_editor(
-        dfv,
-        key="ed",
-        num_rows="fixed",
-        hide_index=True,
-        use_container_width=True,
-        column_config={
-            "ID": st.column_config.NumberColumn(disabled=True, width="small"),
-            "FLUIG": st.column_config.TextColumn("Fluig", width="small"),
-            "MATRICULA": st.column_config.TextColumn("Matrícula", width="small"),
-            "NOME": st.column_config.TextColumn(disabled=True),
-            "CPF": st.column_config.TextColumn(disabled=True),
-            "PCD": st.column_config.TextColumn(disabled=True, width="small"),
-            "LOCACAO": st.column_config.TextColumn(disabled=True),
-            "DIAS_RECESSO": st.column_config.NumberColumn(disabled=True, width="small"),
-            "PERIODO_RECESSO": st.column_config.TextColumn(disabled=True),
-            "DATA_DEMISSAO": st.column_config.DateColumn(format="DD/MM/YYYY"),
-            "DATA_PAGAMENTO": st.column_config.DateColumn(format="DD/MM/YYYY"),
-            "CALCULO_REALIZADO": st.column_config.CheckboxColumn("Cálc?"),
-            "DOC_ENVIADO": st.column_config.CheckboxColumn("Doc?"),
-            "BAIXA_PAGAMENTO": st.column_config.CheckboxColumn("Pago?"),
-            "FATURAMENTO": st.column_config.CheckboxColumn("Fat?"),
-            "SOLICITANTE": st.column_config.TextColumn("Solicitante"),
-            "EXCLUIR": st.column_config.CheckboxColumn("Excluir?")
-        }
-    )
+    if up:
+        try:
+            with medidor.etapa("preparar_lote"):
+                previa = preparar_lote(arm, up, up.name, solicitante_padrao=sol_padrao.strip())
+
+            n_gravar = len(previa.linhas) - (0 if incluir_manuais else previa.n_nao_encontradas)
+            m1, m2, m3 = st.columns(3)
+            m1.metric("Válidas", len(previa.linhas))
+            m2.metric("Não encontradas nas bases", previa.n_nao_encontradas)
+            m3.metric("Recusadas", len(previa.problemas))
+
+            # mesmo arquivo continua no uploader após gravar: não deixa gravar duas vezes
+            gravado = st.session_state.get("lote_gravado")
+            if gravado and gravado[0] == up.file_id:
+                st.success(f"✅ Arquivo já gravado: {gravado[1]} registro(s), IDs {gravado[2]} a {gravado[3]}.")
+            elif n_gravar and st.button(f"✅ Gravar {n_gravar} rescisão(ões)", type="primary"):
+                with medidor.etapa("anexar_rescisoes"):
+                    ids = arm.anexar_rescisoes(previa.registros(incluir_manuais))
+                st.session_state["lote_gravado"] = (up.file_id, len(ids), min(ids), max(ids))
+                st.rerun()
 
-    # ---------- AÇÕES ----------
-    c_exp = st.columns(1)[0]
-    with c_exp:
-        # EXPORTA APENAS FILTRADO (dfv)
-        dx = dfv.copy()
-        if 'CALCULO_REALIZADO' in dx.columns: dx['CALCULO_REALIZADO'] = dx['CALCULO_REALIZADO'].apply(lambda x: formatar_para_texto(x, 'CALCULO'))
-        if 'DOC_ENVIADO' in dx.columns: dx['DOC_ENVIADO'] = dx['DOC_ENVIADO'].apply(lambda x: formatar_para_texto(x, 'DOC'))
-        if 'BAIXA_PAGAMENTO' in dx.columns: dx['BAIXA_PAGAMENTO'] = dx['BAIXA_PAGAMENTO'].apply(lambda x: formatar_para_texto(x, 'PAGTO'))
-        if 'FATURAMENTO' in dx.columns: dx['FATURAMENTO'] = dx['FATURAMENTO'].apply(lambda x: formatar_para_texto(x, 'FAT'))
-        if 'DATA_DEMISSAO' in dx.columns: dx['DATA_DEMISSAO'] = pd.to_datetime(dx['DATA_DEMISSAO'], errors='coerce').dt.strftime('%d/%m/%Y')
-        if 'DATA_PAGAMENTO' in dx.columns: dx['DATA_PAGAMENTO'] = pd.to_datetime(dx['DATA_PAGAMENTO'], errors='coerce').dt.strftime('%d/%m/%Y')
-
-        st.download_button("📥 Baixar Excel (Somente filtrado)", to_excel_bytes(dx, "Filtrado"), "rescissoes_filtrado.xlsx")
+            st.subheader("Prévia")
+            if previa.n_nao_encontradas:
+                st.markdown("**Matrículas não encontradas**")
+                q = previa.quadro()
+                st.dataframe(q[~q["ENCONTRADO"]], hide_index=True, use_container_width=True)
+            if len(previa.problemas):
+                st.markdown("**Linhas recusadas**")
+                st.dataframe(previa.problemas, hide_index=True, use_container_width=True)
+            if len(previa.linhas):
+                st.markdown("**A gravar**")
+                st.dataframe(previa.quadro(), hide_index=True, use_container_width=True)
+
+        except Exception as e:
+            st.error(f"Erro ao processar arquivo: {e}")
 
 # ==============================================================================
 # PÁGINA: ATUALIZAR BASE (FUNCIONÁRIOS)
@@ -474,69 +518,37 @@ elif pagina == "Atualizar Base":
 
     if up:
         try:
-            if up.name.lower().endswith(".xlsx"):
-                df_new = pd.read_excel(up)
-            else:
-                df_new = pd.read_csv(up, sep=None, engine="python")
-
-            df_new = norm_cols_upper(df_new)
-            if "MATRICULA" not in df_new.columns:
-                st.error("❌ Sua planilha precisa ter a coluna MATRÍCULA (MATRICULA).")
-                st.stop()
-
-            df_new["MATRICULA"] = df_new["MATRICULA"].apply(limpar_matricula)
-            df_new["ATUALIZADO_EM"] = formatar_data_para_salvar(data_atualizacao)
-
-            sh = conectar_gsheets()
-            ws = sh.worksheet("base_funcionarios")
-            df_old = pd.DataFrame(ws.get_all_records())
-            if df_old.empty:
-                df_old = pd.DataFrame(columns=df_new.columns)
-            df_old = norm_cols_upper(df_old)
-            if "MATRICULA" not in df_old.columns:
-                df_old["MATRICULA"] = ""
-
-            df_old["MATRICULA"] = df_old["MATRICULA"].apply(limpar_matricula)
-
-            # Garante colunas
-            todas = sorted(set(df_old.columns.tolist() + df_new.columns.tolist()))
-            df_old = df_old.reindex(columns=todas, fill_value="")
-            df_new = df_new.reindex(columns=todas, fill_value="")
-
-            if modo.startswith("Atualizar"):
-                # merge update/insert
-                old_idx = df_old.set_index("MATRICULA")
-                new_idx = df_new.set_index("MATRICULA")
-
-                # atualiza linhas existentes
-                old_idx.update(new_idx)
-
-                # adiciona novas
-                faltantes = new_idx.index.difference(old_idx.index)
-                df_add = new_idx.loc[faltantes].reset_index()
-                df_fin = old_idx.reset_index()
-                df_fin = pd.concat([df_fin, df_add], ignore_index=True)
-
-            else:
-                # ignorar existentes
-                existentes = set(df_old["MATRICULA"].astype(str))
-                df_add = df_new[~df_new["MATRICULA"].astype(str).isin(existentes)]
-                df_fin = pd.concat([df_old, df_add], ignore_index=True)
-
-            df_fin = df_fin.replace([np.inf, -np.inf, np.nan], "").fillna("")
-            matriz = [df_fin.columns.tolist()] + df_fin.astype(str).values.tolist()
-
-            if st.button("✅ Aplicar atualização na base_funcionarios"):
-                ws.clear()
-                ws.update(matriz)
-                carregar_bases.clear()
-                st.cache_data.clear()
-                st.success(f"✅ Base atualizada! Total agora: {len(df_fin)} linhas.")
+            with medidor.etapa("preparar_atualizacao_base"):
+                diff = arm.preparar_atualizacao_base(
+                    ler_upload_em_blocos(up, up.name),
+                    atualizar_existentes=modo.startswith("Atualizar"),
+                    carimbo=formatar_data_para_salvar(data_atualizacao),
+                )
+
+            m1, m2, m3, m4 = st.columns(4)
+            m1.metric("Novas", len(diff.inseridas))
+            m2.metric("Alteradas", len(diff.atualizadas))
+            m3.metric("Sem mudança", diff.n_inalteradas)
+            m4.metric("Ignoradas", diff.n_ignoradas + diff.n_sem_matricula)
+            if diff.novas_colunas:
+                st.caption(f"Colunas novas na base: {', '.join(diff.novas_colunas)}")
+
+            if diff.vazio:
+                st.success("✅ Nada para atualizar: a base já está igual ao arquivo.")
+            elif st.button("✅ Aplicar atualização na base_funcionarios"):
+                with medidor.etapa("aplicar_atualizacao_base"):
+                    chamadas = arm.aplicar_atualizacao_base(diff)
+                st.success(f"✅ Base atualizada! {len(diff.inseridas)} novas, {len(diff.atualizadas)} alteradas ({chamadas} escrita(s)).")
                 time.sleep(1)
                 st.rerun()
 
             st.subheader("Prévia do que vai ser gravado")
-            st.dataframe(df_fin.tail(30), use_container_width=True)
+            if diff.atualizadas:
+                st.markdown("**Alteradas**")
+                st.dataframe(diff.quadro("atualizadas", 30), use_container_width=True)
+            if diff.inseridas:
+                st.markdown("**Novas**")
+                st.dataframe(diff.quadro("inseridas", 30), use_container_width=True)
 
         except Exception as e:
             st.error(f"Erro ao processar arquivo: {e}")
@@ -546,9 +558,6 @@ elif pagina == "Atualizar Base":
 # ==============================================================================
 elif pagina == "Gestão Usuários":
     st.title("Admin - Gestão Usuários")
-    sh = conectar_gsheets()
-    ws_u = sh.worksheet("usuarios")
-
     c1, c2 = st.columns(2)
 
     with c1:
@@ -557,14 +566,31 @@ elif pagina == "Gestão Usuários":
             nu = st.text_input("Login")
             ns = st.text_input("Senha")
             if st.form_submit_button("Criar"):
-                ws_u.append_row([nu, ns])
+                arm.criar_usuario(nu, gerar_hash(ns))
                 st.success("✅ Criado!")
                 time.sleep(0.5)
                 st.rerun()
 
     with c2:
         st.subheader("Ativos")
-        d = ws_u.get_all_records()
-        if d:
-            df_u = pd.DataFrame(d)
-            st.dataframe(df_u, use_container_width=True)
+        df_u = arm.listar_usuarios()
+        if not df_u.empty:
+            # a senha é só o hash: não tem o que mostrar
+            st.dataframe(df_u.drop(columns=['SENHA'], errors='ignore'), use_container_width=True)
+
+# ==============================================================================
+# PAINEL DE DESEMPENHO (ADM)
+# ==============================================================================
+if st.session_state['usuario_atual'] == 'adm':
+    rerun = medidor.rerun_atual
+    with st.sidebar.expander("⏱️ Desempenho"):
+        q = rerun.quadro()
+        api = q[q["tipo"] == "api"]
+        st.caption(f"Rerun #{rerun.numero}: {rerun.duracao * 1000:.0f} ms · {len(api)} chamada(s) ao Sheets "
+                   f"({api['ms'].sum():.0f} ms, {int(api['células'].sum())} células)")
+        if not q.empty:
+            st.dataframe(q.round(1), hide_index=True, use_container_width=True)
+        agendador = obter_agendador()
+        st.caption(f"Agendador: {agendador.juntadas} leitura(s) juntada(s) · {agendador.repetidas} nova(s) tentativa(s)")
+        st.caption("Acumulado do processo (últimas medições)")
+        st.dataframe(medidor.estatisticas().round(1), hide_index=True, use_container_width=True)
@@ -0,0 +1,190 @@
+"""Camada de armazenamento do app.
+
+As páginas falam só com um `Armazenamento`; quem guarda os dados é a
+implementação escolhida em `criar_armazenamento`:
+
+- "gsheets" (padrão): planilha SistemaDP_DB no Google Sheets
+  (armazenamento_gsheets.py);
+- "sqlite": arquivo SQLite local com índices, para rodar/testar/medir sem rede
+  (armazenamento_sqlite.py).
+
+A escolha vem da variável de ambiente DP_ARMAZENAMENTO (e DP_SQLITE para o
+caminho do arquivo).
+"""
+import os
+import threading
+
+import pandas as pd
+
+from espelho_rescisoes import ABA_RESCISOES
+
+COLUNAS_RESCISOES_MIN = [
+    'ID', 'FLUIG', 'MATRICULA', 'NOME', 'CPF', 'PCD', 'LOCACAO',
+    'DIAS_RECESSO', 'PERIODO_RECESSO', 'TIPO_DEMISSAO', 'DATA_DEMISSAO',
+    'TEM_CONSIGNADO', 'VALOR_CONSIGNADO', 'CALCULO_REALIZADO', 'DOC_ENVIADO',
+    'DATA_PAGAMENTO', 'FATURAMENTO', 'BAIXA_PAGAMENTO', 'OBSERVACOES',
+    'SOLICITANTE', 'EXCLUIR'
+]
+
+ABA_USUARIOS = "usuarios"
+
+# rótulos dos filtros da tela -> coluna
+STATUS_PENDENTES = {
+    "Pendentes Cálculo": 'CALCULO_REALIZADO',
+    "Pendentes Doc": 'DOC_ENVIADO',
+    "Pendentes Pagto": 'BAIXA_PAGAMENTO',
+}
+CAMPOS_DATA = {"Demissão": 'DATA_DEMISSAO', "Pagamento": 'DATA_PAGAMENTO'}
+
+
+class FiltroRescisoes:
+    """Filtros da listagem (status, período, busca, solicitantes).
+
+    `arquivo=True` inclui todas as partições arquivadas (arquivo_rescisoes.py); sem
+    ele, só entram as arquivadas cuja faixa de datas cruza o período filtrado.
+    """
+
+    def __init__(self, status="Todos", campo_data=None, de=None, ate=None, busca="", solicitantes=(), arquivo=False):
+        self.status = status
+        self.campo_data = campo_data  # 'DATA_DEMISSAO', 'DATA_PAGAMENTO' ou None
+        self.de = de
+        self.ate = ate
+        self.busca = (busca or "").strip()
+        self.solicitantes = tuple(solicitantes or ())
+        self.arquivo = bool(arquivo)
+
+    @property
+    def coluna_pendente(self):
+        return STATUS_PENDENTES.get(self.status)
+
+    def chave(self):
+        return (self.status, self.campo_data, self.de, self.ate, self.busca, self.solicitantes, self.arquivo)
+
+
+class CatalogoSolicitantes:
+    """Solicitantes distintos já usados, memoizado pela revisão das rescisões.
+
+    Recalcula só quando a revisão muda; um SALVAR acrescenta o nome na hora
+    (adicionar), sem esperar a próxima leitura dos dados.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revisao = None
+        self._nomes = frozenset()
+        self._ordenados = []
+
+    def obter(self, revisao, ler):
+        """`ler()` devolve os valores da coluna SOLICITANTE (só chamado se a revisão mudou)."""
+        with self._lock:
+            if revisao != self._revisao:
+                self._definir(ler())
+                self._revisao = revisao
+            return list(self._ordenados)
+
+    def adicionar(self, nomes, de=None, para=None):
+        """Inclui nomes recém-gravados. Se o catálogo estava na revisão `de`, passa a valer para `para`."""
+        with self._lock:
+            self._definir(list(self._nomes) + list(nomes))
+            if de is not None and self._revisao == de:
+                self._revisao = para
+
+    def invalidar(self):
+        with self._lock:
+            self._revisao = None
+
+    def _definir(self, valores):
+        nomes = frozenset(n for n in (str(v).strip() for v in valores if v is not None and not pd.isna(v)) if n)
+        if nomes != self._nomes:
+            self._nomes = nomes
+            self._ordenados = sorted(nomes)
+
+
+class Armazenamento:
+    """Interface comum dos backends. Frames de rescisões saem já normalizados."""
+
+    nome = ""
+
+    # ---------------------------------------------------------------- rescisões
+    def sincronizar_rescisoes(self):
+        """Atualiza o que for cache local. Retorna mensagem de aviso ou None."""
+        return None
+
+    def revisao_rescisoes(self):
+        """Muda sempre que os dados de rescisões mudam (chave de memoização)."""
+        raise NotImplementedError
+
+    def listar_rescisoes(self, filtro=None):
+        raise NotImplementedError
+
+    def listar_solicitantes(self):
+        """Solicitantes já usados em rescisões (sem os padrões da tela)."""
+        raise NotImplementedError
+
+    def anexar_rescisoes(self, registros):
+        """Grava registros novos (dicts sem ID). Retorna os IDs atribuídos."""
+        raise NotImplementedError
+
+    def gravar_edicoes(self, alteracoes, excluir_ids=()):
+        """{ID: {COLUNA: texto}} + exclusões (ativas ou arquivadas). Retorna IDs não encontrados."""
+        raise NotImplementedError
+
+    def arquivar_rescisoes(self, hoje=None, dias=None):
+        """Move as encerradas há mais de `dias` para o arquivo. Retorna {ano: linhas movidas}."""
+        raise NotImplementedError
+
+    def resumo_arquivo(self):
+        """{ano: linhas} das partições arquivadas."""
+        return {}
+
+    # ------------------------------------------------------------------- bases
+    def buscar_dados(self, matricula):
+        """Tupla (nome, locação, cpf, pcd, consignado, dias recesso, período recesso)."""
+        raise NotImplementedError
+
+    def buscar_dados_lote(self, matriculas):
+        raise NotImplementedError
+
+    def ler_bases(self):
+        """(df_f, df_c, df_r) normalizados."""
+        raise NotImplementedError
+
+    def recarregar_bases(self):
+        pass
+
+    def preparar_atualizacao_base(self, blocos, atualizar_existentes=True, carimbo=""):
+        """DiffBase do upload contra base_funcionarios (nada é gravado)."""
+        raise NotImplementedError
+
+    def aplicar_atualizacao_base(self, diff):
+        """Grava o DiffBase. Retorna o nº de escritas feitas."""
+        raise NotImplementedError
+
+    # ----------------------------------------------------------------- usuários
+    def buscar_usuario(self, usuario):
+        """dict com USUARIO/SENHA ou None."""
+        raise NotImplementedError
+
+    def listar_usuarios(self):
+        raise NotImplementedError
+
+    def criar_usuario(self, usuario, senha):
+        """`senha` já vem com hash (usuarios.gerar_hash)."""
+        raise NotImplementedError
+
+    def atualizar_senha(self, usuario, senha):
+        raise NotImplementedError
+
+    # --------------------------------------------------------------------------
+    def invalidar(self):
+        """FORÇAR RECARGA: descarta caches para a próxima leitura ir à fonte."""
+        pass
+
+
+def criar_armazenamento(fonte_gsheets=None, tipo=None, caminho_sqlite=None):
+    tipo = (tipo or os.environ.get("DP_ARMAZENAMENTO", "gsheets")).lower()
+    if tipo == "sqlite":
+        from armazenamento_sqlite import ARQUIVO_SQLITE, SQLiteArmazenamento
+        return SQLiteArmazenamento(caminho_sqlite or os.environ.get("DP_SQLITE", ARQUIVO_SQLITE))
+    from armazenamento_gsheets import GSheetsArmazenamento
+    return GSheetsArmazenamento(fonte_gsheets)
@@ -0,0 +1,233 @@
+"""Backend Google Sheets (planilha SistemaDP_DB).
+
+Junta as peças que já conversam com a planilha: espelho local de rescisões,
+arquivo por ano, escrita em lote, alocação de ID, bases em memória/snapshot e
+merge da base.
+`fonte` é uma função que devolve o gspread.Spreadsheet.
+"""
+import threading
+
+import pandas as pd
+
+from armazenamento import ABA_RESCISOES, ABA_USUARIOS, COLUNAS_RESCISOES_MIN, Armazenamento, CatalogoSolicitantes
+from arquivo_rescisoes import DIAS_ARQUIVAMENTO, ArquivoGSheets, aba_do_ano, particoes_do_filtro
+from bases import ABA_FUNCIONARIOS, REGISTRO_NAO_ENCONTRADO, BasesFuncionarios, consultar_lote
+from busca import montar_indice_busca
+from escrita_rescisoes import AlocadorIds, CacheCabecalho, gravar_edicoes
+from espelho_rescisoes import EspelhoRescisoes, converter_numericas
+from filtros import MotorFiltros
+from merge_base import aplicar_diff, calcular_diff
+from normalizacao import COLUNAS_DATA, chave_matricula, normalizar_rescisoes
+from usuarios import IndiceUsuarios
+
+
+class GSheetsArmazenamento(Armazenamento):
+    nome = "gsheets"
+
+    def __init__(self, fonte, espelho=None, bases=None, arquivo=None):
+        self.fonte = fonte
+        self.espelho = espelho or EspelhoRescisoes()
+        self.bases = bases or BasesFuncionarios(fonte)
+        self.arquivo = arquivo or ArquivoGSheets()
+        self.cabecalho = CacheCabecalho()
+        self.alocador = AlocadorIds()
+        self.usuarios = IndiceUsuarios(self._ler_usuarios)
+        self.solicitantes = CatalogoSolicitantes()
+        self._abas = {}
+        self._lock = threading.Lock()
+        self._normalizado = None  # (revisão, df normalizado, MotorFiltros)
+        self._particoes = {}      # ano -> (versão, df normalizado, MotorFiltros)
+
+    def aba(self, nome):
+        # o objeto Worksheet só guarda id/título: reaproveitar evita um fetch de metadados por uso
+        if nome not in self._abas:
+            self._abas[nome] = self.fonte().worksheet(nome)
+        return self._abas[nome]
+
+    # ---------------------------------------------------------------- rescisões
+    def sincronizar_rescisoes(self):
+        try:
+            self.espelho.sincronizar(self.fonte())
+        except Exception as e:
+            # sem rede/cota: segue com a última cópia local
+            return f"Não foi possível sincronizar rescisões ({e}). Exibindo cópia local."
+        return None
+
+    def revisao_rescisoes(self):
+        return self.espelho.revisao
+
+    def _rescisoes_normalizadas(self):
+        rev = self.espelho.revisao
+        with self._lock:
+            if self._normalizado is None or self._normalizado[0] != rev:
+                df = self.espelho.ler()
+                if df.empty:
+                    df = pd.DataFrame(columns=COLUNAS_RESCISOES_MIN)
+                df = normalizar_rescisoes(df)
+                self._normalizado = (rev, df, MotorFiltros(df, montar_indice_busca(df)))
+            return self._normalizado
+
+    def _catalogo_arquivo(self):
+        # erro de leitura: segue com o último catálogo lido; sem nenhum, o erro sobe
+        # (listar sem as arquivadas ou semear o ID sem o maior arquivado seria pior)
+        return self.arquivo.catalogo(self.fonte(), self.espelho.revisao)
+
+    def _particao(self, particao):
+        with self._lock:
+            atual = self._particoes.get(particao.ano)
+            if atual is None or atual[0] != particao.versao:
+                df = normalizar_rescisoes(converter_numericas(self.arquivo.ler(self.fonte(), particao)))
+                atual = self._particoes[particao.ano] = (particao.versao, df, MotorFiltros(df, montar_indice_busca(df)))
+            return atual
+
+    def listar_rescisoes(self, filtro=None):
+        _, df, motor = self._rescisoes_normalizadas()
+        ativas = df.copy() if filtro is None else motor.filtrar(filtro)
+        # sem data nem "Incluir arquivadas" nenhuma partição entra: nem lê o catálogo
+        # (a cópia local continua servindo com o Sheets fora do ar)
+        if filtro is None or not (filtro.arquivo or filtro.campo_data in COLUNAS_DATA):
+            return ativas
+        catalogo = self._catalogo_arquivo()
+        anos = particoes_do_filtro(catalogo, filtro)
+        if not anos:
+            return ativas
+        # só as partições cuja faixa de datas cruza o filtro; cada uma com seu motor memoizado
+        partes = [ativas] + [self._particao(catalogo[ano])[2].filtrar(filtro) for ano in anos]
+        return pd.concat(partes, ignore_index=True)
+
+    def listar_solicitantes(self):
+        # do espelho local (mesmo frame da listagem): nenhuma leitura na planilha
+        def ler():
+            df = self._rescisoes_normalizadas()[1]
+            return df["SOLICITANTE"].unique() if "SOLICITANTE" in df.columns else ()
+        return self.solicitantes.obter(self.espelho.revisao, ler)
+
+    def anexar_rescisoes(self, registros):
+        ws = self.aba(ABA_RESCISOES)
+        headers = self.cabecalho.garantir(ws, COLUNAS_RESCISOES_MIN, semente=self.espelho.headers)
+
+        # ID: marca d'água em memória (semeada pelo espelho local); o append confere conflito
+        if not self.alocador.semeado:
+            resumo = self.espelho.resumo_ids()
+            if resumo:
+                self.alocador.semear(*resumo)
+            else:
+                self.alocador.semear_do_sheet(ws, headers)
+            # o maior ID pode ter ido para o arquivo: nunca reaproveitar
+            id_arquivo = max((p.id_max for p in self._catalogo_arquivo().values()), default=0)
+            if id_arquivo > self.alocador.maior_id:
+                self.alocador.semear(id_arquivo, self.alocador.n_linhas)
+
+        ids = self.alocador.anexar(ws, headers, registros)
+        self.espelho.marcar_desatualizado()
+        self.solicitantes.adicionar(r.get('SOLICITANTE') for r in registros)
+        return ids
+
+    def gravar_edicoes(self, alteracoes, excluir_ids=()):
+        sh = self.fonte()
+        mt_antes = sh.get_lastUpdateTime()  # para o espelho saber se outra sessão escreveu no meio
+        faltando = gravar_edicoes(self.aba(ABA_RESCISOES), alteracoes, excluir_ids, headers=self.espelho.headers)
+        self.espelho.registrar_escrita(sh, alteracoes, excluir_ids, mt_antes)
+        if excluir_ids:
+            self.alocador.invalidar()
+        if faltando:
+            faltando = self._gravar_arquivadas(faltando, alteracoes, excluir_ids)
+        if faltando:
+            self.espelho.invalidar()
+        return faltando
+
+    def _gravar_arquivadas(self, ids, alteracoes, excluir_ids):
+        """IDs fora da aba principal que estão numa partição arquivada já lida (listagem com arquivo)."""
+        restantes = {int(i) for i in ids}
+        for ano, (_, df, _) in list(self._particoes.items()):
+            aqui = restantes & set(df['ID'].dropna().astype(int)) if 'ID' in df.columns else set()
+            if not aqui:
+                continue
+            restantes -= aqui
+            restantes |= set(self.arquivo.gravar_edicoes(
+                self.fonte(), ano,
+                {i: c for i, c in alteracoes.items() if int(i) in aqui},
+                [i for i in excluir_ids if int(i) in aqui],
+            ))
+        return [i for i in ids if int(i) in restantes]
+
+    def arquivar_rescisoes(self, hoje=None, dias=None):
+        movidas = self.arquivo.arquivar(self.fonte(), hoje, DIAS_ARQUIVAMENTO if dias is None else dias)
+        if movidas:
+            self.espelho.invalidar()
+            self.alocador.invalidar()
+        return movidas
+
+    def resumo_arquivo(self):
+        return {ano: p.linhas for ano, p in sorted(self._catalogo_arquivo().items())}
+
+    # ------------------------------------------------------------------- bases
+    def buscar_dados(self, matricula):
+        return self.bases.obter().lookup.get(chave_matricula(matricula), REGISTRO_NAO_ENCONTRADO)
+
+    def buscar_dados_lote(self, matriculas):
+        return consultar_lote(self.bases.obter().idx, matriculas)
+
+    def ler_bases(self):
+        dados = self.bases.obter()
+        return dados.df_f, dados.df_c, dados.df_r
+
+    def recarregar_bases(self):
+        self.bases.recarregar()
+
+    def preparar_atualizacao_base(self, blocos, atualizar_existentes=True, carimbo=""):
+        valores = self.aba(ABA_FUNCIONARIOS).get_all_values()
+        return calcular_diff(valores, blocos, atualizar_existentes, carimbo)
+
+    def aplicar_atualizacao_base(self, diff):
+        chamadas = aplicar_diff(self.aba(ABA_FUNCIONARIOS), diff)
+        self.bases.recarregar()
+        return chamadas
+
+    # ----------------------------------------------------------------- usuários
+    def _ler_usuarios(self):
+        valores = self.aba(ABA_USUARIOS).get_all_values()
+        headers = [str(h).upper().strip() for h in (valores[0] if valores else [])]
+        indice = {}
+        for n, linha in enumerate(valores[1:], start=2):
+            registro = dict(zip(headers, linha))
+            usuario = str(registro.get('USUARIO', ''))
+            if usuario:
+                indice.setdefault(usuario, (n, registro))
+        return indice
+
+    def listar_usuarios(self):
+        return pd.DataFrame([registro for _, registro in self.usuarios.obter().values()])
+
+    def buscar_usuario(self, usuario):
+        return self.usuarios.buscar(usuario)
+
+    def criar_usuario(self, usuario, senha):
+        self.aba(ABA_USUARIOS).append_row([usuario, senha])
+        self.usuarios.invalidar()
+
+    def atualizar_senha(self, usuario, senha):
+        linha, registro = self.usuarios.obter()[str(usuario)]
+        self.aba(ABA_USUARIOS).update_cell(linha, list(registro).index('SENHA') + 1, senha)
+        self.usuarios.atualizar(usuario, 'SENHA', senha)
+
+    # --------------------------------------------------------------------------
+    def invalidar(self):
+        self.espelho.invalidar()
+        self.cabecalho.invalidar()
+        self.alocador.invalidar()
+        self.usuarios.invalidar()
+        self.solicitantes.invalidar()
+        self.arquivo.invalidar()
+        self._abas.clear()
+        with self._lock:
+            self._normalizado = None  # listagem e motores de filtro refeitos na próxima leitura
+            self._particoes.clear()
+        self.bases.recarregar()
+
+    def exportar_abas(self):
+        """{aba: get_all_values()} de todas as abas usadas, inclusive as arquivadas (para popular outro backend)."""
+        from bases import ABA_CONSIGNADOS, ABA_RECESSO
+        abas = (ABA_RESCISOES, ABA_FUNCIONARIOS, ABA_CONSIGNADOS, ABA_RECESSO, ABA_USUARIOS)
+        abas += tuple(aba_do_ano(ano) for ano in sorted(self._catalogo_arquivo()))
+        return {nome: self.aba(nome).get_all_values() for nome in abas}
@@ -0,0 +1,421 @@
+"""Backend SQLite local (DP_ARMAZENAMENTO=sqlite).
+
+Mesmo contrato do backend Google Sheets, mas com filtros e consultas feitos
+em SQL sobre colunas indexadas, sem carregar tabelas inteiras no pandas:
+
+- rescisoes: ID (PK), MATRICULA, DATA_DEMISSAO e DATA_PAGAMENTO indexados.
+  Datas ficam em ISO (AAAA-MM-DD) para o BETWEEN usar o índice; status
+  pendente e texto de busca ficam em colunas derivadas (_CALC, _DOC, _PAGO,
+  _BUSCA) recalculadas a cada escrita;
+- rescisoes_arquivo: mesmas colunas e índices; recebe as encerradas antigas
+  (arquivar_rescisoes). A listagem só consulta o arquivo com filtro de data
+  (o índice de data restringe às linhas do período) ou "Incluir arquivadas";
+- base_*: texto bruto como na planilha (+ _LINHA) e uma tabela indice_bases
+  (MATRICULA PK) com o resultado de montar_indice_bases para a busca por matrícula;
+- usuarios: USUARIO indexado.
+
+Para popular a partir da planilha: SQLiteArmazenamento(caminho).importar_abas(
+GSheetsArmazenamento(...).exportar_abas()).
+"""
+import json
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from armazenamento import ABA_RESCISOES, ABA_USUARIOS, COLUNAS_RESCISOES_MIN, Armazenamento, CatalogoSolicitantes
+from arquivo_rescisoes import DIAS_ARQUIVAMENTO, anos_particao, mascara_arquivavel
+from bases import (
+    ABA_CONSIGNADOS, ABA_FUNCIONARIOS, ABA_RECESSO, COLUNAS_INDICE, REGISTRO_NAO_ENCONTRADO,
+    consultar_lote, montar_indice_bases, normalizar_consignados, normalizar_funcionarios, normalizar_recesso,
+)
+from busca import montar_indice_busca, normalizar_termo
+from espelho_rescisoes import converter_numericas
+from merge_base import calcular_diff
+from normalizacao import COLUNAS_DATA, chave_matricula, interpretar_booleano, normalizar_rescisoes
+
+ARQUIVO_SQLITE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dp_local.sqlite")
+
+TABELAS = {
+    ABA_RESCISOES: "rescisoes",
+    ABA_FUNCIONARIOS: "base_funcionarios",
+    ABA_CONSIGNADOS: "base_consignados",
+    ABA_RECESSO: "base_recesso",
+    ABA_USUARIOS: "usuarios",
+}
+# coluna booleana -> coluna derivada (1 = feito) usada no filtro de pendentes
+DERIVADAS_STATUS = {'CALCULO_REALIZADO': '_CALC', 'DOC_ENVIADO': '_DOC', 'BAIXA_PAGAMENTO': '_PAGO'}
+LOTE_IN = 900  # parâmetros por IN (...) abaixo do limite do SQLite
+TABELAS_RESCISOES = ("rescisoes", "rescisoes_arquivo")  # ativas primeiro
+VERSAO_INDICE = 2  # 2: indice_bases por chave_matricula (sem zeros à esquerda)
+
+
+def _q(col):
+    return '"' + str(col).replace('"', '""') + '"'
+
+
+def _datas_iso(serie):
+    """'dd/mm/aaaa' (como na planilha) -> 'aaaa-mm-dd'; vazio se não for data."""
+    d = pd.to_datetime(serie.astype(object).where(serie.notna(), ""), errors="coerce", dayfirst=True)
+    return d.dt.strftime("%Y-%m-%d").astype(object).where(d.notna(), "")
+
+
+def _preparar_rescisoes(df):
+    """Texto da planilha -> linhas da tabela (datas ISO + colunas derivadas)."""
+    df = df.copy()
+    for col in COLUNAS_DATA:
+        if col in df.columns:
+            df[col] = _datas_iso(df[col])
+    for col, derivada in DERIVADAS_STATUS.items():
+        df[derivada] = df[col].map(interpretar_booleano).astype(int) if col in df.columns else 0
+    busca = df.copy()
+    if 'FLUIG' in busca.columns:
+        busca['FLUIG'] = busca['FLUIG'].astype(str).str.replace("'", "")
+    df['_BUSCA'] = montar_indice_busca(busca).astype(object)
+    return df
+
+
+class SQLiteArmazenamento(Armazenamento):
+    nome = "sqlite"
+
+    def __init__(self, caminho=ARQUIVO_SQLITE):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        self.solicitantes = CatalogoSolicitantes()
+        with self._conn() as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT)")
+            for tabela in TABELAS_RESCISOES:
+                if not self._existe(con, tabela):
+                    self._criar_rescisoes(con, COLUNAS_RESCISOES_MIN, tabela)
+                self._criar_indices_rescisoes(con, tabela)
+                self._corrigir_derivadas(con, tabela)
+            self._garantir_colunas(con, "rescisoes_arquivo", self._colunas(con, "rescisoes"))
+            for aba, cols in ((ABA_FUNCIONARIOS, ["MATRICULA"]), (ABA_CONSIGNADOS, ["MATRICULA"]),
+                              (ABA_RECESSO, ["MATRICULA"]), (ABA_USUARIOS, ["USUARIO", "SENHA"])):
+                if not self._existe(con, TABELAS[aba]):
+                    self._criar_bruta(con, TABELAS[aba], cols, [])
+            if not self._existe(con, "indice_bases") or self._meta(con, "versao_indice", 1) < VERSAO_INDICE:
+                self._gravar_indice(con)
+
+    # ------------------------------------------------------------------ sqlite
+    def _conn(self):
+        return sqlite3.connect(self.caminho, timeout=30)
+
+    @staticmethod
+    def _existe(con, tabela):
+        return con.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (tabela,)).fetchone() is not None
+
+    @staticmethod
+    def _colunas(con, tabela):
+        return [r[1] for r in con.execute(f"PRAGMA table_info({_q(tabela)})")]
+
+    def _garantir_colunas(self, con, tabela, colunas):
+        existentes = set(self._colunas(con, tabela))
+        for c in colunas:
+            if c not in existentes:
+                con.execute(f"ALTER TABLE {_q(tabela)} ADD COLUMN {_q(c)} TEXT DEFAULT ''")
+                existentes.add(c)
+
+    def _meta(self, con, chave, padrao=None):
+        row = con.execute("SELECT valor FROM meta WHERE chave = ?", (chave,)).fetchone()
+        return json.loads(row[0]) if row else padrao
+
+    def _tocar(self, con):
+        con.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES ('revisao', ?)",
+                    (json.dumps(self._meta(con, "revisao", 0) + 1),))
+
+    def _criar_rescisoes(self, con, colunas, tabela="rescisoes"):
+        cols = [c for c in colunas if c != "ID"]
+        defs = ", ".join([f"{_q(c)} TEXT DEFAULT ''" for c in cols] +
+                         [f"{d} INTEGER DEFAULT 0" for d in DERIVADAS_STATUS.values()] + ["_BUSCA TEXT DEFAULT ''"])
+        con.execute(f"CREATE TABLE {tabela} (ID INTEGER PRIMARY KEY, {defs})")
+        self._criar_indices_rescisoes(con, tabela)
+
+    def _corrigir_derivadas(self, con, tabela):
+        """Bancos antigos: "ABERTO" contava como pago e edições gravavam o status como BLOB."""
+        cols = [c for c in DERIVADAS_STATUS if c in self._colunas(con, tabela)]
+        if not cols:
+            return
+        suspeitas = " OR ".join([f"typeof({DERIVADAS_STATUS[c]}) != 'integer'" for c in cols] +
+                                ["UPPER(TRIM(BAIXA_PAGAMENTO)) = 'ABERTO' AND _PAGO != 0"] * ('BAIXA_PAGAMENTO' in cols))
+        linhas = con.execute(f"SELECT ID, {', '.join(map(_q, cols))} FROM {tabela} WHERE {suspeitas}").fetchall()
+        con.executemany(
+            f"UPDATE {tabela} SET {', '.join(f'{DERIVADAS_STATUS[c]} = ?' for c in cols)} WHERE ID = ?",
+            ([int(interpretar_booleano(v)) for v in linha[1:]] + [linha[0]] for linha in linhas),
+        )
+
+    def _criar_indices_rescisoes(self, con, tabela="rescisoes"):
+        for col in ("MATRICULA", "DATA_DEMISSAO", "DATA_PAGAMENTO", "SOLICITANTE"):
+            con.execute(f"CREATE INDEX IF NOT EXISTS ix_{tabela}_{col.lower()} ON {tabela} ({_q(col)})")
+
+    def _criar_bruta(self, con, tabela, headers, linhas):
+        con.execute(f"DROP TABLE IF EXISTS {_q(tabela)}")
+        defs = ", ".join(f"{_q(h)} TEXT DEFAULT ''" for h in headers)
+        con.execute(f"CREATE TABLE {_q(tabela)} (_LINHA INTEGER PRIMARY KEY, {defs})")
+        chave = "USUARIO" if tabela == "usuarios" else "MATRICULA"
+        if chave in headers:
+            con.execute(f"CREATE INDEX ix_{tabela}_{chave.lower()} ON {_q(tabela)} ({_q(chave)})")
+        if linhas:
+            cols = ", ".join(["_LINHA"] + [_q(h) for h in headers])
+            marc = ", ".join("?" * (len(headers) + 1))
+            con.executemany(f"INSERT INTO {_q(tabela)} ({cols}) VALUES ({marc})",
+                            ([n + 2] + list(r) for n, r in enumerate(linhas)))
+
+    def _ler_bruta(self, con, tabela):
+        df = pd.read_sql_query(f"SELECT * FROM {_q(tabela)} ORDER BY _LINHA", con)
+        return df.drop(columns=["_LINHA"])
+
+    # ---------------------------------------------------------------- importação
+    def importar_abas(self, valores_por_aba):
+        """Substitui o conteúdo local por {aba: get_all_values()} (ex.: GSheetsArmazenamento.exportar_abas())."""
+        with self._lock, self._conn() as con:
+            # abas "rescisões AAAA" (partições arquivadas) vão todas para rescisoes_arquivo
+            arquivadas = [a for a in valores_por_aba if a.startswith(f"{ABA_RESCISOES} ")]
+            if ABA_RESCISOES in valores_por_aba or arquivadas:
+                for tabela in TABELAS_RESCISOES:
+                    con.execute(f"DROP TABLE IF EXISTS {tabela}")
+                    self._criar_rescisoes(con, COLUNAS_RESCISOES_MIN, tabela)
+            for aba, valores in valores_por_aba.items():
+                tabela = "rescisoes_arquivo" if aba in arquivadas else TABELAS[aba]
+                headers = [str(h).upper().strip() for h in (valores[0] if valores else [])]
+                linhas = [(list(map(str, r)) + [""] * len(headers))[:len(headers)] for r in valores[1:]]
+                if tabela in TABELAS_RESCISOES:
+                    df = pd.DataFrame(linhas, columns=headers)
+                    df = df[pd.to_numeric(df.get("ID", pd.Series(dtype=object)), errors="coerce").notna()]
+                    self._inserir_rescisoes(con, df.to_dict("records"), tabela)
+                else:
+                    self._criar_bruta(con, tabela, headers, linhas)
+            self._gravar_indice(con)
+            self._tocar(con)
+
+    # ---------------------------------------------------------------- rescisões
+    def revisao_rescisoes(self):
+        with self._conn() as con:
+            return self._meta(con, "revisao", 0)
+
+    def _select_rescisoes(self, con):
+        cols = [c for c in self._colunas(con, "rescisoes") if not c.startswith("_")]
+        saida = []
+        for c in cols:
+            if c in COLUNAS_DATA:
+                # volta para dd/mm/aaaa, o formato que normalizar_rescisoes espera
+                saida.append(f"CASE WHEN {_q(c)} <> '' THEN substr({_q(c)},9,2)||'/'||substr({_q(c)},6,2)||'/'||substr({_q(c)},1,4) "
+                             f"ELSE '' END AS {_q(c)}")
+            else:
+                saida.append(_q(c))
+        return ", ".join(saida)
+
+    def listar_rescisoes(self, filtro=None):
+        where, params = [], []
+        tabelas = TABELAS_RESCISOES[:1]
+        if filtro is not None:
+            col = filtro.coluna_pendente
+            if col in DERIVADAS_STATUS:
+                where.append(f"{DERIVADAS_STATUS[col]} = 0")
+            if filtro.campo_data in COLUNAS_DATA:
+                where.append(f"{_q(filtro.campo_data)} BETWEEN ? AND ?")
+                params += [filtro.de.isoformat(), filtro.ate.isoformat()]
+            for palavra in normalizar_termo(filtro.busca).split():
+                esc = palavra.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                where.append("_BUSCA LIKE ? ESCAPE '\\'")
+                params.append(f"%{esc}%")
+            if filtro.solicitantes:
+                where.append(f"SOLICITANTE IN ({', '.join('?' * len(filtro.solicitantes))})")
+                params += list(filtro.solicitantes)
+            if filtro.arquivo or filtro.campo_data in COLUNAS_DATA:
+                tabelas = TABELAS_RESCISOES
+        with self._conn() as con:
+            select = self._select_rescisoes(con)
+            partes = [f"SELECT {select} FROM {t}" + (" WHERE " + " AND ".join(where) if where else "") for t in tabelas]
+            df = pd.read_sql_query(" UNION ALL ".join(partes) + " ORDER BY ID", con, params=params * len(tabelas))
+        return normalizar_rescisoes(converter_numericas(df))
+
+    def listar_solicitantes(self):
+        # só as ativas: o catálogo acompanha o trabalho em aberto
+        with self._conn() as con:
+            revisao = self._meta(con, "revisao", 0)
+            return self.solicitantes.obter(
+                revisao, lambda: [r[0] for r in con.execute("SELECT DISTINCT SOLICITANTE FROM rescisoes")])
+
+    def _inserir_rescisoes(self, con, registros, tabela="rescisoes"):
+        if not registros:
+            return
+        df = _preparar_rescisoes(pd.DataFrame(registros).fillna(""))
+        for t in TABELAS_RESCISOES:  # mesmas colunas nas duas: a listagem faz UNION ALL
+            self._garantir_colunas(con, t, [c for c in df.columns if c != "ID"])
+        cols = list(df.columns)
+        con.executemany(
+            f"INSERT INTO {tabela} ({', '.join(map(_q, cols))}) VALUES ({', '.join('?' * len(cols))})",
+            df.astype(object).values.tolist(),
+        )
+
+    def anexar_rescisoes(self, registros):
+        with self._lock, self._conn() as con:
+            con.execute("BEGIN IMMEDIATE")  # trava escrita: ninguém pega o mesmo ID
+            maior = max(con.execute(f"SELECT COALESCE(MAX(ID), 0) FROM {t}").fetchone()[0] for t in TABELAS_RESCISOES)
+            ids = list(range(maior + 1, maior + 1 + len(registros)))
+            self._inserir_rescisoes(con, [dict(r, ID=i) for r, i in zip(registros, ids)])
+            revisao = self._meta(con, "revisao", 0)
+            self._tocar(con)
+        self.solicitantes.adicionar((r.get('SOLICITANTE') for r in registros), de=revisao, para=revisao + 1)
+        return ids
+
+    def gravar_edicoes(self, alteracoes, excluir_ids=()):
+        faltando = []
+        with self._lock, self._conn() as con:
+            con.execute("BEGIN IMMEDIATE")
+            cols = [c for c in self._colunas(con, "rescisoes") if not c.startswith("_")]
+            con.row_factory = sqlite3.Row
+            select = self._select_rescisoes(con)
+            for id_, mudancas in alteracoes.items():
+                # ativa ou arquivada (a listagem com filtro de data mostra as duas)
+                for tabela in TABELAS_RESCISOES:
+                    row = con.execute(f"SELECT {select} FROM {tabela} WHERE ID = ?", (int(id_),)).fetchone()
+                    if row is not None:
+                        break
+                else:
+                    faltando.append(id_)
+                    continue
+                registro = dict(row)
+                registro.update({c: v for c, v in mudancas.items() if c in cols})
+                novo = _preparar_rescisoes(pd.DataFrame([registro])).iloc[0]
+                sets = [c for c in novo.index if c != "ID"]
+                con.execute(f"UPDATE {tabela} SET {', '.join(f'{_q(c)} = ?' for c in sets)} WHERE ID = ?",
+                            [novo[c].item() if hasattr(novo[c], "item") else novo[c] for c in sets] + [int(id_)])
+            con.row_factory = None
+            if excluir_ids:
+                existentes = set()
+                for tabela in TABELAS_RESCISOES:
+                    achados = {r[0] for r in con.execute(
+                        f"SELECT ID FROM {tabela} WHERE ID IN ({', '.join('?' * len(excluir_ids))})", [int(i) for i in excluir_ids])}
+                    con.executemany(f"DELETE FROM {tabela} WHERE ID = ?", [(i,) for i in achados])
+                    existentes |= achados
+                faltando += [i for i in excluir_ids if int(i) not in existentes]
+            self._tocar(con)
+        return faltando
+
+    def arquivar_rescisoes(self, hoje=None, dias=None):
+        dias = DIAS_ARQUIVAMENTO if dias is None else dias
+        with self._lock, self._conn() as con:
+            con.execute("BEGIN IMMEDIATE")
+            cols = self._colunas(con, "rescisoes")
+            status = [c for c in ("ID", "DATA_DEMISSAO", "DATA_PAGAMENTO", "CALCULO_REALIZADO", "DOC_ENVIADO", "BAIXA_PAGAMENTO") if c in cols]
+            df = pd.read_sql_query(f"SELECT {', '.join(map(_q, status))} FROM rescisoes", con)
+            sel = df[mascara_arquivavel(df, hoje, dias)]
+            if sel.empty:
+                return {}
+            self._garantir_colunas(con, "rescisoes_arquivo", cols)
+            lista = ", ".join(map(_q, cols))
+            ids = [int(i) for i in sel["ID"]]
+            for ini in range(0, len(ids), LOTE_IN):
+                lote = ids[ini:ini + LOTE_IN]
+                marc = ", ".join("?" * len(lote))
+                con.execute(f"INSERT INTO rescisoes_arquivo ({lista}) SELECT {lista} FROM rescisoes WHERE ID IN ({marc})", lote)
+                con.execute(f"DELETE FROM rescisoes WHERE ID IN ({marc})", lote)
+            self._tocar(con)
+        self.solicitantes.invalidar()
+        return {int(ano): int(n) for ano, n in anos_particao(sel).value_counts().sort_index().items()}
+
+    def resumo_arquivo(self):
+        with self._conn() as con:
+            return {int(ano): n for ano, n in con.execute(
+                "SELECT substr(DATA_DEMISSAO, 1, 4), COUNT(*) FROM rescisoes_arquivo GROUP BY 1 ORDER BY 1") if ano}
+
+    # ------------------------------------------------------------------- bases
+    def ler_bases(self):
+        with self._conn() as con:
+            return (
+                normalizar_funcionarios(self._ler_bruta(con, "base_funcionarios")),
+                normalizar_consignados(self._ler_bruta(con, "base_consignados")),
+                normalizar_recesso(self._ler_bruta(con, "base_recesso")),
+            )
+
+    def _gravar_indice(self, con):
+        frames = []
+        for tabela, normalizar in (("base_funcionarios", normalizar_funcionarios),
+                                   ("base_consignados", normalizar_consignados),
+                                   ("base_recesso", normalizar_recesso)):
+            df = self._ler_bruta(con, tabela) if self._existe(con, tabela) else pd.DataFrame()
+            frames.append(normalizar(df) if len(df) else pd.DataFrame())
+        idx, _ = montar_indice_bases(*frames)
+        con.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES ('versao_indice', ?)", (json.dumps(VERSAO_INDICE),))
+        con.execute("DROP TABLE IF EXISTS indice_bases")
+        con.execute("CREATE TABLE indice_bases (MATRICULA TEXT PRIMARY KEY, NOME TEXT, LOCACAO TEXT, CPF TEXT, "
+                    "PCD TEXT, VALOR_CONSIGNADO REAL, DIAS_RECESSO INTEGER, PERIODO_RECESSO TEXT)")
+        con.executemany(
+            f"INSERT INTO indice_bases VALUES ({', '.join('?' * (len(COLUNAS_INDICE) + 1))})",
+            ([m] + [idx.at[m, c] if c not in ('VALOR_CONSIGNADO', 'DIAS_RECESSO') else idx.at[m, c].item()
+                    for c in COLUNAS_INDICE] for m in idx.index),
+        )
+
+    def _consultar_indice(self, con, chaves):
+        partes = []
+        for i in range(0, len(chaves), LOTE_IN):
+            lote = chaves[i:i + LOTE_IN]
+            partes.append(pd.read_sql_query(
+                f"SELECT * FROM indice_bases WHERE MATRICULA IN ({', '.join('?' * len(lote))})", con, params=lote))
+        df = pd.concat(partes) if partes else pd.DataFrame(columns=["MATRICULA"] + COLUNAS_INDICE)
+        return df.set_index("MATRICULA")
+
+    def buscar_dados(self, matricula):
+        with self._conn() as con:
+            row = con.execute(f"SELECT {', '.join(COLUNAS_INDICE)} FROM indice_bases WHERE MATRICULA = ?",
+                              (chave_matricula(matricula),)).fetchone()
+        if row is None:
+            return REGISTRO_NAO_ENCONTRADO
+        nm, lc, cpf, pcd, vc, dr, pr = row
+        return nm, lc, cpf, pcd, float(vc), int(dr), pr
+
+    def buscar_dados_lote(self, matriculas):
+        chaves = sorted({chave_matricula(m) for m in matriculas} - {""})
+        with self._conn() as con:
+            idx = self._consultar_indice(con, chaves)
+        return consultar_lote(idx, matriculas)
+
+    def preparar_atualizacao_base(self, blocos, atualizar_existentes=True, carimbo=""):
+        with self._conn() as con:
+            df = self._ler_bruta(con, "base_funcionarios")
+        valores = [list(df.columns)] + df.astype(str).values.tolist()
+        return calcular_diff(valores, blocos, atualizar_existentes, carimbo)
+
+    def aplicar_atualizacao_base(self, diff):
+        with self._lock, self._conn() as con:
+            con.execute("BEGIN IMMEDIATE")
+            self._garantir_colunas(con, "base_funcionarios", diff.headers)
+            cols = ", ".join(f"{_q(h)} = ?" for h in diff.headers)
+            con.executemany(f"UPDATE base_funcionarios SET {cols} WHERE _LINHA = ?",
+                            (diff._completar(v) + [n] for n, v in diff.atualizadas.items()))
+            prox = con.execute("SELECT COALESCE(MAX(_LINHA), 1) FROM base_funcionarios").fetchone()[0] + 1
+            con.executemany(
+                f"INSERT INTO base_funcionarios (_LINHA, {', '.join(map(_q, diff.headers))}) "
+                f"VALUES ({', '.join('?' * (len(diff.headers) + 1))})",
+                ([prox + n] + diff._completar(v) for n, v in enumerate(diff.inseridas.values())),
+            )
+            self._gravar_indice(con)
+        return 1
+
+    # ----------------------------------------------------------------- usuários
+    def listar_usuarios(self):
+        with self._conn() as con:
+            return self._ler_bruta(con, "usuarios")
+
+    def buscar_usuario(self, usuario):
+        with self._conn() as con:
+            con.row_factory = sqlite3.Row
+            row = con.execute("SELECT * FROM usuarios WHERE USUARIO = ?", (str(usuario),)).fetchone()
+        if row is None:
+            return None
+        d = dict(row)
+        d.pop("_LINHA", None)
+        return d
+
+    def criar_usuario(self, usuario, senha):
+        with self._lock, self._conn() as con:
+            prox = con.execute("SELECT COALESCE(MAX(_LINHA), 1) FROM usuarios").fetchone()[0] + 1
+            con.execute("INSERT INTO usuarios (_LINHA, USUARIO, SENHA) VALUES (?, ?, ?)", (prox, usuario, senha))
+
+    def atualizar_senha(self, usuario, senha):
+        with self._lock, self._conn() as con:
+            con.execute("UPDATE usuarios SET SENHA = ? WHERE USUARIO = ?", (senha, str(usuario)))
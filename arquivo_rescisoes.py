@@ -0,0 +1,247 @@
+"""Arquivo das rescisões encerradas, em partições por ano.
+
+A aba "rescisões" só cresce, e a listagem, a alocação de ID e o catálogo de
+solicitantes passavam por ela inteira. O arquivamento move para partições por
+ano de DATA_DEMISSAO as linhas encerradas (cálculo, documentação e pagamento
+feitos) cuja data de referência (DATA_PAGAMENTO, ou DATA_DEMISSAO) tem mais
+de DIAS_ARQUIVAMENTO dias:
+
+- Google Sheets: uma aba "rescisões AAAA" por ano + a aba de catálogo
+  "rescisões_arquivo" (linhas, maior ID e faixa de datas de cada partição).
+  Partição lida fica em Parquet local, válida enquanto a VERSAO do catálogo
+  não muda;
+- SQLite: tabela rescisoes_arquivo (mesmas colunas, datas indexadas).
+
+A listagem padrão lê só as ativas. Com filtro de data entram apenas as
+partições cuja faixa de datas cruza o período; "Incluir arquivadas" lê todas.
+"""
+import glob
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+
+import pandas as pd
+
+from espelho_rescisoes import ABA_RESCISOES
+from normalizacao import COLUNAS_DATA, datas_de_texto, interpretar_booleanos
+
+DIAS_ARQUIVAMENTO = int(os.environ.get("DP_ARQUIVAR_APOS_DIAS", "365"))
+ABA_CATALOGO = "rescisões_arquivo"
+DIR_ARQUIVO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "arquivo_rescisoes")
+
+# colunas que precisam estar "feitas" para a rescisão estar encerrada
+COLUNAS_ENCERRAMENTO = ['CALCULO_REALIZADO', 'DOC_ENVIADO', 'BAIXA_PAGAMENTO']
+
+COLUNAS_CATALOGO = ['ANO', 'LINHAS', 'ID_MAX', 'DEMISSAO_MIN', 'DEMISSAO_MAX', 'PAGAMENTO_MIN', 'PAGAMENTO_MAX', 'VERSAO']
+Particao = namedtuple("Particao", ['ano', 'linhas', 'id_max', 'demissao_min', 'demissao_max',
+                                   'pagamento_min', 'pagamento_max', 'versao'])
+
+
+def aba_do_ano(ano):
+    return f"{ABA_RESCISOES} {ano}"
+
+def _quadro(valores):
+    """get_all_values -> DataFrame de texto com o cabeçalho normalizado."""
+    cab = [str(h).upper().strip() for h in (valores[0] if valores else [])]
+    return pd.DataFrame([(list(r) + [""] * len(cab))[:len(cab)] for r in valores[1:]], columns=cab, dtype=object)
+
+
+# ==============================================================================
+# SELEÇÃO
+# ==============================================================================
+def encerradas(df):
+    """Máscara das linhas (texto cru) com cálculo, documentação e pagamento feitos."""
+    mascara = pd.Series(True, index=df.index)
+    for col in COLUNAS_ENCERRAMENTO:
+        if col not in df.columns:
+            return pd.Series(False, index=df.index)
+        mascara &= interpretar_booleanos(df[col])
+    return mascara
+
+def mascara_arquivavel(df, hoje=None, dias=DIAS_ARQUIVAMENTO):
+    """Encerradas, com DATA_DEMISSAO válida e data de referência anterior a hoje - `dias`."""
+    if df.empty or 'DATA_DEMISSAO' not in df.columns:
+        return pd.Series(False, index=df.index)
+    limite = pd.Timestamp((hoje or date.today()) - timedelta(days=dias))
+    dem = datas_de_texto(df['DATA_DEMISSAO'])
+    ref = datas_de_texto(df['DATA_PAGAMENTO']).fillna(dem) if 'DATA_PAGAMENTO' in df.columns else dem
+    return encerradas(df) & dem.notna() & (ref < limite)
+
+def anos_particao(df):
+    return datas_de_texto(df['DATA_DEMISSAO']).dt.year.astype(int)
+
+
+# ==============================================================================
+# CATÁLOGO
+# ==============================================================================
+def _min_max(serie, atual_min="", atual_max=""):
+    d = datas_de_texto(serie).dropna().dt.strftime('%Y-%m-%d')
+    valores = [v for v in (list(d) + [atual_min, atual_max]) if v]
+    return (min(valores), max(valores)) if valores else ("", "")
+
+def resumir_particao(ano, df, anterior=None):
+    """Particao de `ano` somando as linhas de `df` (texto cru) à `anterior`."""
+    ids = pd.to_numeric(df['ID'], errors='coerce').dropna() if 'ID' in df.columns else pd.Series(dtype=float)
+    a = anterior or Particao(ano, 0, 0, "", "", "", "", "")
+    dem = _min_max(df['DATA_DEMISSAO'], a.demissao_min, a.demissao_max)
+    pag = _min_max(df['DATA_PAGAMENTO'], a.pagamento_min, a.pagamento_max) if 'DATA_PAGAMENTO' in df.columns \
+        else (a.pagamento_min, a.pagamento_max)
+    return Particao(int(ano), a.linhas + len(df), max([a.id_max] + [int(i) for i in ids]), *dem, *pag,
+                    str(time.time()))
+
+def particoes_do_filtro(particoes, filtro):
+    """Anos arquivados que a listagem com `filtro` precisa ler."""
+    if filtro is None:
+        return []
+    if getattr(filtro, 'arquivo', False):
+        return sorted(particoes)
+    if filtro.campo_data not in COLUNAS_DATA:
+        return []
+    de, ate = filtro.de.isoformat(), filtro.ate.isoformat()
+    anos = []
+    for ano, p in sorted(particoes.items()):
+        ini, fim = (p.demissao_min, p.demissao_max) if filtro.campo_data == 'DATA_DEMISSAO' \
+            else (p.pagamento_min, p.pagamento_max)
+        if ini and ini <= ate and fim >= de:
+            anos.append(ano)
+    return anos
+
+def catalogo_de_valores(valores):
+    """{ano: Particao} a partir da aba de catálogo (get_all_values)."""
+    if not valores:
+        return {}
+    cab = [str(h).upper().strip() for h in valores[0]]
+    particoes = {}
+    for linha in valores[1:]:
+        r = dict(zip(cab, linha))
+        if not str(r.get('ANO', '')).strip().isdigit():
+            continue
+        p = Particao(int(r['ANO']), int(r.get('LINHAS') or 0), int(r.get('ID_MAX') or 0),
+                     r.get('DEMISSAO_MIN', ''), r.get('DEMISSAO_MAX', ''),
+                     r.get('PAGAMENTO_MIN', ''), r.get('PAGAMENTO_MAX', ''), r.get('VERSAO', ''))
+        particoes[p.ano] = p
+    return particoes
+
+def valores_do_catalogo(particoes):
+    return [COLUNAS_CATALOGO] + [[str(v) for v in particoes[ano]] for ano in sorted(particoes)]
+
+
+# ==============================================================================
+# GOOGLE SHEETS
+# ==============================================================================
+class ArquivoGSheets:
+    """Catálogo e partições arquivadas da planilha; partições lidas ficam em Parquet local."""
+
+    def __init__(self, diretorio=DIR_ARQUIVO):
+        self.diretorio = diretorio
+        self._lock = threading.Lock()
+        self._catalogo = None  # (revisão do espelho, {ano: Particao})
+
+    def invalidar(self):
+        self._catalogo = None
+
+    def catalogo(self, sh, revisao):
+        """{ano: Particao}, relido só quando a revisão do espelho muda (qualquer escrita na planilha).
+
+        Sem conseguir reler, segue com o último catálogo lido.
+        """
+        with self._lock:
+            if self._catalogo is None or self._catalogo[0] != revisao:
+                try:
+                    self._catalogo = (revisao, self._ler_catalogo(sh))
+                except Exception:
+                    if self._catalogo is None:
+                        raise
+            return self._catalogo[1]
+
+    @staticmethod
+    def _titulos(sh):
+        return {ws.title: ws for ws in sh.worksheets()}
+
+    def _ler_catalogo(self, sh, abas=None):
+        abas = abas if abas is not None else self._titulos(sh)
+        if ABA_CATALOGO not in abas:
+            return {}
+        return catalogo_de_valores(abas[ABA_CATALOGO].get_all_values())
+
+    def _gravar_catalogo(self, sh, abas, particoes):
+        ws = abas.get(ABA_CATALOGO) or sh.add_worksheet(ABA_CATALOGO, rows=len(particoes) + 1, cols=len(COLUNAS_CATALOGO))
+        ws.update(valores_do_catalogo(particoes), "A1", value_input_option="RAW")
+        self.invalidar()
+
+    # ------------------------------------------------------------------ leitura
+    def _arquivo_local(self, particao):
+        return os.path.join(self.diretorio, f"{particao.ano}_{particao.versao.replace('.', '_')}.parquet")
+
+    def ler(self, sh, particao):
+        """Texto cru da partição: Parquet local se a versão bate, senão a aba do ano."""
+        caminho = self._arquivo_local(particao)
+        if os.path.exists(caminho):
+            return pd.read_parquet(caminho)
+        df = _quadro(sh.worksheet(aba_do_ano(particao.ano)).get_all_values())
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            for antigo in glob.glob(os.path.join(self.diretorio, f"{particao.ano}_*.parquet")):
+                os.remove(antigo)
+            df.to_parquet(caminho, index=False)
+        except OSError:
+            pass  # sem disco gravável: lê da planilha da próxima vez
+        return df
+
+    # ------------------------------------------------------------- escrita
+    def arquivar(self, sh, hoje=None, dias=DIAS_ARQUIVAMENTO):
+        """Copia as arquiváveis para as abas por ano e as apaga da aba principal.
+
+        Retorna {ano: linhas movidas}. Idempotente: ID que já está na aba do
+        ano não é copiado de novo (uma execução interrompida só completa a exclusão).
+        """
+        from escrita_rescisoes import garantir_colunas_no_sheet, gravar_edicoes
+
+        ws = sh.worksheet(ABA_RESCISOES)
+        df = _quadro(ws.get_all_values())
+        headers = list(df.columns)
+        if "ID" not in headers:
+            return {}
+        sel = df[mascara_arquivavel(df, hoje, dias)]
+        if sel.empty:
+            return {}
+
+        abas = self._titulos(sh)
+        particoes = self._ler_catalogo(sh, abas)
+        movidas = {}
+        for ano, parte in sel.groupby(anos_particao(sel)):
+            titulo = aba_do_ano(ano)
+            if titulo in abas:
+                wa = abas[titulo]
+                cab = garantir_colunas_no_sheet(wa, headers)
+                ja_arquivados = set(wa.col_values(cab.index("ID") + 1)[1:])
+                linhas = []
+            else:
+                wa = abas[titulo] = sh.add_worksheet(titulo, rows=len(parte) + 1, cols=len(headers))
+                cab, ja_arquivados, linhas = headers, set(), [headers]
+            novas = parte[~parte["ID"].isin(ja_arquivados)]
+            linhas += novas.reindex(columns=cab, fill_value="").values.tolist()
+            if linhas:
+                wa.append_rows(linhas, value_input_option="RAW", table_range="A1")
+            particoes[int(ano)] = resumir_particao(ano, novas, particoes.get(int(ano)))
+            movidas[int(ano)] = len(parte)
+
+        # catálogo antes da exclusão: se parar no meio, as linhas estão nos dois lugares, nunca em nenhum
+        self._gravar_catalogo(sh, abas, particoes)
+        gravar_edicoes(ws, {}, sel["ID"].tolist(), headers)
+        return movidas
+
+    def gravar_edicoes(self, sh, ano, alteracoes, excluir_ids=()):
+        """Edição de linhas arquivadas direto na aba do ano; refaz a entrada do catálogo."""
+        from escrita_rescisoes import gravar_edicoes
+
+        abas = self._titulos(sh)
+        wa = abas[aba_do_ano(ano)]
+        faltando = gravar_edicoes(wa, alteracoes, excluir_ids)
+        df = _quadro(wa.get_all_values())
+        particoes = self._ler_catalogo(sh, abas)
+        particoes[int(ano)] = resumir_particao(ano, df)
+        self._gravar_catalogo(sh, abas, particoes)
+        return faltando
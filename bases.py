@@ -0,0 +1,333 @@
+"""Bases de consulta (funcionários, consignados, recesso).
+
+Leitura (as três abas em paralelo) + normalização, índice por MATRICULA e um snapshot em
+disco (Parquet, colunas tipadas) gravado a cada carga bem-sucedida. Uma sessão
+ou processo novo começa do snapshot (disco local) e a atualização a partir do
+Sheets roda em segundo plano, sem segurar a primeira tela.
+
+Os dados publicados (DadosBases) são compartilhados por todas as sessões do
+processo sem cópia: quem consome só lê. Cada carga publica uma nova versão em
+vez de alterar a anterior.
+"""
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+import pandas as pd
+from gspread.exceptions import WorksheetNotFound
+
+from normalizacao import chaves_matriculas, extrair_dias, limpar_matricula, limpar_matriculas, norm_cols_upper
+
+ABA_FUNCIONARIOS = "base_funcionarios"
+ABA_CONSIGNADOS = "base_consignados"
+ABA_RECESSO = "base_recesso"
+ABAS = (ABA_FUNCIONARIOS, ABA_CONSIGNADOS, ABA_RECESSO)
+
+DIR_SNAPSHOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshot_bases")
+ARQUIVOS_SNAPSHOT = ("funcionarios.parquet", "consignados.parquet", "recesso.parquet")
+TTL_BASES = 60  # segundos até disparar uma atualização em segundo plano
+
+# poucos valores distintos repetidos em milhares de linhas: category guarda cada texto uma vez
+COLUNAS_CATEGORICAS = ['CENTRO_CUSTO', 'LOCACAO', 'PCD']
+
+
+# ==============================================================================
+# LEITURA / NORMALIZAÇÃO
+# ==============================================================================
+def compactar(df):
+    """Colunas repetitivas como category (in-place)."""
+    for col in COLUNAS_CATEGORICAS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+def normalizar_funcionarios(df_f):
+    if df_f.empty:
+        return df_f
+    df_f = norm_cols_upper(df_f)
+    if 'MATRICULA' in df_f.columns:
+        df_f['MATRICULA'] = limpar_matriculas(df_f['MATRICULA'])
+    if 'CPF' not in df_f.columns: df_f['CPF'] = ""
+    if 'PCD' not in df_f.columns: df_f['PCD'] = "NÃO"
+    # opcional: coluna para controle de atualização
+    if 'ATUALIZADO_EM' not in df_f.columns: df_f['ATUALIZADO_EM'] = ""
+    # get_all_records mistura int/str na mesma coluna; texto uniforme é o que vai para a tela/planilha
+    for col in df_f.columns:
+        if df_f[col].dtype == object:
+            df_f[col] = df_f[col].astype(str)
+    return compactar(df_f)
+
+def normalizar_consignados(df_c):
+    if df_c.empty:
+        return df_c
+    df_c = norm_cols_upper(df_c)
+    if 'MATRICULA' in df_c.columns:
+        df_c['MATRICULA'] = limpar_matriculas(df_c['MATRICULA'])
+    if 'VALOR' in df_c.columns:
+        df_c['VALOR'] = pd.to_numeric(df_c['VALOR'], errors='coerce').fillna(0)
+    return df_c.groupby('MATRICULA')['VALOR'].sum().reset_index()
+
+def normalizar_recesso(df_r):
+    if df_r.empty:
+        return df_r
+    df_r = norm_cols_upper(df_r)
+    if 'MATRICULA' in df_r.columns:
+        df_r['MATRICULA'] = limpar_matriculas(df_r['MATRICULA'])
+    if 'DIAS' in df_r.columns:
+        df_r['DIAS'] = extrair_dias(df_r['DIAS']).astype('int16')
+    for col in ['PER_INI', 'PER_FIM']:
+        if col in df_r.columns:
+            df_r[col] = pd.to_datetime(df_r[col], errors='coerce')
+    df_r = df_r.drop_duplicates(subset=['MATRICULA'])
+    for col in df_r.columns:
+        if df_r[col].dtype == object:
+            df_r[col] = df_r[col].astype(str)
+    return df_r
+
+def _ler_aba(sh, nome):
+    """(DataFrame, segundos, erro) de uma aba; com erro o DataFrame vem vazio.
+
+    Aba inexistente não é erro: é uma base vazia (ex.: planilha sem base_recesso).
+    """
+    t0 = time.perf_counter()
+    try:
+        df, erro = pd.DataFrame(sh.worksheet(nome).get_all_records()), None
+    except WorksheetNotFound:
+        df, erro = pd.DataFrame(), None
+    except Exception as e:
+        df, erro = pd.DataFrame(), e
+    return df, time.perf_counter() - t0, erro
+
+def ler_bases(sh, tempos=None, erros=None):
+    """Lê (em paralelo) e normaliza as três abas. Aba vazia/inexistente vira DataFrame vazio.
+
+    `tempos`/`erros`, se passados, recebem segundos e exceção por aba (+ 'total').
+    """
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(ABAS), thread_name_prefix="le-base") as ex:
+        lidas = dict(zip(ABAS, ex.map(lambda nome: _ler_aba(sh, nome), ABAS)))
+
+    for nome, (_, seg, erro) in lidas.items():
+        if tempos is not None:
+            tempos[nome] = seg
+        if erros is not None and erro is not None:
+            erros[nome] = erro
+
+    df_f = normalizar_funcionarios(lidas[ABA_FUNCIONARIOS][0])
+    df_c = normalizar_consignados(lidas[ABA_CONSIGNADOS][0])
+    df_r = normalizar_recesso(lidas[ABA_RECESSO][0])
+    if tempos is not None:
+        tempos["total"] = time.perf_counter() - t0
+    return df_f, df_c, df_r
+
+
+# ==============================================================================
+# ÍNDICE POR MATRÍCULA
+# ==============================================================================
+# Registro devolvido quando a matrícula não está em nenhuma base
+REGISTRO_NAO_ENCONTRADO = ("NOME MANUAL", "-", "", "NÃO", 0.0, 0, "-")
+COLUNAS_INDICE = ['NOME', 'LOCACAO', 'CPF', 'PCD', 'VALOR_CONSIGNADO', 'DIAS_RECESSO', 'PERIODO_RECESSO']
+
+def _por_chave(df):
+    """Uma linha por chave_matricula (a primeira), com a chave na coluna MATRICULA."""
+    return df.assign(MATRICULA=chaves_matriculas(df['MATRICULA'])).drop_duplicates(subset=['MATRICULA'])
+
+def montar_indice_bases(df_f, df_c, df_r):
+    """Junta funcionários/consignados/recesso numa tabela indexada por chave_matricula.
+
+    Retorna (frame indexado, dict chave -> tupla no formato de buscar_dados).
+    """
+    padrao_nm, padrao_lc, padrao_cpf, padrao_pcd, padrao_vc, padrao_dr, padrao_pr = REGISTRO_NAO_ENCONTRADO
+    partes = []
+
+    if not df_f.empty and 'MATRICULA' in df_f.columns:
+        f = _por_chave(df_f)
+        # seu campo atual é CENTRO_CUSTO, mas tela chama LOCACAO
+        lc = f['CENTRO_CUSTO'] if 'CENTRO_CUSTO' in f.columns else f.get('LOCACAO', "-")
+        partes.append(pd.DataFrame({
+            'MATRICULA': f['MATRICULA'],
+            'NOME': f.get('NOME', "Sem Nome"),
+            'LOCACAO': lc,
+            'CPF': f.get('CPF', ""),
+            'PCD': f.get('PCD', "NÃO"),
+        }).set_index('MATRICULA'))
+
+    if not df_c.empty and 'MATRICULA' in df_c.columns:
+        c = _por_chave(df_c)
+        partes.append(pd.DataFrame({
+            'MATRICULA': c['MATRICULA'],
+            'VALOR_CONSIGNADO': pd.to_numeric(c.get('VALOR', 0), errors='coerce'),
+        }).set_index('MATRICULA'))
+
+    if not df_r.empty and 'MATRICULA' in df_r.columns:
+        r = _por_chave(df_r)
+        pr = pd.Series(padrao_pr, index=r.index, dtype=object)
+        if 'PER_INI' in r.columns and 'PER_FIM' in r.columns:
+            ok = r['PER_INI'].notna() & r['PER_FIM'].notna()
+            pr[ok] = r.loc[ok, 'PER_INI'].dt.strftime('%d/%m/%Y') + " a " + r.loc[ok, 'PER_FIM'].dt.strftime('%d/%m/%Y')
+        partes.append(pd.DataFrame({
+            'MATRICULA': r['MATRICULA'],
+            'DIAS_RECESSO': r.get('DIAS', 0),
+            'PERIODO_RECESSO': pr,
+        }).set_index('MATRICULA'))
+
+    idx = pd.concat(partes, axis=1, join='outer') if partes else pd.DataFrame()
+    idx = idx.reindex(columns=COLUNAS_INDICE)
+    idx = idx[idx.index.astype(str) != ""]
+    for col in idx.select_dtypes('category').columns:
+        idx[col] = idx[col].astype(object)
+    idx = idx.fillna({
+        'NOME': padrao_nm, 'LOCACAO': padrao_lc, 'CPF': padrao_cpf, 'PCD': padrao_pcd,
+        'VALOR_CONSIGNADO': padrao_vc, 'DIAS_RECESSO': padrao_dr, 'PERIODO_RECESSO': padrao_pr,
+    })
+    idx['VALOR_CONSIGNADO'] = idx['VALOR_CONSIGNADO'].astype(float)
+    idx['DIAS_RECESSO'] = pd.to_numeric(idx['DIAS_RECESSO'], errors='coerce').fillna(0).astype('int16')
+    idx['PERIODO_RECESSO'] = idx['PERIODO_RECESSO'].astype(str)
+    idx.index.name = 'MATRICULA'
+    compactar(idx)
+
+    lookup = {m: (nm, lc, cpf, pcd, float(vc), int(dr), pr) for m, nm, lc, cpf, pcd, vc, dr, pr in
+              zip(idx.index.tolist(), *(idx[c].tolist() for c in COLUNAS_INDICE))}
+    return idx, lookup
+
+def consultar_lote(idx, matriculas):
+    """Várias matrículas de uma vez contra o frame indexado (mesma ordem da entrada).
+
+    Retorna DataFrame com MATRICULA, COLUNAS_INDICE e ENCONTRADO (achou na base_funcionarios).
+    """
+    limpas = pd.Series([limpar_matricula(m) for m in matriculas], dtype=object)
+    res = idx.reindex(chaves_matriculas(limpas).tolist())
+    for col in res.select_dtypes('category').columns:
+        res[col] = res[col].astype(object)
+    res = res.fillna(dict(zip(COLUNAS_INDICE, REGISTRO_NAO_ENCONTRADO)))
+    res['DIAS_RECESSO'] = res['DIAS_RECESSO'].astype(int)
+    res['VALOR_CONSIGNADO'] = res['VALOR_CONSIGNADO'].astype(float)
+    res = res.reset_index(drop=True)
+    res.insert(0, 'MATRICULA', limpas.to_numpy())
+    res['ENCONTRADO'] = res['NOME'] != REGISTRO_NAO_ENCONTRADO[0]
+    return res
+
+
+# ==============================================================================
+# SNAPSHOT EM DISCO
+# ==============================================================================
+def salvar_snapshot(frames, diretorio=DIR_SNAPSHOT):
+    """Grava os três frames normalizados (escrita atômica: tmp + os.replace)."""
+    os.makedirs(diretorio, exist_ok=True)
+    for df, nome in zip(frames, ARQUIVOS_SNAPSHOT):
+        destino = os.path.join(diretorio, nome)
+        tmp = destino + ".tmp"
+        df.reset_index(drop=True).to_parquet(tmp, index=False)
+        os.replace(tmp, destino)
+    meta = os.path.join(diretorio, "meta.json")
+    with open(meta + ".tmp", "w") as f:
+        json.dump({"salvo_em": time.time()}, f)
+    os.replace(meta + ".tmp", meta)
+
+def carregar_snapshot(diretorio=DIR_SNAPSHOT):
+    """(frames, salvo_em) do último snapshot, ou (None, 0) se não houver um íntegro."""
+    try:
+        with open(os.path.join(diretorio, "meta.json")) as f:
+            salvo_em = json.load(f)["salvo_em"]
+        frames = tuple(pd.read_parquet(os.path.join(diretorio, nome)) for nome in ARQUIVOS_SNAPSHOT)
+        return frames, salvo_em
+    except Exception:
+        return None, 0
+
+
+# ==============================================================================
+# CARREGADOR (memória -> snapshot -> Sheets)
+# ==============================================================================
+# Versão publicada das bases. Imutável: uma recarga troca o objeto inteiro, então
+# quem pegou uma versão continua com dados coerentes até terminar o que fazia.
+# Os frames são compartilhados entre sessões: não modifique, copie antes.
+DadosBases = namedtuple("DadosBases", ["df_f", "df_c", "df_r", "idx", "lookup", "versao"])
+
+
+class BasesFuncionarios:
+    """Mantém as bases em memória; parte do snapshot e atualiza do Sheets em segundo plano.
+
+    `fonte` é uma função que devolve a planilha (gspread Spreadsheet).
+    """
+
+    def __init__(self, fonte, diretorio=DIR_SNAPSHOT, ttl=TTL_BASES):
+        self.fonte = fonte
+        self.diretorio = diretorio
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._dados = None       # DadosBases
+        self.atualizado_em = 0   # epoch dos dados em memória
+        self.origem = ""         # 'snapshot' ou 'sheets'
+        self.ultimo_erro = None
+        self.tempos = {}         # segundos por aba na última leitura do Sheets
+        self.erros_abas = {}     # aba -> exceção da última leitura (cota, rede)
+        self.abas_anteriores = set()  # abas com erro que seguiram com a versão anterior
+        self._thread = None
+
+    def obter(self):
+        """Dados atuais sem esperar rede, exceto na primeiríssima carga sem snapshot."""
+        if self._dados is None:
+            with self._lock:
+                if self._dados is None:
+                    frames, salvo_em = carregar_snapshot(self.diretorio)
+                    if frames is not None:
+                        self._publicar(frames, salvo_em, "snapshot")
+            if self._dados is None:
+                self.recarregar()
+                return self._dados
+        if time.time() - self.atualizado_em > self.ttl:
+            self.atualizar_em_segundo_plano()
+        return self._dados
+
+    def recarregar(self):
+        """Lê do Sheets agora (bloqueante), publica e grava o snapshot.
+
+        Aba que falhou (cota, rede) mantém a versão anterior em vez de virar vazia;
+        sem versão anterior e sem nenhuma aba lida, levanta o erro. Aba inexistente
+        é base vazia, não erro.
+        """
+        tempos, erros = {}, {}
+        frames = ler_bases(self.fonte(), tempos, erros)
+        self.tempos, self.erros_abas, self.abas_anteriores = tempos, erros, set()
+        if erros:
+            if self._dados is not None:
+                anteriores = dict(zip(ABAS, self._dados[:3]))
+                frames = tuple(anteriores[aba] if aba in erros else df for aba, df in zip(ABAS, frames))
+                self.abas_anteriores = set(erros)
+            elif len(erros) == len(ABAS):
+                raise next(iter(erros.values()))
+        with self._lock:
+            self._publicar(frames, time.time(), "sheets")
+        if erros:
+            return self._dados  # snapshot só com leitura completa
+        try:
+            salvar_snapshot(frames, self.diretorio)
+        except Exception as e:
+            # sem disco gravável o app segue funcionando, só sem partida rápida
+            self.ultimo_erro = e
+        return self._dados
+
+    def atualizar_em_segundo_plano(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._atualizar, name="atualiza-bases", daemon=True)
+        self._thread.start()
+
+    def _atualizar(self):
+        try:
+            self.recarregar()
+            self.ultimo_erro = None
+        except Exception as e:
+            self.ultimo_erro = e
+
+    def _publicar(self, frames, quando, origem):
+        df_f, df_c, df_r = (compactar(df) for df in frames)
+        idx, lookup = montar_indice_bases(df_f, df_c, df_r)
+        versao = self._dados.versao + 1 if self._dados is not None else 1
+        self._dados = DadosBases(df_f, df_c, df_r, idx, MappingProxyType(lookup), versao)
+        self.atualizado_em = quando
+        self.origem = origem
@@ -0,0 +1,136 @@
+"""Benchmark do app inteiro contra a planilha falsa (sem rede, sem Streamlit).
+
+Uso (na raiz do repo):
+    python -m benchmarks.bench_app [--linhas 1000,20000] [--latencia-ms 0]
+
+Para cada tamanho de base (funcionários; rescisões = 1/4 disso) roda os
+cenários abaixo com o backend Google Sheets (GSheetsArmazenamento, o mesmo
+objeto que o app usa) e mostra tempo e nº de chamadas à API por cenário.
+--latencia-ms simula o tempo de ida e volta de cada requisição.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date
+
+import pandas as pd
+
+from armazenamento import FiltroRescisoes
+from armazenamento_gsheets import GSheetsArmazenamento
+from arquivo_rescisoes import ArquivoGSheets
+from bases import REGISTRO_NAO_ENCONTRADO, BasesFuncionarios
+from benchmarks.planilha_falsa import criar_planilha
+from espelho_rescisoes import EspelhoRescisoes
+from usuarios import autenticar
+
+
+def medir(sh, func):
+    sh.zerar_contagem()
+    t0 = time.perf_counter()
+    func()
+    return time.perf_counter() - t0, sh.total_chamadas, dict(sh.chamadas)
+
+
+def cenarios(sh, dir_tmp, n):
+    """(nome, função) na ordem em que o app as executa; o estado passa de um para o outro."""
+    fonte = lambda: sh
+    dir_snap = os.path.join(dir_tmp, "snapshot")
+    arm = GSheetsArmazenamento(
+        fonte, espelho=EspelhoRescisoes(os.path.join(dir_tmp, "espelho.sqlite")),
+        bases=BasesFuncionarios(fonte, diretorio=dir_snap),
+        arquivo=ArquivoGSheets(os.path.join(dir_tmp, "arquivo")),
+    )
+    aba_f = sh._abas["base_funcionarios"].valores
+    mats = [linha[0] for linha in aba_f[1:]]
+    rnd = random.Random(1)
+    # matrículas como digitadas ('0101…'); o índice precisa achar todas, menos as 50 "999"
+    amostra = [rnd.choice(mats) for _ in range(1000)] + ["999"] * 50
+    hoje = date(2026, 1, 1)
+
+    def upload(numerica=False):
+        # 5% alteradas, 2% novas; numerica: matrícula como o xlsx lê célula numérica (sem o zero à esquerda)
+        linhas = [list(r) for r in rnd.sample(aba_f[1:], max(1, n // 20))]
+        for r in linhas:
+            r[2] = "CC999 - OBRA NOVA"
+            if numerica:
+                r[0] = str(int(r[0]))
+        prefixo = "0303" if numerica else "0202"
+        linhas += [[f"{prefixo}{i:08d}", "NOVO FUNCIONARIO", "CC001 - OBRA 1", "0", "NÃO", ""] for i in range(max(1, n // 50))]
+        return [pd.DataFrame(linhas, columns=aba_f[0]).astype(str)]
+
+    def buscar_um_a_um():
+        achadas = sum(arm.buscar_dados(m) != REGISTRO_NAO_ENCONTRADO for m in amostra)
+        assert achadas == 1000, f"buscar_dados achou {achadas} de 1000"
+
+    def buscar_lote():
+        achadas = int(arm.buscar_dados_lote(amostra)['ENCONTRADO'].sum())
+        assert achadas == 1000, f"buscar_dados_lote achou {achadas} de 1000"
+
+    def listagem():
+        arm.sincronizar_rescisoes()
+        for ate in range(1, 13):
+            arm.listar_rescisoes(FiltroRescisoes("Pendentes Doc", 'DATA_DEMISSAO', date(2024, 1, 1), date(2025, ate, 1)))
+        arm.listar_rescisoes(FiltroRescisoes(busca="silva"))
+        arm.listar_solicitantes()
+
+    def salvar():
+        for i in range(10):
+            arm.anexar_rescisoes([{"FLUIG": f"'9{i}", "MATRICULA": mats[i], "SOLICITANTE": "Bench",
+                                   "DATA_DEMISSAO": hoje.strftime("%d/%m/%Y"), "CALCULO_REALIZADO": "PENDENTE"}])
+
+    def editar():
+        arm.gravar_edicoes({i: {"CALCULO_REALIZADO": "CALCULADO"} for i in range(1, 21)}, [21, 22])
+
+    def listagem_periodo():
+        arm.sincronizar_rescisoes()
+        arm.listar_rescisoes(FiltroRescisoes(campo_data='DATA_DEMISSAO', de=date(2022, 3, 1), ate=date(2022, 6, 30)))
+
+    def atualizar_base(numerica=False):
+        blocos = upload(numerica)
+        diff = arm.preparar_atualizacao_base(blocos)
+        # só as 2% novas podem entrar; as alteradas precisam casar com a linha da aba
+        assert len(diff.inseridas) == max(1, n // 50), f"{len(diff.inseridas)} inseridas (matrícula não casou)"
+        arm.aplicar_atualizacao_base(diff)
+
+    return [
+        ("carregar_bases (Sheets)", lambda: arm.bases.recarregar()),
+        ("carregar_bases (snapshot)", lambda: BasesFuncionarios(fonte, diretorio=dir_snap).obter()),
+        ("buscar_dados x1050", buscar_um_a_um),
+        ("buscar_dados_lote 1050", buscar_lote),
+        ("listagem 1ª (sync completo)", listagem),
+        ("listagem rerun", listagem),
+        ("SALVAR x10", salvar),
+        ("listagem após SALVAR (delta)", lambda: (arm.espelho.marcar_desatualizado(), listagem())),
+        ("gravar edições (20 + 2 exclusões)", editar),
+        ("login x20 (1 certo, 19 errados)", lambda: [autenticar(arm, "dp", "123" if i == 0 else "x") for i in range(20)]),
+        ("Atualizar Base (7% do arquivo)", atualizar_base),
+        ("Atualizar Base (matrícula numérica)", lambda: atualizar_base(numerica=True)),
+        ("arquivar encerradas (> 1 ano)", lambda: arm.arquivar_rescisoes(hoje=hoje)),
+        ("listagem rerun (após arquivar)", lambda: (arm.espelho.marcar_desatualizado(), listagem())),
+        ("listagem 2022 (1 partição)", listagem_periodo),
+        ("listagem 2022 rerun", listagem_periodo),
+    ]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--linhas", default="1000,20000", help="tamanhos da base de funcionários, separados por vírgula")
+    ap.add_argument("--latencia-ms", type=float, default=0.0)
+    ap.add_argument("--detalhe", action="store_true", help="mostra as chamadas por método")
+    args = ap.parse_args()
+
+    for n in (int(x) for x in args.linhas.split(",")):
+        sh = criar_planilha(n, latencia=args.latencia_ms / 1000)
+        print(f"\nfuncionários: {n:,} · rescisões: {n // 4:,} · latência: {args.latencia_ms:g} ms/chamada")
+        with tempfile.TemporaryDirectory() as dir_tmp:
+            for nome, func in cenarios(sh, dir_tmp, n):
+                seg, total, chamadas = medir(sh, func)
+                print(f"  {nome:<36} {seg * 1000:10.1f} ms  {total:4d} chamada(s)")
+                if args.detalhe and chamadas:
+                    print("      " + ", ".join(f"{k}={v}" for k, v in sorted(chamadas.items())))
+
+
+if __name__ == "__main__":
+    main()
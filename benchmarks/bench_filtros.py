@@ -0,0 +1,76 @@
+"""Micro-benchmark: filtro da listagem com máscaras pandas (como era) x MotorFiltros (filtros.py).
+
+Uso (na raiz do repo):
+    python -m benchmarks.bench_filtros [--linhas 50000] [--repeticoes 5]
+
+Além do tempo, confere que os dois caminhos devolvem exatamente as mesmas linhas.
+"""
+import argparse
+import time
+from datetime import date
+
+import pandas as pd
+
+from armazenamento import FiltroRescisoes
+from benchmarks.planilha_falsa import gerar_abas
+from busca import filtrar_busca, montar_indice_busca
+from filtros import MotorFiltros
+from normalizacao import normalizar_rescisoes
+
+FILTROS = [
+    FiltroRescisoes(),
+    FiltroRescisoes("Pendentes Cálculo"),
+    FiltroRescisoes("Pendentes Pagto", 'DATA_DEMISSAO', date(2024, 1, 1), date(2024, 12, 31)),
+    FiltroRescisoes(campo_data='DATA_PAGAMENTO', de=date(2023, 3, 1), ate=date(2023, 6, 30)),
+    FiltroRescisoes(busca="silva"),
+    FiltroRescisoes("Pendentes Doc", busca="ana obra", solicitantes=["DP", "RH"]),
+]
+
+
+def como_era(df, filtro, indice_busca):
+    """Uma máscara pandas por critério, refeita a cada rerun (o antigo FiltroRescisoes.aplicar)."""
+    mascara = pd.Series(True, index=df.index)
+    col = filtro.coluna_pendente
+    if col and col in df.columns:
+        mascara &= df[col] == False
+    if filtro.campo_data and filtro.campo_data in df.columns:
+        d = df[filtro.campo_data]
+        mascara &= d.notna() & (d >= filtro.de) & (d <= filtro.ate)
+    if filtro.busca and indice_busca is not None:
+        mascara &= filtrar_busca(indice_busca, filtro.busca)
+    if filtro.solicitantes and "SOLICITANTE" in df.columns:
+        mascara &= df["SOLICITANTE"].astype(str).isin(filtro.solicitantes)
+    return df[mascara]
+
+
+def cronometrar(func, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        res = func()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor, res
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--linhas', type=int, default=50_000)
+    ap.add_argument('--repeticoes', type=int, default=5)
+    args = ap.parse_args()
+
+    valores = gerar_abas(args.linhas, args.linhas)["rescisões"]
+    df = normalizar_rescisoes(pd.DataFrame(valores[1:], columns=valores[0]))
+    indice = montar_indice_busca(df)
+    motor = MotorFiltros(df, indice)
+
+    print(f"linhas: {args.linhas:,}")
+    for filtro in FILTROS:
+        t_antes, r_antes = cronometrar(lambda: como_era(df, filtro, indice), args.repeticoes)
+        t_depois, r_depois = cronometrar(lambda: motor.filtrar(filtro), args.repeticoes)
+        assert r_antes.index.tolist() == r_depois.index.tolist(), f"divergência em {filtro.chave()}"
+        print(f"  {str(filtro.chave()[:5]):70.70}  pandas {t_antes * 1000:7.1f} ms"
+              f"  motor {t_depois * 1000:7.2f} ms  ({len(r_depois):,} linhas)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Micro-benchmark: normalização com .apply (como era) x vetorizada (normalizacao.py).
+
+Uso (na raiz do repo):
+    python -m benchmarks.bench_normalizacao [--linhas 100000] [--repeticoes 3]
+
+Além do tempo, confere que os dois caminhos produzem exatamente o mesmo resultado.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from normalizacao import (
+    TIPOS_BOOLEANOS, extrair_dias, formatar_para_texto, formatar_textos, interpretar_booleano,
+    interpretar_booleanos, limpar_matricula, limpar_matriculas,
+)
+
+TEXTOS = {
+    'CALCULO_REALIZADO': ["CALCULADO", "PENDENTE", "", "TRUE"],
+    'DOC_ENVIADO': ["ENVIADO", "PENDENTE", "FALSE"],
+    'BAIXA_PAGAMENTO': ["PAGO", "ABERTO", ""],
+    'FATURAMENTO': ["POSSUI FATURAMENTO", "NÃO", "Sim"],
+    'EXCLUIR': ["", "", "", "MARCADO"],
+}
+
+
+def gerar_rescisoes(n, seed=42):
+    rng = np.random.default_rng(seed)
+    mats = rng.integers(10_000, 99_999_999, n)
+    matricula = np.array([f"0101{m:08d}" for m in mats], dtype=object)
+    # parte das matrículas vem numérica do get_all_records (int/float)
+    matricula[::7] = mats[::7]
+    matricula[::11] = mats[::11].astype(float)
+    matricula[::97] = ""
+    df = pd.DataFrame({'ID': np.arange(1, n + 1), 'MATRICULA': matricula})
+    for col, opcoes in TEXTOS.items():
+        df[col] = rng.choice(np.array(opcoes, dtype=object), n)
+    df['DIAS'] = rng.choice(np.array(["12", "12,5", "30.0", "", "abc", 7], dtype=object), n)
+    return df
+
+
+def como_era(df):
+    out = {'MATRICULA': df['MATRICULA'].apply(limpar_matricula)}
+    for col in TEXTOS:
+        out[col] = df[col].apply(interpretar_booleano)
+    for col in TEXTOS:
+        if col != 'EXCLUIR':
+            out[col + '_TXT'] = out[col].apply(lambda x: formatar_para_texto(x, TIPOS_BOOLEANOS[col]))
+    dias = df['DIAS'].astype(object).astype(str).apply(lambda x: x.split(',')[0].split('.')[0])
+    out['DIAS'] = pd.to_numeric(dias, errors='coerce').fillna(0).astype(int)
+    return out
+
+
+def vetorizado(df):
+    out = {'MATRICULA': limpar_matriculas(df['MATRICULA'])}
+    for col in TEXTOS:
+        out[col] = interpretar_booleanos(df[col])
+    for col in TEXTOS:
+        if col != 'EXCLUIR':
+            out[col + '_TXT'] = formatar_textos(out[col], TIPOS_BOOLEANOS[col])
+    out['DIAS'] = extrair_dias(df['DIAS'])
+    return out
+
+
+def cronometrar(func, df, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        res = func(df)
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor, res
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--linhas', type=int, default=100_000)
+    ap.add_argument('--repeticoes', type=int, default=3)
+    args = ap.parse_args()
+
+    df = gerar_rescisoes(args.linhas)
+    t_antes, r_antes = cronometrar(como_era, df, args.repeticoes)
+    t_depois, r_depois = cronometrar(vetorizado, df, args.repeticoes)
+
+    for col in r_antes:
+        assert r_antes[col].tolist() == r_depois[col].tolist(), f"divergência em {col}"
+
+    print(f"linhas: {args.linhas:,}")
+    print(f"  .apply      {t_antes * 1000:9.1f} ms")
+    print(f"  vetorizado  {t_depois * 1000:9.1f} ms")
+    print(f"  speedup     {t_antes / t_depois:9.1f}x  (resultados idênticos)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+"""Planilha falsa (em memória) com a parte da API do gspread que o app usa.
+
+Serve para medir o app sem rede: cada chamada conta em `chamadas` e espera
+`latencia` segundos (latência sintética por requisição, como no Sheets).
+
+Células guardadas como texto (o que o Sheets devolve como valor formatado);
+get_all_records converte números como o gspread (numericise), inclusive
+perdendo zeros à esquerda de matrícula.
+
+    sh = criar_planilha(n_funcionarios=20000, n_rescisoes=5000, latencia=0.2)
+"""
+import re
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+import numpy as np
+from gspread.exceptions import WorksheetNotFound
+
+from armazenamento import COLUNAS_RESCISOES_MIN
+
+ARQUIVO_MODELO = "dados.xlsx"  # CPF, NOME, MATRICULA: só para tirar nomes e formato de matrícula
+
+_FAIXA = re.compile(r"^(?:'?(?P<aba>[^!']+)'?!)?\$?(?P<c1>[A-Z]*)\$?(?P<l1>\d*)(?::\$?(?P<c2>[A-Z]*)\$?(?P<l2>\d*))?$")
+
+
+def _col_num(letras):
+    n = 0
+    for ch in letras:
+        n = n * 26 + ord(ch) - 64
+    return n
+
+def _col_letra(n):
+    s = ""
+    while n:
+        n, r = divmod(n - 1, 26)
+        s = chr(65 + r) + s
+    return s
+
+def _numericise(v):
+    if v == "":
+        return ""
+    try:
+        return int(v)
+    except ValueError:
+        try:
+            return float(v)
+        except ValueError:
+            return v
+
+
+class AbaFalsa:
+    def __init__(self, planilha, titulo, valores, id_aba):
+        self.spreadsheet = planilha
+        self.title = titulo
+        self.id = id_aba
+        self.valores = [[str(v) for v in linha] for linha in valores]
+
+    def _chamar(self, nome):
+        self.spreadsheet._chamar(f"aba.{nome}")
+
+    # --------------------------------------------------------------- grade
+    def _faixa(self, faixa):
+        """'A2:C9', '1:1', 'B:B', 'C5' -> (linha1, col1, linha2, col2), 1-based inclusivo."""
+        m = _FAIXA.match(faixa)
+        if not m:
+            raise ValueError(f"faixa inválida: {faixa}")
+        c1, l1 = m["c1"], m["l1"]
+        c2, l2 = (m["c2"], m["l2"]) if m["c2"] is not None or m["l2"] is not None else (c1, l1)
+        return (int(l1) if l1 else 1, _col_num(c1) if c1 else 1,
+                int(l2) if l2 else max(len(self.valores), 1),
+                _col_num(c2) if c2 else max((len(r) for r in self.valores), default=1))
+
+    def _ler(self, faixa):
+        l1, c1, l2, c2 = self._faixa(faixa)
+        linhas = []
+        for linha in self.valores[l1 - 1:l2]:
+            parte = linha[c1 - 1:c2]
+            while parte and parte[-1] == "":
+                parte = parte[:-1]
+            linhas.append(parte)
+        while linhas and not linhas[-1]:
+            linhas.pop()
+        return linhas
+
+    def _escrever(self, linha, col, valores):
+        for i, vals in enumerate(valores):
+            n = linha - 1 + i
+            while len(self.valores) <= n:
+                self.valores.append([])
+            atual = self.valores[n]
+            if len(atual) < col - 1 + len(vals):
+                atual.extend([""] * (col - 1 + len(vals) - len(atual)))
+            for j, v in enumerate(vals):
+                atual[col - 1 + j] = "" if v is None else str(v)
+        self.spreadsheet._modificou()
+
+    def _ultima_linha(self):
+        n = len(self.valores)
+        while n and not any(self.valores[n - 1]):
+            n -= 1
+        return n
+
+    # ----------------------------------------------------------------- API
+    def get_all_values(self):
+        self._chamar("get_all_values")
+        return self._ler("A1:" + _col_letra(max((len(r) for r in self.valores), default=1)) + str(len(self.valores) or 1))
+
+    def get_all_records(self):
+        self._chamar("get_all_records")
+        if not self.valores:
+            return []
+        cab = self.valores[0]
+        return [
+            {h: _numericise(linha[i] if i < len(linha) else "") for i, h in enumerate(cab)}
+            for linha in self.valores[1:self._ultima_linha()]
+        ]
+
+    def row_values(self, linha):
+        self._chamar("row_values")
+        return self._ler(f"{linha}:{linha}")[0] if len(self.valores) >= linha else []
+
+    def col_values(self, col):
+        self._chamar("col_values")
+        return [r[col - 1] if len(r) >= col else "" for r in self.valores[:self._ultima_linha()]]
+
+    def get(self, faixa):
+        self._chamar("get")
+        return self._ler(faixa)
+
+    def batch_get(self, faixas):
+        self._chamar("batch_get")
+        return [self._ler(f) for f in faixas]
+
+    def update(self, valores, faixa="A1", **kwargs):
+        self._chamar("update")
+        if isinstance(valores, str):  # assinatura antiga update(faixa, valores)
+            valores, faixa = faixa, valores
+        l1, c1, _, _ = self._faixa(faixa)
+        self._escrever(l1, c1, valores)
+        return {}
+
+    def update_cell(self, linha, col, valor):
+        self._chamar("update_cell")
+        self._escrever(linha, col, [[valor]])
+
+    def batch_update(self, dados, **kwargs):
+        self._chamar("batch_update")
+        for d in dados:
+            l1, c1, _, _ = self._faixa(d["range"])
+            self._escrever(l1, c1, d["values"])
+        return {}
+
+    def append_row(self, linha, **kwargs):
+        self._chamar("append_row")
+        return self._anexar([linha])
+
+    def append_rows(self, linhas, **kwargs):
+        self._chamar("append_rows")
+        return self._anexar(linhas)
+
+    def _anexar(self, linhas):
+        ini = self._ultima_linha() + 1
+        del self.valores[ini - 1:]
+        self._escrever(ini, 1, linhas)
+        fim = ini + len(linhas) - 1
+        ultima = _col_letra(max((len(r) for r in linhas), default=1))
+        return {"updates": {"updatedRange": f"'{self.title}'!A{ini}:{ultima}{fim}"}}
+
+    def clear(self):
+        self._chamar("clear")
+        self.valores = []
+        self.spreadsheet._modificou()
+
+
+class PlanilhaFalsa:
+    def __init__(self, abas=None, latencia=0.0):
+        self.latencia = latencia
+        self.chamadas = Counter()
+        self._versao = 0
+        self._abas = {}
+        for titulo, valores in (abas or {}).items():
+            self._abas[titulo] = AbaFalsa(self, titulo, valores, len(self._abas))
+
+    def _chamar(self, nome):
+        self.chamadas[nome] += 1
+        if self.latencia:
+            time.sleep(self.latencia)
+
+    def _modificou(self):
+        self._versao += 1
+
+    def zerar_contagem(self):
+        self.chamadas.clear()
+
+    @property
+    def total_chamadas(self):
+        return sum(self.chamadas.values())
+
+    # ----------------------------------------------------------------- API
+    def worksheet(self, titulo):
+        self._chamar("planilha.worksheet")
+        if titulo not in self._abas:
+            raise WorksheetNotFound(titulo)
+        return self._abas[titulo]
+
+    def worksheets(self):
+        self._chamar("planilha.worksheets")
+        return list(self._abas.values())
+
+    def add_worksheet(self, title, rows=1000, cols=26, **kwargs):
+        self._chamar("planilha.add_worksheet")
+        aba = self._abas[title] = AbaFalsa(self, title, [], len(self._abas))
+        self._modificou()
+        return aba
+
+    def get_lastUpdateTime(self):
+        self._chamar("planilha.get_lastUpdateTime")
+        return f"v{self._versao}"
+
+    def values_get(self, faixa):
+        self._chamar("planilha.values_get")
+        return {"range": faixa, "values": self._aba_da_faixa(faixa)._ler(faixa)}
+
+    def values_batch_get(self, faixas):
+        self._chamar("planilha.values_batch_get")
+        return {"valueRanges": [{"range": f, "values": self._aba_da_faixa(f)._ler(f)} for f in faixas]}
+
+    def batch_update(self, corpo):
+        self._chamar("planilha.batch_update")
+        # só deleteDimension (exclusão de linhas), de baixo para cima como o Sheets aplica em ordem
+        for pedido in corpo.get("requests", []):
+            faixa = pedido["deleteDimension"]["range"]
+            aba = next(a for a in self._abas.values() if a.id == faixa["sheetId"])
+            del aba.valores[faixa["startIndex"]:faixa["endIndex"]]
+        self._modificou()
+        return {}
+
+    def _aba_da_faixa(self, faixa):
+        return self._abas[_FAIXA.match(faixa)["aba"]]
+
+
+# ==============================================================================
+# DADOS SINTÉTICOS
+# ==============================================================================
+def _modelo_nomes():
+    """Primeiros/últimos nomes do dados.xlsx (ou uma lista fixa se o arquivo não estiver aqui)."""
+    try:
+        import openpyxl
+
+        wb = openpyxl.load_workbook(ARQUIVO_MODELO, read_only=True)
+        linhas = list(wb.worksheets[0].iter_rows(min_row=2, values_only=True))
+        wb.close()
+        nomes = [str(r[1]).split() for r in linhas if r[1]]
+        return sorted({n[0] for n in nomes}), sorted({p for n in nomes for p in n[1:] if len(p) > 2})
+    except Exception:
+        return (["ANA", "JOÃO", "MARIA", "JOSÉ", "ADRIANA", "ADEMIR"],
+                ["SILVA", "SANTOS", "OLIVEIRA", "SOUZA", "CAMPOS", "BARBOZA"])
+
+
+def gerar_abas(n_funcionarios, n_rescisoes=None, seed=42):
+    """{aba: valores} com o formato das abas reais (matrícula '0101' + 8 dígitos, CPF de 11)."""
+    rng = np.random.default_rng(seed)
+    n_rescisoes = n_funcionarios // 4 if n_rescisoes is None else n_rescisoes
+    primeiros, sobrenomes = _modelo_nomes()
+    mats = [f"0101{m:08d}" for m in rng.choice(99_999_999, n_funcionarios, replace=False)]
+    nomes = [f"{rng.choice(primeiros)} {rng.choice(sobrenomes)} {rng.choice(sobrenomes)}" for _ in mats]
+    cpfs = [str(c) for c in rng.integers(10**10, 10**11 - 1, n_funcionarios)]
+    centros = [f"CC{c:03d} - OBRA {c}" for c in range(120)]
+
+    funcionarios = [["MATRICULA", "NOME", "CENTRO_CUSTO", "CPF", "PCD", "ATUALIZADO_EM"]] + [
+        [m, nm, rng.choice(centros), cpf, "SIM" if rng.random() < .03 else "NÃO", ""]
+        for m, nm, cpf in zip(mats, nomes, cpfs)
+    ]
+    consignados = [["MATRICULA", "VALOR"]] + [
+        [mats[i], f"{rng.uniform(50, 900):.2f}"] for i in rng.choice(n_funcionarios, n_funcionarios // 10)
+    ]
+    hoje = date(2026, 1, 1)
+    recesso = [["MATRICULA", "DIAS", "PER_INI", "PER_FIM"]]
+    for i in rng.choice(n_funcionarios, n_funcionarios // 5, replace=False):
+        ini = hoje + timedelta(days=int(rng.integers(0, 300)))
+        recesso.append([mats[i], str(int(rng.integers(5, 31))), ini.isoformat(), (ini + timedelta(days=14)).isoformat()])
+
+    rescisoes = [list(COLUNAS_RESCISOES_MIN)]
+    for n, i in enumerate(rng.integers(0, n_funcionarios, n_rescisoes), start=1):
+        dem = hoje - timedelta(days=int(rng.integers(0, 1500)))
+        r = dict.fromkeys(COLUNAS_RESCISOES_MIN, "")
+        r.update({
+            'ID': str(n), 'FLUIG': str(100000 + n), 'MATRICULA': mats[i], 'NOME': nomes[i], 'CPF': cpfs[i],
+            'PCD': "NÃO", 'LOCACAO': funcionarios[i + 1][2], 'DIAS_RECESSO': "0", 'PERIODO_RECESSO': "-",
+            'TIPO_DEMISSAO': rng.choice(["Aviso Trabalhado", "Aviso Indenizado", "Pedido de Demissão", "Acordo"]),
+            'DATA_DEMISSAO': dem.strftime("%d/%m/%Y"), 'TEM_CONSIGNADO': "Não", 'VALOR_CONSIGNADO': "0,0",
+            'CALCULO_REALIZADO': rng.choice(["CALCULADO", "PENDENTE"]), 'DOC_ENVIADO': rng.choice(["ENVIADO", "PENDENTE"]),
+            'DATA_PAGAMENTO': (dem + timedelta(days=10)).strftime("%d/%m/%Y"), 'FATURAMENTO': "NÃO",
+            'BAIXA_PAGAMENTO': rng.choice(["PAGO", "ABERTO"]), 'SOLICITANTE': rng.choice(["DP", "Gestor", "Financeiro", "RH"]),
+        })
+        rescisoes.append([r[c] for c in COLUNAS_RESCISOES_MIN])
+
+    return {
+        "base_funcionarios": funcionarios, "base_consignados": consignados, "base_recesso": recesso,
+        "rescisões": rescisoes, "usuarios": [["USUARIO", "SENHA"], ["dp", "123"]],
+    }
+
+
+def criar_planilha(n_funcionarios=1000, n_rescisoes=None, latencia=0.0, seed=42):
+    return PlanilhaFalsa(gerar_abas(n_funcionarios, n_rescisoes, seed), latencia)
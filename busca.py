@@ -0,0 +1,44 @@
+"""Índice de busca do filtro "Buscar..." da listagem de rescisões.
+
+Em vez de converter o frame inteiro para texto e rodar uma regex por coluna a
+cada tecla, cada linha ganha (uma vez por revisão dos dados) um texto único,
+minúsculo e sem acentos com os campos pesquisáveis. A consulta é só um
+"contém" literal (o que o usuário digita não é interpretado como regex).
+"""
+import pandas as pd
+
+COLUNAS_BUSCA = ['ID', 'NOME', 'CPF', 'MATRICULA', 'FLUIG', 'OBSERVACOES', 'LOCACAO', 'SOLICITANTE']
+SEPARADOR = "\x1f"  # não aparece em texto digitado: um termo não "emenda" dois campos
+
+
+def sem_acentos(serie):
+    """Minúsculas e sem acentos/cedilha ('JOÃO' -> 'joao')."""
+    txt = serie.astype(object).where(serie.notna(), "").astype(str).str.lower()
+    return txt.str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii')
+
+
+def normalizar_termo(termo):
+    return sem_acentos(pd.Series([str(termo)])).iloc[0].strip()
+
+
+def montar_indice_busca(df, colunas=COLUNAS_BUSCA):
+    """Série (mesmo índice de `df`) com o texto pesquisável de cada linha."""
+    cols = [c for c in colunas if c in df.columns]
+    if not cols or df.empty:
+        return pd.Series("", index=df.index, dtype=object)
+    txt = sem_acentos(df[cols[0]])
+    for c in cols[1:]:
+        txt = txt + SEPARADOR + sem_acentos(df[c])
+    try:
+        # pyarrow (dependência do streamlit) faz o "contém" em C
+        return txt.astype("string[pyarrow]")
+    except (ImportError, TypeError):
+        return txt
+
+
+def filtrar_busca(indice, termo):
+    """Máscara booleana (alinhada ao índice) das linhas que contêm todas as palavras de `termo`."""
+    mascara = pd.Series(True, index=indice.index)
+    for palavra in normalizar_termo(termo).split():
+        mascara &= indice.str.contains(palavra, regex=False).fillna(False).astype(bool)
+    return mascara
@@ -0,0 +1,134 @@
+"""Montagem dos registros de rescisão: cadastro avulso (barra lateral) e em lote (upload).
+
+O lote aceita Excel/CSV com FLUIG, MATRICULA, TIPO, DATA e SOLICITANTE
+(OBSERVACOES opcional). Todas as matrículas são cruzadas de uma vez com as
+bases (arm.buscar_dados_lote) e os registros vão num único anexar_rescisoes:
+um bloco contíguo de IDs e um append só, sem uma ida ao Sheets por linha.
+"""
+import pandas as pd
+
+from bases import COLUNAS_INDICE
+from merge_base import ler_upload_em_blocos
+from normalizacao import datas_de_texto, limpar_matriculas
+from prazos import PRAZOS
+
+TIPOS_DEMISSAO = list(PRAZOS.regras)  # padrão + tipos acrescentados pelo DP_PRAZOS
+
+# nomes aceitos no cabeçalho do arquivo (já em maiúsculas) -> coluna do lote
+SINONIMOS_LOTE = {
+    'MATRÍCULA': 'MATRICULA', 'TIPO_DEMISSAO': 'TIPO', 'TIPO DEMISSÃO': 'TIPO',
+    'DATA_DEMISSAO': 'DATA', 'DATA DEMISSÃO': 'DATA', 'OBS': 'OBSERVACOES', 'OBSERVAÇÕES': 'OBSERVACOES',
+}
+COLUNAS_LOTE = ['FLUIG', 'MATRICULA', 'TIPO', 'DATA', 'SOLICITANTE']
+
+
+# ==============================================================================
+# REGISTROS
+# ==============================================================================
+def registros_rescisao(entrada, dados):
+    """Registros (lista de dicts sem ID) para anexar_rescisoes.
+
+    `entrada`: FLUIG, TIPO, DATA (date/datetime), SOLICITANTE, OBSERVACOES;
+    `dados`: resultado de buscar_dados_lote na mesma ordem (MATRICULA + COLUNAS_INDICE).
+    """
+    n = len(entrada)
+    dem = pd.to_datetime(pd.Series(entrada['DATA'].to_numpy()))
+    pagamento = pd.Series(PRAZOS.calcular(dem, entrada['TIPO'].to_numpy(dtype=object)))
+    vc = dados['VALOR_CONSIGNADO'].astype(float).reset_index(drop=True)
+    df = pd.DataFrame({
+        'FLUIG': "'" + pd.Series(entrada['FLUIG'].to_numpy(), dtype=str),
+        'MATRICULA': dados['MATRICULA'].to_numpy(dtype=object),
+        'NOME': dados['NOME'].to_numpy(dtype=object),
+        'CPF': dados['CPF'].to_numpy(dtype=object),
+        'PCD': dados['PCD'].to_numpy(dtype=object),
+        'LOCACAO': dados['LOCACAO'].to_numpy(dtype=object),
+        'DIAS_RECESSO': dados['DIAS_RECESSO'].astype(int).to_numpy(),
+        'PERIODO_RECESSO': dados['PERIODO_RECESSO'].to_numpy(dtype=object),
+        'TIPO_DEMISSAO': entrada['TIPO'].to_numpy(dtype=object),
+        'DATA_DEMISSAO': dem.dt.strftime('%d/%m/%Y'),
+        'TEM_CONSIGNADO': vc.gt(0).map({True: "Sim", False: "Não"}),
+        'VALOR_CONSIGNADO': vc.astype(str).str.replace('.', ',', regex=False),
+        'CALCULO_REALIZADO': ["PENDENTE"] * n,
+        'DOC_ENVIADO': ["PENDENTE"] * n,
+        'DATA_PAGAMENTO': pagamento.dt.strftime('%d/%m/%Y'),
+        'FATURAMENTO': ["NÃO"] * n,
+        'BAIXA_PAGAMENTO': ["ABERTO"] * n,
+        'OBSERVACOES': pd.Series(entrada['OBSERVACOES'].to_numpy(), dtype=str),
+        'SOLICITANTE': pd.Series(entrada['SOLICITANTE'].to_numpy(), dtype=str),
+        'EXCLUIR': [""] * n,
+    })
+    return df.to_dict('records')
+
+def registro_avulso(fluig, matricula, registro_base, tipo, data_demissao, solicitante, obs):
+    """Um registro do formulário da barra lateral (`registro_base` = tupla de buscar_dados)."""
+    entrada = pd.DataFrame([{'FLUIG': fluig, 'TIPO': tipo, 'DATA': data_demissao,
+                             'SOLICITANTE': solicitante, 'OBSERVACOES': obs}])
+    dados = pd.DataFrame([(matricula, *registro_base)], columns=['MATRICULA'] + COLUNAS_INDICE)
+    dados['MATRICULA'] = limpar_matriculas(dados['MATRICULA'])
+    return registros_rescisao(entrada, dados)[0]
+
+
+# ==============================================================================
+# LOTE
+# ==============================================================================
+class PreviaLote:
+    """Lote lido e conferido: o que vai ser gravado e o que ficou de fora."""
+
+    def __init__(self, linhas, dados, problemas):
+        self.linhas = linhas        # entrada válida (FLUIG, MATRICULA, TIPO, DATA, ...)
+        self.dados = dados          # buscar_dados_lote das linhas válidas (mesma ordem)
+        self.problemas = problemas  # linhas recusadas + coluna MOTIVO
+
+    @property
+    def encontradas(self):
+        return self.dados['ENCONTRADO'].to_numpy(dtype=bool)
+
+    @property
+    def n_nao_encontradas(self):
+        return int((~self.encontradas).sum())
+
+    def quadro(self):
+        """Prévia: arquivo + o que veio das bases."""
+        q = self.linhas[['FLUIG', 'MATRICULA', 'TIPO', 'SOLICITANTE']].reset_index(drop=True)
+        q.insert(3, 'DATA', self.linhas['DATA'].dt.strftime('%d/%m/%Y').to_numpy())
+        for col in ('NOME', 'LOCACAO', 'DIAS_RECESSO', 'VALOR_CONSIGNADO', 'ENCONTRADO'):
+            q[col] = self.dados[col].to_numpy()
+        return q
+
+    def registros(self, incluir_nao_encontradas=True):
+        manter = slice(None) if incluir_nao_encontradas else self.encontradas
+        return registros_rescisao(self.linhas[manter], self.dados[manter])
+
+
+def preparar_lote(arm, arquivo, nome, solicitante_padrao=""):
+    """Lê o arquivo, valida as linhas e cruza todas as matrículas com as bases numa consulta."""
+    original = pd.concat(list(ler_upload_em_blocos(arquivo, nome)), ignore_index=True)
+    df = original.rename(columns=SINONIMOS_LOTE)
+    if solicitante_padrao and 'SOLICITANTE' not in df.columns:
+        df['SOLICITANTE'] = ""
+    faltando = [c for c in COLUNAS_LOTE if c not in df.columns]
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes no arquivo: {', '.join(faltando)}")
+    if 'OBSERVACOES' not in df.columns:
+        df['OBSERVACOES'] = ""
+    if solicitante_padrao:
+        df['SOLICITANTE'] = df['SOLICITANTE'].mask(df['SOLICITANTE'] == "", solicitante_padrao)
+
+    df['FLUIG'] = df['FLUIG'].str.lstrip("'")
+    df['MATRICULA'] = limpar_matriculas(df['MATRICULA'])
+    df['DATA'] = datas_de_texto(df['DATA'])
+    tipos = {t.upper(): t for t in TIPOS_DEMISSAO}
+    df['TIPO'] = df['TIPO'].str.upper().map(tipos)
+
+    motivo = pd.Series("", index=df.index, dtype=object)
+    motivo = motivo.mask(df['FLUIG'] == "", "sem FLUIG")
+    motivo = motivo.mask((motivo == "") & (df['MATRICULA'] == ""), "sem matrícula")
+    motivo = motivo.mask((motivo == "") & df['DATA'].isna(), "data inválida")
+    motivo = motivo.mask((motivo == "") & df['TIPO'].isna(), "tipo de demissão desconhecido")
+    motivo = motivo.mask((motivo == "") & df['FLUIG'].duplicated(keep='first'), "FLUIG repetido no arquivo")
+
+    validas = motivo == ""
+    problemas = original[~validas].assign(MOTIVO=motivo[~validas])
+    linhas = df[validas].reset_index(drop=True)
+    dados = arm.buscar_dados_lote(linhas['MATRICULA'].tolist())
+    return PreviaLote(linhas, dados, problemas)
@@ -0,0 +1,196 @@
+"""Camada única de acesso ao Google Sheets (toda chamada do gspread passa por aqui).
+
+`embrulhar(sh, camadas)` devolve a planilha com cada chamada de método (na
+planilha e nas abas que ela devolve) passando pelas camadas, da primeira
+(mais externa) para a última:
+
+- Agendador: limite de requisições por minuto (balde de fichas), nova
+  tentativa com espera exponencial em 429/5xx e leituras idênticas em
+  andamento, de sessões diferentes, viram uma requisição só;
+- Medidor (instrumentacao.py): tempo e tamanho de cada chamada real.
+
+Esgotadas as tentativas, a chamada levanta SheetsIndisponivel (mensagem
+clara para a tela); quem tem cópia local segue com ela.
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+REQ_POR_MINUTO = int(os.environ.get("DP_SHEETS_REQ_MIN", "60"))  # cota por usuário do Sheets
+RAJADA = 30          # fichas acumuláveis (carga inicial faz várias chamadas seguidas)
+TENTATIVAS = 5
+ESPERA_BASE = 1.0    # segundos; dobra a cada tentativa (+ sorteio)
+ESPERA_MAX = 32.0
+STATUS_TRANSITORIOS = {429, 500, 502, 503, 504}
+
+# leituras: podem ser repetidas e juntadas; o resto é escrita
+LEITURAS = {
+    "worksheet", "worksheets", "get_lastUpdateTime", "values_get", "values_batch_get",
+    "get_all_values", "get_all_records", "get_values", "row_values", "col_values", "get", "batch_get",
+}
+
+
+class SheetsIndisponivel(Exception):
+    """Sheets não respondeu (cota ou erro temporário) depois de todas as tentativas."""
+
+
+def status_http(exc):
+    resposta = getattr(exc, "response", None)
+    return getattr(resposta, "status_code", None)
+
+def eh_transitorio(exc):
+    if status_http(exc) in STATUS_TRANSITORIOS:
+        return True
+    try:
+        import requests
+
+        return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+    except ImportError:
+        return False
+
+def _retry_after(exc):
+    try:
+        return float(exc.response.headers.get("Retry-After"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+# ==============================================================================
+# LIMITE DE TAXA
+# ==============================================================================
+class BaldeFichas:
+    """Token bucket: `taxa` fichas por segundo, até `capacidade` acumuladas."""
+
+    def __init__(self, por_minuto=REQ_POR_MINUTO, capacidade=RAJADA):
+        self.taxa = por_minuto / 60.0
+        self.capacidade = capacidade
+        self._fichas = float(capacidade)
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def tomar(self):
+        """Bloqueia até haver ficha. Retorna os segundos esperados."""
+        with self._lock:
+            agora = time.monotonic()
+            self._fichas = min(self.capacidade, self._fichas + (agora - self._ultimo) * self.taxa)
+            self._ultimo = agora
+            self._fichas -= 1
+            espera = -self._fichas / self.taxa if self._fichas < 0 else 0.0
+        if espera:
+            time.sleep(espera)
+        return espera
+
+
+# ==============================================================================
+# AGENDADOR
+# ==============================================================================
+class Agendador:
+    def __init__(self, balde=None, tentativas=TENTATIVAS, espera_base=ESPERA_BASE, espera_max=ESPERA_MAX):
+        self.balde = balde or BaldeFichas()
+        self.tentativas = tentativas
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self._lock = threading.Lock()
+        self._em_andamento = {}  # chave -> Future da leitura
+        self.juntadas = 0        # leituras atendidas por outra já em andamento
+        self.repetidas = 0       # novas tentativas após erro transitório
+
+    def chamar(self, rotulo, chave, func, args=()):
+        metodo = rotulo.rsplit(".", 1)[-1]
+        if metodo not in LEITURAS:
+            return self._executar(rotulo, func, leitura=False)
+
+        with self._lock:
+            futuro = self._em_andamento.get(chave)
+            dono = futuro is None
+            if dono:
+                futuro = self._em_andamento[chave] = Future()
+            else:
+                self.juntadas += 1
+        if not dono:
+            return futuro.result()
+        try:
+            resultado = self._executar(rotulo, func, leitura=True)
+            futuro.set_result(resultado)
+            return resultado
+        except BaseException as e:
+            futuro.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._em_andamento.pop(chave, None)
+
+    def _executar(self, rotulo, func, leitura):
+        for tentativa in range(self.tentativas):
+            self.balde.tomar()
+            try:
+                return func()
+            except Exception as e:
+                # escrita só repete em 429 (recusada antes de executar): 5xx pode ter gravado
+                repetir = eh_transitorio(e) and (leitura or status_http(e) == 429)
+                if not repetir:
+                    raise
+                if tentativa == self.tentativas - 1:
+                    raise SheetsIndisponivel(
+                        f"Google Sheets indisponível ({rotulo}: {e}) após {self.tentativas} tentativas. "
+                        "Tente de novo em instantes."
+                    ) from e
+                self.repetidas += 1
+                espera = _retry_after(e) or min(self.espera_max, self.espera_base * 2 ** tentativa)
+                time.sleep(espera * (0.5 + random.random() / 2))
+
+
+# ==============================================================================
+# PROXY
+# ==============================================================================
+class ProxyGspread:
+    """Repassa tudo ao objeto real; métodos públicos passam pelas camadas."""
+
+    def __init__(self, alvo, camadas, prefixo):
+        object.__setattr__(self, "_alvo", alvo)
+        object.__setattr__(self, "_camadas", tuple(camadas))
+        object.__setattr__(self, "_prefixo", prefixo)
+
+    def __getattr__(self, nome):
+        valor = getattr(self._alvo, nome)
+        if nome.startswith("_"):
+            return valor
+        if not callable(valor):
+            return _embrulhar(valor, self._camadas)
+        rotulo = f"{self._prefixo}.{nome}"
+        chave_alvo = (self._prefixo, getattr(self._alvo, "id", id(self._alvo)))
+
+        def chamada(*args, **kwargs):
+            chave = (chave_alvo, nome, repr(args), repr(sorted(kwargs.items())))
+            func = lambda: valor(*args, **kwargs)
+            for camada in reversed(self._camadas):
+                func = (lambda c, f: lambda: c.chamar(rotulo, chave, f, args))(camada, func)
+            return _embrulhar(func(), self._camadas)
+        return chamada
+
+    def __setattr__(self, nome, valor):
+        setattr(self._alvo, nome, valor)
+
+    def __eq__(self, outro):
+        return self._alvo == getattr(outro, "_alvo", outro)
+
+    def __hash__(self):
+        return hash(self._alvo)
+
+
+def _embrulhar(valor, camadas):
+    import gspread
+
+    if isinstance(valor, gspread.Worksheet):
+        return ProxyGspread(valor, camadas, "aba")
+    if isinstance(valor, gspread.Spreadsheet):
+        return ProxyGspread(valor, camadas, "planilha")
+    if isinstance(valor, list) and valor and isinstance(valor[0], gspread.Worksheet):
+        return [ProxyGspread(w, camadas, "aba") for w in valor]
+    return valor
+
+
+def embrulhar(sh, camadas):
+    return ProxyGspread(sh, camadas, "planilha")
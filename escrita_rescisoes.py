@@ -0,0 +1,212 @@
+"""Escrita em lote na aba "rescisões".
+
+Cada operação custa um número fixo de chamadas ao Sheets, independente de
+quantas células/linhas mudaram (as cotas do Google contam requisições).
+"""
+import re
+import threading
+import time
+
+from gspread.utils import rowcol_to_a1
+
+from espelho_rescisoes import letra_coluna
+
+
+def _norm_headers(linha):
+    return [str(h).upper().strip() for h in linha]
+
+
+def ler_cabecalho_e_ids(ws, headers=None):
+    """Cabeçalho e coluna ID numa única leitura.
+
+    `headers` (cache) só serve para achar a coluna ID; se o cabeçalho remoto
+    mudou, repete a leitura com o cabeçalho novo.
+    """
+    if not headers or "ID" not in headers:
+        headers = _norm_headers(ws.row_values(1))
+        if "ID" not in headers:
+            return headers, []
+    col = letra_coluna(headers.index("ID") + 1)
+    topo, coluna = ws.batch_get(["1:1", f"{col}:{col}"])
+    remoto = _norm_headers(topo[0]) if topo else []
+    if remoto != headers:
+        return ler_cabecalho_e_ids(ws, remoto)
+    ids = [str(r[0]).strip() if r else "" for r in coluna][1:]
+    return headers, ids
+
+
+def gravar_edicoes(ws, alteracoes, excluir_ids=(), headers=None):
+    """Grava {ID: {COLUNA: texto}} num único batch_update e apaga `excluir_ids` num único batch.
+
+    Retorna os IDs que não foram encontrados na planilha (apagados por outro operador).
+    """
+    headers, ids = ler_cabecalho_e_ids(ws, headers)
+    linha_por_id = {i: n + 2 for n, i in enumerate(ids) if i}
+
+    faltando = []
+    dados = []
+    for id_, cols in alteracoes.items():
+        linha = linha_por_id.get(str(id_))
+        if linha is None:
+            faltando.append(id_)
+            continue
+        for col, valor in cols.items():
+            if col in headers:
+                dados.append({"range": rowcol_to_a1(linha, headers.index(col) + 1), "values": [[valor]]})
+    if dados:
+        ws.batch_update(dados)
+
+    linhas = sorted({linha_por_id[str(i)] for i in excluir_ids if str(i) in linha_por_id}, reverse=True)
+    faltando += [i for i in excluir_ids if str(i) not in linha_por_id]
+    if linhas:
+        ws.spreadsheet.batch_update({"requests": [_pedido_apagar(ws.id, ini, fim) for ini, fim in _faixas(linhas)]})
+
+    return faltando
+
+
+def _faixas(linhas_desc):
+    """[9, 8, 7, 4] -> [(7, 9), (4, 4)] (de baixo para cima, para os índices não deslocarem)."""
+    faixas = []
+    for n in linhas_desc:
+        if faixas and faixas[-1][0] == n + 1:
+            faixas[-1] = (n, faixas[-1][1])
+        else:
+            faixas.append((n, n))
+    return faixas
+
+
+def _pedido_apagar(sheet_id, ini, fim):
+    return {"deleteDimension": {"range": {
+        "sheetId": sheet_id, "dimension": "ROWS", "startIndex": ini - 1, "endIndex": fim,
+    }}}
+
+
+# ==============================================================================
+# NOVOS REGISTROS (✅ SALVAR)
+# ==============================================================================
+TTL_CABECALHO = 300  # segundos
+
+
+def garantir_colunas_no_sheet(ws, colunas_necessarias, headers=None):
+    if headers is None:
+        headers = _norm_headers(ws.row_values(1))
+    faltantes = [c for c in colunas_necessarias if c not in headers]
+    if not faltantes:
+        return headers
+    novo = headers + faltantes
+    ws.batch_update([{"range": "1:1", "values": [novo]}])
+    return novo
+
+
+class CacheCabecalho:
+    """Cabeçalho da aba em memória por TTL_CABECALHO segundos (evita row_values(1) por SALVAR)."""
+
+    def __init__(self, ttl=TTL_CABECALHO):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._headers = None
+        self._quando = 0.0
+
+    def invalidar(self):
+        self._headers = None
+
+    def garantir(self, ws, colunas_necessarias, semente=None):
+        """`semente`: cabeçalho conhecido por outra via (ex.: espelho local) para o 1º uso."""
+        with self._lock:
+            if self._headers is None and semente:
+                self._headers, self._quando = list(semente), time.time()
+            if self._headers is not None and time.time() - self._quando > self.ttl:
+                self._headers = None
+            headers = garantir_colunas_no_sheet(ws, colunas_necessarias, self._headers)
+            if headers != self._headers:
+                self._headers, self._quando = headers, time.time()
+            return headers
+
+
+class AlocadorIds:
+    """Maior ID e nº de linhas de dados da aba, mantidos em memória.
+
+    O append é otimista: se a linha onde o Sheets gravou é a esperada, ninguém
+    anexou nem apagou nada desde a última vez e os IDs reservados são únicos
+    (1 chamada). Se a linha é outra (acima ou abaixo) ou não veio na resposta,
+    relê a coluna ID, renumera os nossos registros se houver conflito e semeia
+    de novo a partir do que está na aba.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.maior_id = None
+        self.n_linhas = None
+
+    @property
+    def semeado(self):
+        return self.maior_id is not None
+
+    def invalidar(self):
+        """Volta a semear no próximo uso (ex.: depois de apagar linhas)."""
+        with self._lock:
+            self.maior_id = self.n_linhas = None
+
+    def semear(self, maior_id, n_linhas):
+        with self._lock:
+            self.maior_id, self.n_linhas = int(maior_id), int(n_linhas)
+
+    def semear_do_sheet(self, ws, headers):
+        _, ids = ler_cabecalho_e_ids(ws, headers)
+        self.semear(max(_ids_validos(ids), default=0), len(ids))
+
+    def anexar(self, ws, headers, registros):
+        """Anexa `registros` (lista de dicts sem ID) e devolve a lista de IDs gravados."""
+        if not registros:
+            return []
+        with self._lock:
+            if self.maior_id is None:
+                raise RuntimeError("AlocadorIds não semeado")
+            primeiro = self.maior_id + 1
+            esperada = self.n_linhas + 2
+            linhas = [[(primeiro + n if col == "ID" else r.get(col, "")) for col in headers]
+                      for n, r in enumerate(registros)]
+
+            resp = ws.append_rows(linhas, value_input_option="RAW", table_range="A1")
+            gravada = _linha_inicial(resp)
+            ids = list(range(primeiro, primeiro + len(linhas)))
+
+            if gravada != esperada and "ID" in headers:
+                return self._resolver_conflito(ws, headers, gravada, ids)
+
+            self.maior_id = max(self.maior_id, *ids)
+            self.n_linhas = (gravada or esperada) - 2 + len(linhas)
+            return ids
+
+    def _resolver_conflito(self, ws, headers, gravada, ids):
+        """Relê a coluna ID, renumera nosso bloco se algum ID já existe fora dele e ressemeia.
+
+        Sem `gravada`, o bloco é a última ocorrência dos nossos IDs na coluna.
+        """
+        headers, coluna = ler_cabecalho_e_ids(ws, headers)
+        n = len(ids)
+        if gravada is None:
+            nossos = [str(i) for i in ids]
+            inicio = next((k for k in range(len(coluna) - n, -1, -1) if coluna[k:k + n] == nossos),
+                          len(coluna) - n)
+            gravada = inicio + 2
+        k = gravada - 2
+        alheios = _ids_validos(coluna[:k] + coluna[k + n:])
+        if set(ids) & set(alheios):
+            base = max([self.maior_id, *alheios]) + 1
+            ids = list(range(base, base + n))
+            col = letra_coluna(headers.index("ID") + 1)
+            ws.batch_update([{"range": f"{col}{gravada + i}", "values": [[v]]} for i, v in enumerate(ids)])
+        self.maior_id = max([self.maior_id, *alheios, *ids])
+        self.n_linhas = len(coluna)
+        return ids
+
+
+def _ids_validos(ids):
+    return [int(x) for x in ids if str(x).strip().isdigit()]
+
+
+def _linha_inicial(resp):
+    faixa = ((resp or {}).get("updates") or {}).get("updatedRange", "")
+    m = re.search(r"!\$?[A-Z]+\$?(\d+)", faixa)
+    return int(m.group(1)) if m else None
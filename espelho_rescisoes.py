@@ -0,0 +1,249 @@
+"""Espelho local (SQLite) da aba "rescisões".
+
+A listagem lia a planilha inteira com get_all_records() a cada interação.
+Aqui a aba fica copiada num arquivo SQLite ao lado do app e só é
+sincronizada quando o Drive indica alteração (modifiedTime da planilha):
+
+- nada mudou ............ serve a cópia local (0 leituras de linhas)
+- só entraram linhas .... baixa apenas o "rabo" novo da aba
+- editou/apagou linhas .. recarga completa (o Sheets não expõe revisão por linha)
+
+De tempos em tempos (INTERVALO_RESYNC_COMPLETO) é feita uma recarga completa
+para pegar edições manuais feitas direto na planilha.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+from gspread.utils import rowcol_to_a1
+
+ARQUIVO_ESPELHO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "espelho_rescisoes.sqlite")
+ABA_RESCISOES = "rescisões"
+
+INTERVALO_MIN_CHECAGEM = 5          # segundos sem nem consultar o Drive
+INTERVALO_RESYNC_COMPLETO = 15 * 60  # segundos entre recargas completas
+
+COLUNAS_NUMERICAS = ['ID', 'DIAS_RECESSO']
+
+
+def letra_coluna(idx):
+    """1 -> 'A', 28 -> 'AB'."""
+    return rowcol_to_a1(1, idx)[:-1]
+
+
+def converter_numericas(df):
+    """ID/DIAS_RECESSO chegam como texto: viram Int64 (ou float se houver decimais)."""
+    for col in COLUNAS_NUMERICAS:
+        if col in df.columns:
+            num = pd.to_numeric(df[col], errors="coerce")
+            df[col] = num.astype("Int64") if num.dropna().mod(1).eq(0).all() else num
+    return df
+
+
+class EspelhoRescisoes:
+    def __init__(self, caminho=ARQUIVO_ESPELHO, aba=ABA_RESCISOES):
+        self.caminho = caminho
+        self.aba = aba
+        self._lock = threading.Lock()
+        self._ultima_checagem = 0.0
+        self._cache_df = None  # (revisao, DataFrame)
+        with self._conn() as con:
+            con.execute("CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT)")
+
+    # ------------------------------------------------------------------ sqlite
+    def _conn(self):
+        return sqlite3.connect(self.caminho, timeout=30)
+
+    def _meta(self, con, chave, padrao=None):
+        row = con.execute("SELECT valor FROM meta WHERE chave = ?", (chave,)).fetchone()
+        return json.loads(row[0]) if row else padrao
+
+    def _set_meta(self, con, **valores):
+        con.executemany(
+            "INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)",
+            [(k, json.dumps(v)) for k, v in valores.items()],
+        )
+
+    def _tem_tabela(self, con):
+        return con.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='rescisoes'").fetchone() is not None
+
+    @property
+    def revisao(self):
+        """Contador que muda a cada alteração da cópia local (serve de chave de memoização)."""
+        with self._conn() as con:
+            return self._meta(con, "revisao", 0)
+
+    @property
+    def headers(self):
+        """Último cabeçalho visto na planilha (evita um row_values(1) por escrita)."""
+        with self._conn() as con:
+            return self._meta(con, "headers", [])
+
+    def resumo_ids(self):
+        """(maior ID, nº de linhas) da cópia local, ou None se ainda não há cópia."""
+        with self._conn() as con:
+            if not self._tem_tabela(con) or "ID" not in self._meta(con, "headers", []):
+                return None
+            maior, n = con.execute('SELECT MAX(CAST("ID" AS INTEGER)), COUNT(*) FROM rescisoes').fetchone()
+            return maior or 0, n
+
+    # ------------------------------------------------------------- sincronia
+    def marcar_desatualizado(self):
+        """Força consultar o Drive na próxima sincronização (ex.: depois de um SALVAR)."""
+        self._ultima_checagem = 0.0
+
+    def invalidar(self):
+        """Força recarga completa na próxima sincronização."""
+        self._ultima_checagem = 0.0
+        with self._conn() as con:
+            self._set_meta(con, ultima_sync_completa=0)
+
+    def sincronizar(self, sh, forcar=False):
+        """Atualiza a cópia local. Retorna 'local', 'sem_mudanca', 'delta' ou 'completa'."""
+        with self._lock:
+            agora = time.time()
+            with self._conn() as con:
+                existe = self._tem_tabela(con)
+                ultima_completa = self._meta(con, "ultima_sync_completa", 0)
+                mt_local = self._meta(con, "modified_time")
+                headers = self._meta(con, "headers", [])
+
+            if forcar or not existe or agora - ultima_completa > INTERVALO_RESYNC_COMPLETO:
+                return self._sync_completa(sh)
+
+            if agora - self._ultima_checagem < INTERVALO_MIN_CHECAGEM:
+                return "local"
+
+            mt = sh.get_lastUpdateTime()
+            self._ultima_checagem = agora
+            if mt and mt == mt_local:
+                return "sem_mudanca"
+
+            modo = self._sync_delta(sh, headers, mt)
+            return modo or self._sync_completa(sh, mt)
+
+    def _sync_completa(self, sh, mt=None):
+        if mt is None:
+            mt = sh.get_lastUpdateTime()
+        valores = sh.worksheet(self.aba).get_all_values()
+        headers = [str(h).upper().strip() for h in valores[0]] if valores else []
+        linhas = [self._ajustar(r, len(headers)) for r in valores[1:]]
+
+        with self._conn() as con:
+            con.execute("DROP TABLE IF EXISTS rescisoes")
+            self._criar_tabela(con, headers)
+            self._inserir(con, headers, linhas, primeira_linha=2)
+            self._set_meta(
+                con,
+                headers=headers,
+                modified_time=mt,
+                ultima_sync_completa=time.time(),
+                revisao=self._meta(con, "revisao", 0) + 1,
+            )
+        self._ultima_checagem = time.time()
+        return "completa"
+
+    def _sync_delta(self, sh, headers, mt):
+        """Só entraram linhas novas? Baixa o rabo. Senão devolve None (precisa recarga completa)."""
+        if "ID" not in headers:
+            return None
+        col = letra_coluna(headers.index("ID") + 1)
+        resp = sh.values_batch_get([f"'{self.aba}'!1:1", f"'{self.aba}'!{col}:{col}"])
+        faixas = resp.get("valueRanges", [])
+        remoto_headers = [str(h).upper().strip() for h in (faixas[0].get("values") or [[]])[0]]
+        remoto_ids = [str(r[0]) if r else "" for r in (faixas[1].get("values") or [])][1:]
+        if remoto_headers != headers:
+            return None
+
+        with self._conn() as con:
+            local_ids = [r[0] for r in con.execute('SELECT "ID" FROM rescisoes ORDER BY _LINHA')]
+        n = len(local_ids)
+        if len(remoto_ids) < n or remoto_ids[:n] != local_ids:
+            return None
+
+        novas = []
+        if len(remoto_ids) > n:
+            faixa = f"'{self.aba}'!A{n + 2}:{letra_coluna(len(headers))}{len(remoto_ids) + 1}"
+            novas = [self._ajustar(r, len(headers)) for r in sh.values_get(faixa).get("values", [])]
+        elif n == len(remoto_ids):
+            # modifiedTime mudou mas nenhuma linha entrou: alguém editou/apagou
+            return None
+
+        with self._conn() as con:
+            self._inserir(con, headers, novas, primeira_linha=n + 2)
+            self._set_meta(con, modified_time=mt, revisao=self._meta(con, "revisao", 0) + 1)
+        return "delta"
+
+    def registrar_escrita(self, sh, alteracoes=None, excluir_ids=(), mt_antes=None):
+        """Aplica na cópia local uma escrita feita por este app.
+
+        `mt_antes` é o modifiedTime lido logo antes da escrita. Se ele ainda é o
+        que a cópia local conhece, a planilha só mudou pela nossa escrita: o novo
+        modifiedTime é aceito e a próxima sincronização não rebaixa a aba. Se
+        não (outra sessão escreveu no meio), só marca desatualizado e a próxima
+        sincronização busca a diferença.
+        """
+        with self._lock, self._conn() as con:
+            if self._tem_tabela(con):
+                headers = self._meta(con, "headers", [])
+                for id_, cols in (alteracoes or {}).items():
+                    for col, valor in cols.items():
+                        if col in headers:
+                            con.execute(f'UPDATE rescisoes SET {self._q(col)} = ? WHERE "ID" = ?', (valor, str(id_)))
+                if excluir_ids:
+                    con.executemany('DELETE FROM rescisoes WHERE "ID" = ?', [(str(i),) for i in excluir_ids])
+                    self._renumerar(con)
+            mt_local = self._meta(con, "modified_time")
+            if mt_antes is not None and mt_antes == mt_local:
+                self._set_meta(con, modified_time=sh.get_lastUpdateTime())
+            else:
+                self.marcar_desatualizado()
+            self._set_meta(con, revisao=self._meta(con, "revisao", 0) + 1)
+
+    # --------------------------------------------------------------- tabela
+    @staticmethod
+    def _ajustar(linha, n):
+        linha = [str(v) for v in linha[:n]]
+        return linha + [""] * (n - len(linha))
+
+    @staticmethod
+    def _q(col):
+        return '"' + col.replace('"', '""') + '"'
+
+    def _criar_tabela(self, con, headers):
+        cols = ", ".join(f"{self._q(h)} TEXT" for h in headers)
+        con.execute(f"CREATE TABLE rescisoes (_LINHA INTEGER PRIMARY KEY{', ' + cols if cols else ''})")
+        if "ID" in headers:
+            con.execute('CREATE INDEX IF NOT EXISTS ix_rescisoes_id ON rescisoes ("ID")')
+
+    def _renumerar(self, con):
+        """Depois de apagar linhas, _LINHA volta a ser a posição real na planilha."""
+        antigas = [r[0] for r in con.execute("SELECT _LINHA FROM rescisoes ORDER BY _LINHA")]
+        con.execute("UPDATE rescisoes SET _LINHA = -_LINHA")
+        con.executemany("UPDATE rescisoes SET _LINHA = ? WHERE _LINHA = ?", [(n + 2, -v) for n, v in enumerate(antigas)])
+
+    def _inserir(self, con, headers, linhas, primeira_linha):
+        if not linhas:
+            return
+        cols = ", ".join(["_LINHA"] + [self._q(h) for h in headers])
+        marc = ", ".join(["?"] * (len(headers) + 1))
+        con.executemany(
+            f"INSERT INTO rescisoes ({cols}) VALUES ({marc})",
+            ([primeira_linha + i] + r for i, r in enumerate(linhas)),
+        )
+
+    # ---------------------------------------------------------------- leitura
+    def ler(self):
+        """DataFrame com a aba (sem a coluna interna _LINHA), memoizado pela revisão."""
+        rev = self.revisao
+        if self._cache_df is None or self._cache_df[0] != rev:
+            with self._conn() as con:
+                if not self._tem_tabela(con):
+                    return pd.DataFrame()
+                df = pd.read_sql_query("SELECT * FROM rescisoes ORDER BY _LINHA", con)
+            df = converter_numericas(df.drop(columns=["_LINHA"]))
+            self._cache_df = (rev, df)
+        return self._cache_df[1].copy()
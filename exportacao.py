@@ -0,0 +1,76 @@
+"""Exportação da listagem filtrada (XLSX, CSV, Parquet).
+
+O arquivo só é gerado quando alguém clica em baixar (download_button com
+função) e fica guardado pela chave (revisão dos dados, filtros, formato):
+clicar de novo, ou outro usuário com o mesmo filtro, não refaz o trabalho.
+O XLSX usa o modo write_only do openpyxl, que grava linha a linha sem montar
+a planilha inteira em memória.
+"""
+import io
+import threading
+from collections import OrderedDict
+
+from normalizacao import formatar_exportacao
+
+FORMATOS = {
+    "xlsx": ("📥 Excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("📄 CSV", "text/csv"),
+    "parquet": ("🗃️ Parquet", "application/octet-stream"),
+}
+MAX_ARQUIVOS = 8  # arquivos guardados (os mais recentes)
+
+
+def gerar_xlsx(df, aba="Filtrado"):
+    import openpyxl
+
+    dx = formatar_exportacao(df).astype(object)
+    dx = dx.where(dx.notna(), None)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(aba)
+    ws.append(list(dx.columns))
+    for linha in dx.itertuples(index=False, name=None):
+        ws.append(linha)
+    saida = io.BytesIO()
+    wb.save(saida)
+    return saida.getvalue()
+
+def gerar_csv(df):
+    # ; e vírgula decimal: abre direto no Excel em português
+    return formatar_exportacao(df).to_csv(index=False, sep=";", decimal=",").encode("utf-8-sig")
+
+def gerar_parquet(df):
+    # tipos preservados (datas, booleanos), sem a formatação de texto
+    saida = io.BytesIO()
+    df.reset_index(drop=True).to_parquet(saida, index=False)
+    return saida.getvalue()
+
+GERADORES = {"xlsx": gerar_xlsx, "csv": gerar_csv, "parquet": gerar_parquet}
+
+
+class CacheExportacao:
+    """Arquivos gerados por chave, com descarte dos mais antigos (LRU)."""
+
+    def __init__(self, max_arquivos=MAX_ARQUIVOS):
+        self.max_arquivos = max_arquivos
+        self._lock = threading.Lock()
+        self._arquivos = OrderedDict()
+
+    def obter(self, chave, gerar):
+        with self._lock:
+            if chave in self._arquivos:
+                self._arquivos.move_to_end(chave)
+                return self._arquivos[chave]
+        dados = gerar()
+        with self._lock:
+            self._arquivos[chave] = dados
+            while len(self._arquivos) > self.max_arquivos:
+                self._arquivos.popitem(last=False)
+        return dados
+
+    def preparador(self, df, formato, chave):
+        """Função sem argumentos para o download_button: gera (ou reaproveita) o arquivo no clique."""
+        return lambda: self.obter((chave, formato), lambda: GERADORES[formato](df))
+
+    def invalidar(self):
+        with self._lock:
+            self._arquivos.clear()
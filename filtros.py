@@ -0,0 +1,97 @@
+"""Filtros da listagem de rescisões em memória (backend Google Sheets).
+
+Mesmo resultado do filtro por máscaras pandas de antes (benchmarks/bench_filtros.como_era),
+mas com o trabalho pesado feito uma vez por revisão dos dados:
+
+- pendentes: máscara booleana (numpy) por coluna de status;
+- datas: datetime64 ordenado por DATA_DEMISSAO/DATA_PAGAMENTO; um período vira
+  duas buscas binárias (searchsorted) em vez de comparar objetos date linha a linha;
+- solicitante: códigos inteiros (factorize), filtro com np.isin;
+- busca: máscara por termo, guardada.
+
+Máscaras por parte e o resultado final ficam num LRU pela chave do filtro:
+mudar só o "Até" reaproveita status/busca/solicitante e refaz só a parte da data.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from armazenamento import STATUS_PENDENTES
+from busca import filtrar_busca
+
+MAX_MEMO = 64  # máscaras/resultados guardados por revisão
+
+
+class MotorFiltros:
+    def __init__(self, df, indice_busca=None):
+        self.df = df
+        self.indice_busca = indice_busca
+        self.n = len(df)
+        self._lock = threading.Lock()
+        self._memo = OrderedDict()
+
+        self.pendentes = {
+            col: ~df[col].to_numpy(dtype=bool)
+            for col in STATUS_PENDENTES.values() if col in df.columns
+        }
+        # por coluna de data: (posições ordenadas pela data, datas ordenadas), sem as vazias
+        self.datas = {}
+        for col in ('DATA_DEMISSAO', 'DATA_PAGAMENTO'):
+            if col in df.columns:
+                valores = pd.to_datetime(df[col], errors='coerce').to_numpy(dtype='datetime64[ns]')
+                posicoes = np.flatnonzero(~np.isnat(valores))
+                ordem = posicoes[np.argsort(valores[posicoes], kind='stable')]
+                self.datas[col] = (ordem, valores[ordem])
+        if 'SOLICITANTE' in df.columns:
+            self.cod_solicitante, self.solicitantes = pd.factorize(df['SOLICITANTE'].astype(str))
+        else:
+            self.cod_solicitante, self.solicitantes = None, pd.Index([])
+
+    def _lembrar(self, chave, calcular):
+        with self._lock:
+            if chave in self._memo:
+                self._memo.move_to_end(chave)
+                return self._memo[chave]
+        valor = calcular()
+        with self._lock:
+            self._memo[chave] = valor
+            while len(self._memo) > MAX_MEMO:
+                self._memo.popitem(last=False)
+        return valor
+
+    # ------------------------------------------------------------- máscaras
+    def _mascara_data(self, col, de, ate):
+        ordem, valores = self.datas[col]
+        ini = np.searchsorted(valores, np.datetime64(de, 'ns'), side='left')
+        fim = np.searchsorted(valores, np.datetime64(ate, 'ns'), side='right')
+        mascara = np.zeros(self.n, dtype=bool)
+        mascara[ordem[ini:fim]] = True
+        return mascara
+
+    def _mascara_busca(self, termo):
+        return filtrar_busca(self.indice_busca, termo).to_numpy(dtype=bool)
+
+    def _mascara_solicitantes(self, nomes):
+        codigos = self.solicitantes.get_indexer(list(nomes))
+        return np.isin(self.cod_solicitante, codigos[codigos >= 0])
+
+    def _posicoes(self, filtro):
+        mascara = np.ones(self.n, dtype=bool)
+        col = filtro.coluna_pendente
+        if col in self.pendentes:
+            mascara &= self.pendentes[col]
+        if filtro.campo_data in self.datas:
+            mascara &= self._lembrar(('data', filtro.campo_data, filtro.de, filtro.ate),
+                                     lambda: self._mascara_data(filtro.campo_data, filtro.de, filtro.ate))
+        if filtro.busca and self.indice_busca is not None:
+            mascara &= self._lembrar(('busca', filtro.busca), lambda: self._mascara_busca(filtro.busca))
+        if filtro.solicitantes and self.cod_solicitante is not None:
+            mascara &= self._lembrar(('solicitantes', filtro.solicitantes),
+                                     lambda: self._mascara_solicitantes(filtro.solicitantes))
+        return np.flatnonzero(mascara)
+
+    def filtrar(self, filtro):
+        posicoes = self._lembrar(('resultado',) + filtro.chave(), lambda: self._posicoes(filtro))
+        return self.df.iloc[posicoes]
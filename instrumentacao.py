@@ -0,0 +1,134 @@
+"""Medição de desempenho por rerun: chamadas à API do Sheets e etapas do app.
+
+- como camada de cliente_sheets.embrulhar: toda chamada real à planilha e às
+  abas (worksheet(), get_all_values, batch_update, append_rows...) é registrada
+  com duração e tamanho (nº de células lidas/escritas);
+- `with medidor.etapa("nome"):` mede um trecho do app (bases, filtro, editor...).
+
+Cada evento entra no rerun da thread atual (o Streamlit roda o script de cada
+sessão numa thread) e nas estatísticas acumuladas do processo (últimas
+JANELA_ESTATISTICAS medições por nome, para percentis). Eventos de threads
+sem rerun (atualização em segundo plano, geração de download) só entram nas
+acumuladas.
+
+Com DP_LOG_METRICAS=<arquivo> cada evento também vai para um JSON por linha.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+JANELA_ESTATISTICAS = 500
+
+
+def _tamanho(valor):
+    """Células numa resposta/argumento do gspread (listas de linhas, dicts com 'values')."""
+    if isinstance(valor, dict):
+        if "values" in valor:
+            return _tamanho(valor["values"])
+        if "valueRanges" in valor:
+            return sum(_tamanho(v) for v in valor["valueRanges"])
+        if "requests" in valor:
+            return len(valor["requests"])
+        return 0
+    if isinstance(valor, (list, tuple)):
+        if valor and isinstance(valor[0], (list, tuple)):
+            return sum(len(linha) for linha in valor)
+        if valor and isinstance(valor[0], dict):
+            return sum(_tamanho(v) for v in valor)
+        return len(valor)
+    return 0
+
+
+class Rerun:
+    def __init__(self, numero):
+        self.numero = numero
+        self.inicio = time.perf_counter()
+        self.eventos = []  # (tipo, nome, segundos, células)
+
+    @property
+    def duracao(self):
+        return time.perf_counter() - self.inicio
+
+    def quadro(self):
+        return pd.DataFrame(
+            [(t, n, s * 1000, c) for t, n, s, c in self.eventos],
+            columns=["tipo", "nome", "ms", "células"],
+        )
+
+
+class Medidor:
+    def __init__(self, arquivo_log=None):
+        self.arquivo_log = arquivo_log if arquivo_log is not None else os.environ.get("DP_LOG_METRICAS")
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._duracoes = defaultdict(lambda: deque(maxlen=JANELA_ESTATISTICAS))
+        self._contagem = defaultdict(int)
+        self._n_reruns = 0
+
+    # -------------------------------------------------------------- rerun
+    def iniciar_rerun(self):
+        with self._lock:
+            self._n_reruns += 1
+            rerun = Rerun(self._n_reruns)
+        self._local.rerun = rerun
+        return rerun
+
+    @property
+    def rerun_atual(self):
+        return getattr(self._local, "rerun", None)
+
+    # ----------------------------------------------------------- registro
+    def registrar(self, tipo, nome, segundos, celulas=0):
+        rerun = self.rerun_atual
+        if rerun is not None:
+            rerun.eventos.append((tipo, nome, segundos, celulas))
+        chave = f"{tipo}:{nome}"
+        with self._lock:
+            self._duracoes[chave].append(segundos)
+            self._contagem[chave] += 1
+            if self.arquivo_log:
+                try:
+                    with open(self.arquivo_log, "a", encoding="utf-8") as f:
+                        f.write(json.dumps({
+                            "ts": time.time(), "rerun": rerun.numero if rerun else None,
+                            "tipo": tipo, "nome": nome, "ms": round(segundos * 1000, 3), "celulas": celulas,
+                        }, ensure_ascii=False) + "\n")
+                except OSError:
+                    self.arquivo_log = None  # disco só leitura: segue sem log
+
+    def chamar(self, rotulo, chave, func, args=()):
+        """Camada do cliente_sheets: mede a chamada real ao Sheets."""
+        t0 = time.perf_counter()
+        try:
+            resultado = func()
+        except Exception:
+            self.registrar("api", f"{rotulo} (erro)", time.perf_counter() - t0)
+            raise
+        self.registrar("api", rotulo, time.perf_counter() - t0, _tamanho(resultado) + sum(_tamanho(a) for a in args))
+        return resultado
+
+    @contextmanager
+    def etapa(self, nome):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar("etapa", nome, time.perf_counter() - t0)
+
+    def estatisticas(self):
+        """Percentis (ms) das últimas medições de cada chamada/etapa."""
+        with self._lock:
+            itens = [(k, list(v), self._contagem[k]) for k, v in self._duracoes.items()]
+        linhas = []
+        for chave, duracoes, total in sorted(itens):
+            tipo, nome = chave.split(":", 1)
+            ms = np.array(duracoes) * 1000
+            linhas.append((tipo, nome, total, np.percentile(ms, 50), np.percentile(ms, 95), ms.max()))
+        return pd.DataFrame(linhas, columns=["tipo", "nome", "chamadas", "p50 ms", "p95 ms", "máx ms"])
+
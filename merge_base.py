@@ -0,0 +1,223 @@
+"""Merge do upload da página "Atualizar Base" com a aba base_funcionarios.
+
+Antes a aba era apagada (ws.clear()) e regravada inteira (ws.update(matriz)):
+um erro na segunda chamada deixava a base vazia, e toda linha era reescrita
+mesmo sem mudança. Aqui o upload é lido em blocos, comparado com a aba por
+MATRICULA e só vai para o Sheets o que mudou:
+
+- atualizadas: linhas existentes com algum valor diferente (batch_update por faixas);
+- inseridas: matrículas novas (append em blocos);
+- inalteradas/ignoradas: nada é escrito.
+
+Célula vazia no upload não apaga o valor que já está na base, e colunas que
+não vieram no upload ficam como estão.
+"""
+from datetime import date, datetime
+
+import pandas as pd
+from gspread.utils import rowcol_to_a1
+
+from normalizacao import chave_matricula, formatar_data_para_salvar, limpar_matricula, norm_cols_upper
+
+BLOCO_LEITURA = 5000  # linhas do upload em memória por vez
+BLOCO_ESCRITA = 1000  # linhas por chamada de escrita
+COLUNA_CARIMBO = "ATUALIZADO_EM"
+
+
+# ==============================================================================
+# LEITURA DO UPLOAD
+# ==============================================================================
+def _texto_celula(valor):
+    if valor is None:
+        return ""
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    if isinstance(valor, (date, datetime)):
+        return formatar_data_para_salvar(valor)
+    return str(valor).strip()
+
+
+def _ler_xlsx_em_blocos(arquivo, tamanho):
+    import openpyxl
+
+    wb = openpyxl.load_workbook(arquivo, read_only=True, data_only=True)
+    try:
+        linhas = wb.active.iter_rows(values_only=True)
+        cabecalho = [_texto_celula(c) for c in next(linhas, [])]
+        bloco = []
+        for linha in linhas:
+            if not any(v is not None and str(v).strip() for v in linha):
+                continue
+            bloco.append([_texto_celula(v) for v in linha[:len(cabecalho)]])
+            if len(bloco) == tamanho:
+                yield pd.DataFrame(bloco, columns=cabecalho)
+                bloco = []
+        if bloco or not cabecalho:
+            yield pd.DataFrame(bloco, columns=cabecalho)
+    finally:
+        wb.close()
+
+
+def ler_upload_em_blocos(arquivo, nome, tamanho=BLOCO_LEITURA):
+    """Gera DataFrames (tudo texto, colunas em maiúsculas) de no máximo `tamanho` linhas."""
+    if hasattr(arquivo, "seek"):
+        arquivo.seek(0)
+    if nome.lower().endswith(".xlsx"):
+        blocos = _ler_xlsx_em_blocos(arquivo, tamanho)
+    else:
+        blocos = pd.read_csv(arquivo, sep=None, engine="python", dtype=str, keep_default_na=False, chunksize=tamanho)
+    for bloco in blocos:
+        bloco = norm_cols_upper(bloco)
+        yield bloco.fillna("").astype(str).apply(lambda c: c.str.strip())
+
+
+# ==============================================================================
+# DIFF
+# ==============================================================================
+class DiffBase:
+    """Resultado do merge: o que precisa ser escrito na aba."""
+
+    def __init__(self, headers):
+        self.headers = list(headers)
+        self.novas_colunas = []
+        self.atualizadas = {}  # linha da planilha (1-based) -> valores completos
+        self.inseridas = {}    # matrícula -> valores completos
+        self.n_inalteradas = 0
+        self.n_ignoradas = 0
+        self.n_sem_matricula = 0
+
+    @property
+    def vazio(self):
+        return not (self.atualizadas or self.inseridas or self.novas_colunas)
+
+    def _completar(self, valores):
+        return list(valores) + [""] * (len(self.headers) - len(valores))
+
+    def quadro(self, qual, limite=None):
+        """DataFrame das linhas 'atualizadas' ou 'inseridas' (para a prévia)."""
+        linhas = list(getattr(self, qual).values())[:limite]
+        return pd.DataFrame([self._completar(v) for v in linhas], columns=self.headers)
+
+
+def calcular_diff(valores_sheet, blocos, atualizar_existentes=True, carimbo=""):
+    """Compara a aba (get_all_values) com os blocos do upload, chaveando por MATRICULA.
+
+    A chave é chave_matricula (sem zeros à esquerda): '010100001234' na aba e a
+    célula numérica 10100001234 do xlsx são o mesmo funcionário. Linha nova
+    entra com a matrícula como veio no upload.
+
+    Se a matrícula se repete no upload, vale a última ocorrência. `carimbo`
+    vai para ATUALIZADO_EM apenas das linhas inseridas/alteradas.
+    """
+    headers = [str(h).upper().strip() for h in (valores_sheet[0] if valores_sheet else [])]
+    diff = DiffBase(headers)
+    for col in ("MATRICULA", COLUNA_CARIMBO):
+        if col not in diff.headers:
+            diff.headers.append(col)
+            diff.novas_colunas.append(col)
+
+    i_mat = diff.headers.index("MATRICULA")
+    i_carimbo = diff.headers.index(COLUNA_CARIMBO)
+    antigas = valores_sheet[1:]
+    posicao = {}
+    for n, linha in enumerate(antigas):
+        chave = chave_matricula(linha[i_mat]) if i_mat < len(linha) else ""
+        if chave:
+            posicao.setdefault(chave, n)
+
+    vistas = set()
+    for bloco in blocos:
+        if "MATRICULA" not in bloco.columns:
+            raise ValueError("Sua planilha precisa ter a coluna MATRÍCULA (MATRICULA).")
+        for col in bloco.columns:
+            if col and col not in diff.headers:
+                diff.headers.append(col)
+                diff.novas_colunas.append(col)
+        cols = [(diff.headers.index(c), j) for j, c in enumerate(bloco.columns) if c and c not in ("MATRICULA", COLUNA_CARIMBO)]
+
+        for valores in bloco.itertuples(index=False, name=None):
+            matricula = limpar_matricula(valores[bloco.columns.get_loc("MATRICULA")])
+            chave = chave_matricula(matricula)
+            if not chave:
+                diff.n_sem_matricula += 1
+                continue
+
+            if chave in posicao:
+                if not atualizar_existentes:
+                    diff.n_ignoradas += chave not in vistas
+                    vistas.add(chave)
+                    continue
+                vistas.add(chave)
+                n = posicao[chave]
+                original = diff._completar(antigas[n])
+                atual = diff._completar(diff.atualizadas.get(n + 2, original))
+            else:
+                original = None
+                atual = diff._completar(diff.inseridas.get(chave, []))
+
+            novo = list(atual)
+            for i, j in cols:
+                if valores[j] != "":
+                    novo[i] = valores[j]
+            if original is None:
+                novo[i_mat] = matricula
+                novo[i_carimbo] = carimbo
+                diff.inseridas[chave] = novo
+            elif [v for i, v in enumerate(novo) if i != i_carimbo] != [v for i, v in enumerate(original) if i != i_carimbo]:
+                novo[i_carimbo] = carimbo
+                diff.atualizadas[n + 2] = novo
+            else:
+                diff.atualizadas.pop(n + 2, None)
+
+    if atualizar_existentes:
+        diff.n_inalteradas = len(vistas) - len(diff.atualizadas)
+    return diff
+
+
+# ==============================================================================
+# ESCRITA
+# ==============================================================================
+def _faixas_contiguas(linhas):
+    """[2, 3, 4, 9] -> [[2, 3, 4], [9]]"""
+    grupos = []
+    for n in sorted(linhas):
+        if grupos and grupos[-1][-1] == n - 1:
+            grupos[-1].append(n)
+        else:
+            grupos.append([n])
+    return grupos
+
+
+def aplicar_diff(ws, diff, bloco=BLOCO_ESCRITA):
+    """Escreve cabeçalho/linhas alteradas (batch_update) e novas linhas (append), em blocos.
+
+    Nunca limpa a aba. Retorna o número de chamadas de escrita feitas.
+    """
+    chamadas = 0
+    ultima = rowcol_to_a1(1, len(diff.headers))[:-1]
+
+    pendentes, n_linhas = [], 0
+    if diff.novas_colunas:
+        pendentes.append({"range": f"A1:{ultima}1", "values": [diff.headers]})
+        n_linhas = 1
+    for grupo in _faixas_contiguas(diff.atualizadas):
+        for i in range(0, len(grupo), bloco):
+            parte = grupo[i:i + bloco]
+            pendentes.append({
+                "range": f"A{parte[0]}:{ultima}{parte[-1]}",
+                "values": [diff._completar(diff.atualizadas[n]) for n in parte],
+            })
+            n_linhas += len(parte)
+            if n_linhas >= bloco:
+                ws.batch_update(pendentes)
+                chamadas += 1
+                pendentes, n_linhas = [], 0
+    if pendentes:
+        ws.batch_update(pendentes)
+        chamadas += 1
+
+    novas = [diff._completar(v) for v in diff.inseridas.values()]
+    for i in range(0, len(novas), bloco):
+        ws.append_rows(novas[i:i + bloco], value_input_option="RAW", table_range="A1")
+        chamadas += 1
+    return chamadas
@@ -0,0 +1,139 @@
+"""Normalização dos dados vindos do Sheets.
+
+As funções escalares (limpar_matricula, interpretar_booleano, ...) continuam
+sendo a referência de comportamento; as versões "em série" produzem o mesmo
+resultado sem `.apply` linha a linha:
+
+- operações `.str` do pandas para texto quase sempre distinto (matrícula);
+- avaliação por valor único (factorize) para colunas de poucos valores
+  distintos (CALCULADO/PENDENTE, PAGO/ABERTO, DIAS...): a função escalar roda uma vez
+  por valor distinto e o resultado é espalhado pelos códigos.
+
+Benchmark: python -m benchmarks.bench_normalizacao
+"""
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+# colunas booleanas da aba rescisões -> tipo usado em formatar_para_texto
+TIPOS_BOOLEANOS = {
+    'CALCULO_REALIZADO': 'CALCULO', 'DOC_ENVIADO': 'DOC', 'BAIXA_PAGAMENTO': 'PAGTO',
+    'FATURAMENTO': 'FAT', 'EXCLUIR': 'EXCLUIR',
+}
+COLUNAS_DATA = ['DATA_DEMISSAO', 'DATA_PAGAMENTO']
+
+# (verdadeiro, falso) por tipo de formatar_para_texto
+TEXTOS_BOOLEANOS = {
+    'CALCULO': ("CALCULADO", "PENDENTE"),
+    'DOC': ("ENVIADO", "PENDENTE"),
+    'PAGTO': ("PAGO", "ABERTO"),
+    'FAT': ("POSSUI FATURAMENTO", "NÃO"),
+    'EXCLUIR': ("MARCADO", ""),
+}
+
+
+# ==============================================================================
+# ESCALARES
+# ==============================================================================
+def norm_cols_upper(df):
+    df.columns = [str(c).upper().strip() for c in df.columns]
+    return df
+
+def limpar_matricula(valor):
+    if pd.isna(valor) or str(valor).strip() == "":
+        return ""
+    return str(valor).strip().replace(".0", "")
+
+def chave_matricula(valor):
+    """Chave de busca nas bases: sem zeros à esquerda (get_all_records lê '0101...' como 101...)."""
+    m = limpar_matricula(valor)
+    return m.lstrip("0") or m
+
+def interpretar_booleano(valor):
+    v = str(valor).upper().strip()
+    positivos = ['TRUE', '1', 'SIM', 'OK', 'CALCULADO', 'ENVIADO', 'PAGO', 'POSSUI FATURAMENTO', 'MARCADO']
+    return True if any(x in v for x in positivos) else False
+
+def formatar_para_texto(valor, tipo):
+    if tipo in TEXTOS_BOOLEANOS:
+        sim, nao = TEXTOS_BOOLEANOS[tipo]
+        return sim if valor else nao
+    return str(valor)
+
+def formatar_data_para_salvar(valor):
+    if pd.isna(valor) or valor == "" or valor is None:
+        return ""
+    if isinstance(valor, (date, datetime)):
+        return valor.strftime('%d/%m/%Y')
+    return str(valor)
+
+
+# ==============================================================================
+# VETORIZADAS
+# ==============================================================================
+def por_valores_unicos(serie, func):
+    """Aplica `func` uma vez por valor distinto e devolve o resultado alinhado à série."""
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+    valores = np.array([func(u) for u in unicos] + [func(np.nan)], dtype=object)
+    # código -1 (NaN/None) cai na última posição
+    return pd.Series(valores[codigos], index=serie.index, name=serie.name)
+
+def limpar_matriculas(serie):
+    """Igual a serie.apply(limpar_matricula)."""
+    txt = serie.astype(object).where(serie.notna(), "").astype(str).str.strip()
+    return txt.str.replace(".0", "", regex=False).astype(object)
+
+def chaves_matriculas(serie):
+    """Igual a serie.apply(chave_matricula)."""
+    m = limpar_matriculas(serie)
+    return m.str.lstrip("0").mask(lambda k: k == "", m).astype(object)
+
+def interpretar_booleanos(serie):
+    """Igual a serie.apply(interpretar_booleano)."""
+    return por_valores_unicos(serie, interpretar_booleano).astype(bool)
+
+def datas_de_texto(serie):
+    """dd/mm/aaaa (como o app grava) ou ISO aaaa-mm-dd -> datetime64; o que não for data vira NaT."""
+    txt = serie.astype(object).where(serie.notna(), "").astype(str).str.strip()
+    datas = pd.to_datetime(txt, format='%d/%m/%Y', errors='coerce')
+    iso = pd.to_datetime(txt.where(datas.isna(), ""), format='ISO8601', errors='coerce')
+    return datas.fillna(iso)
+
+def formatar_textos(serie, tipo):
+    """Igual a serie.apply(lambda x: formatar_para_texto(x, tipo))."""
+    if tipo in TEXTOS_BOOLEANOS and serie.dtype == bool:
+        sim, nao = TEXTOS_BOOLEANOS[tipo]
+        return pd.Series(np.where(serie.to_numpy(), sim, nao).astype(object), index=serie.index, name=serie.name)
+    return por_valores_unicos(serie, lambda v: formatar_para_texto(v, tipo))
+
+def extrair_dias(serie):
+    """DIAS do recesso: '12,5' / '12.0' / 12 -> 12 (0 se não numérico)."""
+    txt = por_valores_unicos(serie, lambda v: str(v).split(',')[0].split('.')[0])
+    return pd.to_numeric(txt, errors='coerce').fillna(0).astype(int)
+
+def normalizar_rescisoes(df):
+    """Tipos da listagem: datas como date, FLUIG sem apóstrofo, MATRICULA texto e booleanos."""
+    df = norm_cols_upper(df)
+    for col in COLUNAS_DATA:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce', dayfirst=True).dt.date
+    if 'FLUIG' in df.columns:
+        df['FLUIG'] = df['FLUIG'].astype(str).str.replace("'", "")
+    if 'MATRICULA' in df.columns:
+        df['MATRICULA'] = df['MATRICULA'].astype(str)
+    for b in TIPOS_BOOLEANOS:
+        if b in df.columns:
+            df[b] = interpretar_booleanos(df[b])
+    return df
+
+def formatar_exportacao(df):
+    """Booleanos de volta para texto e datas dd/mm/aaaa (sem EXCLUIR, como antes)."""
+    dx = df.copy()
+    for col, tipo in TIPOS_BOOLEANOS.items():
+        if col in dx.columns and col != 'EXCLUIR':
+            dx[col] = formatar_textos(dx[col], tipo)
+    for col in COLUNAS_DATA:
+        if col in dx.columns:
+            dx[col] = pd.to_datetime(dx[col], errors='coerce').dt.strftime('%d/%m/%Y')
+    return dx
@@ -0,0 +1,155 @@
+"""Prazo de pagamento da rescisão (DATA_PAGAMENTO) em dias úteis.
+
+Antes era sempre DATA_DEMISSAO + 10 dias corridos, sem olhar fim de semana,
+feriado ou tipo de demissão. Aqui cada TIPO_DEMISSAO tem uma regra
+(dias, contagem):
+
+- 'corridos': soma os dias e, se cair em dia sem expediente, antecipa para o
+  dia útil anterior (o prazo do art. 477 §6º da CLT não se prorroga);
+- 'uteis': conta só dias úteis a partir da demissão.
+
+Dias sem expediente: sábado, domingo, feriados nacionais e os dias sem
+expediente bancário (Carnaval, Corpus Christi), mais os feriados extras da
+configuração. O cálculo é vetorizado (np.busday_offset por grupo de regra):
+o mesmo motor serve ao SALVAR, ao cadastro em lote e à conferência da tabela
+inteira.
+
+Configuração opcional em JSON (DP_PRAZOS=<arquivo>):
+    {"feriados": ["25/01/2026", ...], "regras": {"Acordo": [10, "uteis"]}}
+"""
+import json
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+ARQUIVO_PRAZOS = os.environ.get("DP_PRAZOS", "")
+ANOS_CALENDARIO = range(2000, 2061)
+
+# tipo de demissão -> (dias, contagem); a ordem é a da tela (tipos novos do DP_PRAZOS vão no fim).
+# Desde a Lei 13.467/2017 o prazo legal é o mesmo para todos os tipos (10 dias corridos): os
+# valores abaixo são só esse padrão, e regras próprias da empresa entram pelo DP_PRAZOS.
+REGRAS_PAGAMENTO = {
+    "Aviso Trabalhado": (10, "corridos"),
+    "Aviso Indenizado": (10, "corridos"),
+    "Pedido de Demissão": (10, "corridos"),
+    "Término Contrato": (10, "corridos"),
+    "Acordo": (10, "corridos"),
+    "Rescisão Indireta": (10, "corridos"),
+}
+REGRA_PADRAO = (10, "corridos")  # tipo vazio ou fora da lista
+CONTAGENS = ("corridos", "uteis")
+
+
+# ==============================================================================
+# CALENDÁRIO
+# ==============================================================================
+def pascoa(ano):
+    """Domingo de Páscoa (algoritmo de Meeus/Jones/Butcher)."""
+    a, b, c = ano % 19, ano // 100, ano % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - (b - g) // 3 + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    mes = (h + l - 7 * m + 90) // 25
+    return date(ano, mes, (h + l - 7 * m + 33 * mes + 19) % 32)
+
+def feriados_nacionais(anos=ANOS_CALENDARIO):
+    dias = []
+    for ano in anos:
+        dias += [date(ano, m, d) for m, d in ((1, 1), (4, 21), (5, 1), (9, 7), (10, 12), (11, 2), (11, 15), (12, 25))]
+        if ano >= 2024:
+            dias.append(date(ano, 11, 20))  # Consciência Negra (Lei 14.759/2023)
+        p = pascoa(ano)
+        # Carnaval (seg/ter), Sexta-feira Santa e Corpus Christi: sem expediente bancário
+        dias += [p - timedelta(days=48), p - timedelta(days=47), p - timedelta(days=2), p + timedelta(days=60)]
+    return dias
+
+
+# ==============================================================================
+# MOTOR
+# ==============================================================================
+class MotorPrazos:
+    def __init__(self, regras=None, feriados_extras=()):
+        self.regras = dict(REGRAS_PAGAMENTO if regras is None else regras)
+        for tipo, (dias, contagem) in self.regras.items():
+            if contagem not in CONTAGENS:
+                raise ValueError(f"Regra de prazo inválida para {tipo}: contagem '{contagem}'")
+        feriados = sorted(set(feriados_nacionais()) | set(feriados_extras))
+        self.calendario = np.busdaycalendar(holidays=np.array(feriados, dtype="datetime64[D]"))
+
+    @classmethod
+    def carregar(cls, caminho=ARQUIVO_PRAZOS):
+        """Regras padrão + o que vier no JSON de `caminho` (se existir)."""
+        if not caminho or not os.path.exists(caminho):
+            return cls()
+        with open(caminho, encoding="utf-8") as f:
+            config = json.load(f)
+        regras = dict(REGRAS_PAGAMENTO)
+        regras.update({tipo: tuple(regra) for tipo, regra in config.get("regras", {}).items()})
+        extras = pd.to_datetime(pd.Series(config.get("feriados", []), dtype=object), dayfirst=True)
+        return cls(regras, [d.date() for d in extras])
+
+    def regra(self, tipo):
+        return self.regras.get(tipo, REGRA_PADRAO)
+
+    def calcular(self, demissoes, tipos):
+        """DATA_PAGAMENTO (datetime64[D]) para cada (demissão, tipo); NaT onde a demissão é vazia."""
+        dem = pd.to_datetime(pd.Series(np.asarray(demissoes, dtype=object)), errors="coerce").to_numpy("datetime64[D]")
+        codigos, unicos = pd.factorize(pd.Series(np.asarray(tipos, dtype=object)))
+        saida = np.full(len(dem), np.datetime64("NaT"), dtype="datetime64[D]")
+        validas = ~np.isnat(dem)
+        # uma chamada de busday_offset por tipo distinto (código -1 = tipo vazio)
+        for codigo, tipo in [(-1, None)] + list(enumerate(unicos)):
+            m = validas & (codigos == codigo)
+            if not m.any():
+                continue
+            dias, contagem = self.regra(tipo)
+            if contagem == "uteis":
+                saida[m] = np.busday_offset(dem[m], dias, roll="forward", busdaycal=self.calendario)
+            else:
+                saida[m] = np.busday_offset(dem[m] + np.timedelta64(dias, "D"), 0, roll="preceding",
+                                            busdaycal=self.calendario)
+        return saida
+
+    def calcular_um(self, demissao, tipo):
+        d = self.calcular([demissao], [tipo])[0]
+        return None if np.isnat(d) else d.astype(date)
+
+    # ----------------------------------------------------------- conferência
+    def conferir(self, df):
+        """Rescisões em aberto (frame normalizado) cuja DATA_PAGAMENTO difere do prazo calculado.
+
+        Retorna ID, NOME, TIPO_DEMISSAO, DATA_DEMISSAO, DATA_PAGAMENTO e PAGAMENTO_CALCULADO
+        (datas como date). Ficam de fora as linhas sem DATA_DEMISSAO e as já pagas
+        (BAIXA_PAGAMENTO): data de pagamento histórica não é reescrita.
+        """
+        colunas = ['ID', 'NOME', 'TIPO_DEMISSAO', 'DATA_DEMISSAO', 'DATA_PAGAMENTO', 'PAGAMENTO_CALCULADO']
+        if 'BAIXA_PAGAMENTO' in df.columns:
+            df = df[~df['BAIXA_PAGAMENTO'].fillna(False).astype(bool)]
+        if df.empty or 'DATA_DEMISSAO' not in df.columns:
+            return pd.DataFrame(columns=colunas)
+        tipos = df['TIPO_DEMISSAO'] if 'TIPO_DEMISSAO' in df.columns else pd.Series(None, index=df.index)
+        calculada = self.calcular(df['DATA_DEMISSAO'], tipos)
+        atual = pd.to_datetime(df.get('DATA_PAGAMENTO', pd.Series(None, index=df.index)), errors="coerce") \
+            .to_numpy("datetime64[D]")
+        difere = ~np.isnat(calculada) & (np.isnat(atual) | (atual != calculada))
+        saida = df.loc[difere].reindex(columns=colunas[:-1]).copy()
+        saida['PAGAMENTO_CALCULADO'] = calculada[difere].astype(object)
+        saida['PAGAMENTO_CALCULADO'] = saida['PAGAMENTO_CALCULADO'].map(lambda d: d if isinstance(d, date) else None)
+        return saida.reset_index(drop=True)
+
+
+def alteracoes_pagamento(divergentes):
+    """{ID: {'DATA_PAGAMENTO': 'dd/mm/aaaa'}} para gravar_edicoes (um batch só)."""
+    return {
+        int(id_): {'DATA_PAGAMENTO': d.strftime('%d/%m/%Y')}
+        for id_, d in zip(divergentes['ID'], divergentes['PAGAMENTO_CALCULADO'])
+        if pd.notna(id_) and d is not None
+    }
+
+
+PRAZOS = MotorPrazos.carregar()
@@ -0,0 +1,101 @@
+"""Usuários do app: senhas com hash e índice de logins em memória.
+
+Senha gravada como "pbkdf2_sha256$iterações$sal$hash" (hex). Senhas antigas
+em texto puro continuam aceitas e são trocadas pelo hash no primeiro login
+certo do usuário.
+
+O índice (USUARIO -> registro) é lido uma vez e vale por TTL_USUARIOS
+segundos: login não vai à planilha no caso comum, e uma sequência de logins
+errados não baixa a aba de novo a cada tentativa. Criar usuário invalida o
+índice.
+"""
+import hashlib
+import hmac
+import os
+import threading
+import time
+
+PREFIXO_HASH = "pbkdf2_sha256"
+ITERACOES = 200_000
+TTL_USUARIOS = 300  # segundos
+
+
+# ==============================================================================
+# HASH DE SENHA
+# ==============================================================================
+def gerar_hash(senha, sal=None, iteracoes=ITERACOES):
+    sal = sal or os.urandom(16).hex()
+    h = hashlib.pbkdf2_hmac("sha256", str(senha).encode(), bytes.fromhex(sal), iteracoes).hex()
+    return f"{PREFIXO_HASH}${iteracoes}${sal}${h}"
+
+def eh_hash(valor):
+    return str(valor).startswith(PREFIXO_HASH + "$")
+
+def conferir_senha(senha, armazenada):
+    """(confere, precisa_migrar): texto puro ainda vale, mas deve virar hash."""
+    armazenada = str(armazenada)
+    if not eh_hash(armazenada):
+        return hmac.compare_digest(str(senha).encode(), armazenada.encode()), True
+    try:
+        _, iteracoes, sal, _ = armazenada.split("$")
+        calculado = gerar_hash(senha, sal, int(iteracoes))
+    except ValueError:
+        return False, False
+    return hmac.compare_digest(calculado.encode(), armazenada.encode()), False
+
+
+def autenticar(arm, usuario, senha):
+    """Confere usuário/senha no armazenamento e migra senha em texto puro para hash."""
+    registro = arm.buscar_usuario(usuario)
+    if registro is None:
+        return False
+    ok, migrar = conferir_senha(senha, registro.get('SENHA', ''))
+    if ok and migrar:
+        try:
+            arm.atualizar_senha(usuario, gerar_hash(senha))
+        except Exception:
+            # login vale mesmo assim; a migração é refeita no próximo acesso
+            pass
+    return ok
+
+
+# ==============================================================================
+# ÍNDICE EM MEMÓRIA
+# ==============================================================================
+class IndiceUsuarios:
+    """{USUARIO: (linha, registro)} lido por `carregar()` e guardado por `ttl` segundos."""
+
+    def __init__(self, carregar, ttl=TTL_USUARIOS):
+        self.carregar = carregar
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._dados = None
+        self._lido_em = 0
+
+    def obter(self):
+        with self._lock:
+            if self._dados is None or time.monotonic() - self._lido_em > self.ttl:
+                try:
+                    self._dados = self.carregar()
+                except Exception:
+                    if self._dados is None:
+                        raise
+                    # sem rede/cota: segue com o índice antigo e só tenta de novo após o TTL
+                self._lido_em = time.monotonic()
+            return self._dados
+
+    def buscar(self, usuario):
+        achou = self.obter().get(str(usuario))
+        return dict(achou[1]) if achou else None
+
+    def atualizar(self, usuario, campo, valor):
+        """Reflete no índice uma escrita já feita na fonte."""
+        with self._lock:
+            if self._dados and str(usuario) in self._dados:
+                linha, registro = self._dados[str(usuario)]
+                self._dados = dict(self._dados)
+                self._dados[str(usuario)] = (linha, dict(registro, **{campo: valor}))
+
+    def invalidar(self):
+        with self._lock:
+            self._dados = None